@@ -0,0 +1,216 @@
+"""
+Benchmark the overhead of the connection on its hot paths, against the in-process `memory://` backend.
+
+Run with: python -m benchmarks.bench_connection [--save results.json] [--baseline baseline.json]
+
+With `--baseline`, the run fails if a benchmark is more than `--threshold` slower than in the baseline.
+Baselines are specific to a machine: record one with `--save` before comparing.
+"""
+
+import argparse
+import itertools
+import sys
+
+import pandas as pd
+from weaviate.classes.config import Property
+
+from st_weaviate_connection import WeaviateConnection, memory
+from st_weaviate_connection.connection import weaviate_response_objects_to_df
+
+from . import harness
+from .harness import (
+    SCHEMA,
+    benchmark,
+    make_gql_results,
+    make_objects,
+    make_properties,
+    make_vectors,
+)
+
+SIZES = (10, 1_000, 100_000)
+
+_urls = itertools.count()
+_databases = []
+
+
+def make_connection(n=1_000):
+    """
+    Return a connection to a new in-process database with a `Movie` collection of `n` objects.
+    """
+    url = f"memory://benchmark-{next(_urls)}"
+    _databases.append(url)
+    conn = WeaviateConnection("benchmark", url=url)
+    conn.client().collections.create(
+        "Movie",
+        properties=[Property(name=name, data_type=data_type) for name, data_type in SCHEMA.items()],
+    )
+    df = pd.DataFrame([make_properties(i) for i in range(n)])
+    df["vector"] = list(make_vectors(n))
+    conn.insert_dataframe("Movie", df, vector_column="vector")
+    return conn, url
+
+
+@benchmark("response_objects_json_normalize", params=SIZES)
+def response_objects_json_normalize(n):
+    # The conversion of the properties before the columnar conversion, for reference
+    objects = make_objects(n)
+    return lambda: pd.json_normalize([obj.properties for obj in objects])
+
+
+@benchmark("response_objects_to_df", params=SIZES)
+def response_objects_to_df(n):
+    objects = make_objects(n)
+    return lambda: weaviate_response_objects_to_df(
+        objects, schema=SCHEMA, include_metadata=True, include_vector=True
+    )
+
+
+@benchmark("response_objects_to_df_inferred", params=SIZES)
+def response_objects_to_df_inferred(n):
+    # Without a schema, the column types are inferred from the values
+    objects = make_objects(n)
+    return lambda: weaviate_response_objects_to_df(objects)
+
+
+@benchmark("response_objects_to_arrow", params=SIZES)
+def response_objects_to_arrow(n):
+    objects = make_objects(n)
+    return lambda: weaviate_response_objects_to_df(
+        objects,
+        schema=SCHEMA,
+        include_metadata=True,
+        include_vector=True,
+        output="arrow",
+    )
+
+
+@benchmark("gql_to_dataframe", params=SIZES)
+def gql_to_dataframe(n):
+    conn, _ = make_connection(0)
+    results = make_gql_results(n)
+    return lambda: conn._gql_to_dataframe(results)
+
+
+@benchmark("gql_to_dataframe_matrix", params=SIZES)
+def gql_to_dataframe_matrix(n):
+    conn, _ = make_connection(0)
+    results = make_gql_results(n)
+    return lambda: conn._gql_to_dataframe(results, vector_format="matrix")
+
+
+@benchmark("gql_to_arrow", params=SIZES)
+def gql_to_arrow(n):
+    conn, _ = make_connection(0)
+    results = make_gql_results(n)
+    return lambda: conn._gql_to_dataframe(results, output="arrow")
+
+
+@benchmark("query_cold_connection")
+def query_cold_connection(_):
+    _, url = make_connection()
+
+    def run():
+        conn = WeaviateConnection("benchmark", url=url)
+        conn.query("Movie", "movie", limit=10)
+        conn.close()
+
+    return run
+
+
+@benchmark("query_warm_connection")
+def query_warm_connection(_):
+    conn, _ = make_connection()
+    return lambda: conn.query("Movie", "movie", limit=10)
+
+
+@benchmark("query_prepared")
+def query_prepared(_):
+    conn, _ = make_connection()
+    search = conn.prepare("Movie", limit=10)
+    return lambda: search("movie")
+
+
+GQL_QUERY = """
+{
+  Get {
+    Movie(limit: 10, bm25: {query: "movie"}) {
+      title release_year rating details { director }
+      _additional { id score }
+    }
+  }
+}
+"""
+
+
+@benchmark("graphql_query_cache_miss")
+def graphql_query_cache_miss(_):
+    conn, _ = make_connection()
+    return lambda: conn.graphql_query(GQL_QUERY, cache_ttl=None)
+
+
+@benchmark("graphql_query_cache_hit")
+def graphql_query_cache_hit(_):
+    conn, _ = make_connection()
+    conn.graphql_query(GQL_QUERY)
+    return lambda: conn.graphql_query(GQL_QUERY)
+
+
+@benchmark("graphql_query_cache_hit_uninstrumented")
+def graphql_query_cache_hit_uninstrumented(_):
+    # The difference with `graphql_query_cache_hit` is the overhead of the instrumentation
+    _, url = make_connection()
+    conn = WeaviateConnection("benchmark", url=url, instrument=False)
+    conn.graphql_query(GQL_QUERY)
+    return lambda: conn.graphql_query(GQL_QUERY)
+
+
+@benchmark("query_cache_hit", params=(1_000,))
+def query_cache_hit(n):
+    conn, _ = make_connection(n)
+    conn.query("Movie", "movie", limit=n, cache_ttl=3600)
+    return lambda: conn.query("Movie", "movie", limit=n, cache_ttl=3600)
+
+
+@benchmark("query_cache_hit_uninstrumented", params=(1_000,))
+def query_cache_hit_uninstrumented(n):
+    _, url = make_connection(n)
+    conn = WeaviateConnection("benchmark", url=url, instrument=False)
+    conn.query("Movie", "movie", limit=n, cache_ttl=3600)
+    return lambda: conn.query("Movie", "movie", limit=n, cache_ttl=3600)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare the results with this JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="The allowed slowdown relative to the baseline, e.g. 0.2 for 20%%. Default: 0.2.",
+    )
+    parser.add_argument(
+        "--max-size", type=int, help="Skip the sizes larger than this, e.g. 1000 for a quick run."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="The number of samples. Default: 5.")
+    parser.add_argument("names", nargs="*", help="Run only the benchmarks matching these names.")
+    args = parser.parse_args(argv)
+
+    try:
+        results = harness.run(args.names, max_param=args.max_size, repeat=args.repeat)
+    finally:
+        for url in _databases:
+            memory.drop_database(url)
+    if args.save:
+        harness.save(results, args.save)
+    if args.baseline:
+        regressions = harness.compare(results, harness.load(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
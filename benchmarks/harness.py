@@ -0,0 +1,212 @@
+"""
+A small benchmark runner with JSON baselines and regression checks, and the data the benchmarks share.
+
+Benchmarks are registered with the `benchmark` decorator. A benchmark function takes one
+parameter, e.g. a number of rows, does its setup and returns the callable to time.
+"""
+
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from weaviate.classes.config import DataType
+from weaviate.collections.classes.internal import MetadataReturn, Object, _RawGQLReturn
+
+BENCHMARKS: Dict[str, "Benchmark"] = {}
+
+
+class Benchmark:
+    def __init__(
+        self, name: str, setup: Callable[[Any], Callable[[], Any]], params: Sequence[Any]
+    ) -> None:
+        self.name = name
+        self.setup = setup
+        self.params = list(params)
+
+    def key(self, param: Any) -> str:
+        return self.name if param is None else f"{self.name}[{param}]"
+
+
+def benchmark(name: str, params: Sequence[Any] = (None,)) -> Callable:
+    """
+    Register a benchmark, run once per parameter.
+    """
+
+    def decorator(setup: Callable[[Any], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[name] = Benchmark(name, setup, params)
+        return setup
+
+    return decorator
+
+
+def measure(
+    fn: Callable[[], Any], repeat: int = 5, min_seconds: float = 0.2
+) -> Dict[str, float]:
+    """
+    Time a callable and return the median and minimum seconds per call, and the number of calls per sample.
+
+    The number of calls per sample is doubled until a sample takes at least `min_seconds / repeat`.
+    """
+    fn()
+    number = 1
+    while True:
+        seconds = _sample(fn, number)
+        if seconds >= min_seconds / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    samples = [seconds] + [_sample(fn, number) for _ in range(repeat - 1)]
+    per_call = [s / number for s in samples]
+    return {
+        "median": statistics.median(per_call),
+        "min": min(per_call),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _sample(fn: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def run(
+    names: Optional[Iterable[str]] = None,
+    max_param: Optional[int] = None,
+    repeat: int = 5,
+    min_seconds: float = 0.2,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """
+    Run the registered benchmarks and return the results, in the format of a baseline file.
+
+    Parameters
+    ----------
+    names : List[str], optional
+        Run only the benchmarks whose name contains one of these strings.
+    max_param : int, optional
+        Skip the runs with a numeric parameter larger than this, e.g. to leave out the largest sizes.
+    """
+    results = {}
+    for bench in BENCHMARKS.values():
+        if names and not any(n in bench.name for n in names):
+            continue
+        for param in bench.params:
+            if max_param is not None and isinstance(param, int) and param > max_param:
+                continue
+            fn = bench.setup(param)
+            result = measure(fn, repeat=repeat, min_seconds=min_seconds)
+            results[bench.key(param)] = result
+            log(f"{bench.key(param):<48} {_format_seconds(result['median'])}")
+    return {
+        "machine": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2
+) -> List[str]:
+    """
+    Return a description of each benchmark whose median is more than `threshold` slower than in the baseline.
+
+    Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for key, result in results["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{key}: {_format_seconds(result['median'])} vs "
+                f"{_format_seconds(previous['median'])} in the baseline ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:9.3f} {unit}"
+    return f"{seconds / 1e-9:9.3f} ns"
+
+
+# The movies of the benchmarks, as query response objects, GraphQL results or properties to insert
+
+VECTOR_DIMENSIONS = 32
+
+SCHEMA = {
+    "title": DataType.TEXT,
+    "overview": DataType.TEXT,
+    "release_year": DataType.INT,
+    "rating": DataType.NUMBER,
+    "adult": DataType.BOOL,
+    "release_date": DataType.DATE,
+    "details": DataType.OBJECT,
+}
+
+
+def make_properties(i):
+    return {
+        "title": f"Movie {i}",
+        "overview": "A movie about a movie. " * 5,
+        "release_year": 1950 + i % 75,
+        "rating": (i % 100) / 10,
+        "adult": i % 2 == 0,
+        "release_date": datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc),
+        "details": {"director": f"Director {i % 50}", "studio": {"name": "Studio", "country": "US"}},
+    }
+
+
+def make_vectors(n):
+    return np.random.default_rng(0).random((n, VECTOR_DIMENSIONS), dtype=np.float32)
+
+
+def make_objects(n):
+    vectors = make_vectors(n).tolist()
+    return [
+        Object(
+            uuid=uuid.UUID(int=i),
+            metadata=MetadataReturn(score=1 / (i + 1)),
+            properties=make_properties(i),
+            references=None,
+            vector={"default": vectors[i]},
+            collection="Movie",
+        )
+        for i in range(n)
+    ]
+
+
+def make_gql_results(n):
+    vectors = make_vectors(n).tolist()
+    rows = []
+    for i in range(n):
+        row = make_properties(i)
+        row["release_date"] = "2000-01-01T00:00:00Z"
+        row["_additional"] = {"id": str(uuid.UUID(int=i)), "score": str(1 / (i + 1)), "vector": vectors[i]}
+        rows.append(row)
+    return _RawGQLReturn(aggregate={}, explore={}, get={"Movie": rows}, errors=None)
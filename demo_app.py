@@ -1,10 +1,7 @@
 import streamlit as st
-import time
 import sys
 import os
-import base64
 from st_weaviate_connection import WeaviateConnection, WeaviateFilter
-from weaviate.classes.query import Filter
 
 # Constants
 ENV_VARS = ["WEAVIATE_URL", "WEAVIATE_API_KEY", "COHERE_API_KEY"]
@@ -28,21 +25,19 @@ def get_env_vars(env_vars):
             sys.exit(f"{var} not set")
     return env_vars
 
-def display_chat_messages():
+def display_chat_messages(conn):
     """Print message history"""
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
             if "images" in message:
-                for i in range(0, len(message["images"]), NUM_IMAGES_PER_ROW):
+                # The messages hold lazy poster handles, loaded from the connection's BLOB cache
+                images = conn.load_blobs(message["images"])
+                for i in range(0, len(images), NUM_IMAGES_PER_ROW):
                     cols = st.columns(NUM_IMAGES_PER_ROW)
                     for j, col in enumerate(cols):
-                        if i + j < len(message["images"]):
-                            col.image(message["images"][i + j], width=200)
-
-def base64_to_image(base64_str):
-    """Convert base64 string to image"""
-    return f"data:image/png;base64,{base64_str}"
+                        if i + j < len(images):
+                            col.image(images[i + j], width=200)
 
 def clean_input(input_text):
     """Clean user input"""
@@ -71,6 +66,7 @@ def setup_weaviate_connection(env_vars):
         url=env_vars["WEAVIATE_URL"],
         api_key=env_vars["WEAVIATE_API_KEY"],
         additional_headers={"X-Cohere-Api-Key": env_vars["COHERE_API_KEY"]},
+        warm_up=["MovieDemo"],
     )
 
 def display_example_prompts():
@@ -109,9 +105,11 @@ def display_example_prompts():
 
 def perform_search(conn, movie_type, rag_prompt, year_range, mode):
     """Perform search and display results"""
-    df = conn.query(
+    df, rag_stream = conn.generate(
         "MovieDemo",
         query=movie_type,
+        grouped_task=rag_prompt,
+        grouped_properties=["title", "tagline"],
         return_properties=["title", "tagline", "poster"],
         filters=(
             WeaviateFilter.by_property("release_year").greater_or_equal(year_range[0]) &
@@ -119,6 +117,7 @@ def perform_search(conn, movie_type, rag_prompt, year_range, mode):
         ),
         limit=SEARCH_LIMIT,
         alpha=SEARCH_MODES[mode][1],
+        lazy_blobs=True,
     )
 
     images = []
@@ -131,11 +130,12 @@ def perform_search(conn, movie_type, rag_prompt, year_range, mode):
         with st.chat_message("assistant"):
             st.write("Raw search results.")
             cols = st.columns(NUM_IMAGES_PER_ROW)
+            posters = conn.load_blobs(df["poster"])
             for index, row in df.iterrows():
                 col = cols[index % NUM_IMAGES_PER_ROW]
-                if row["poster"]:
-                    col.image(base64_to_image(row["poster"]), width=200)
-                    images.append(base64_to_image(row["poster"]))
+                if posters[index]:
+                    col.image(posters[index], width=200)
+                    images.append(row["poster"])
                 else:
                     col.write(f"No Image Available for: {row['title']}")
             st.write("Now generating recommendation from these: ...")
@@ -144,30 +144,8 @@ def perform_search(conn, movie_type, rag_prompt, year_range, mode):
             {"role": "assistant", "content": "Raw search results. Generating recommendation from these: ...", "images": images}
         )
 
-        with conn.client() as client:
-            collection = client.collections.get("MovieDemo")
-            response = collection.generate.hybrid(
-                query=movie_type,
-                filters=(
-                    Filter.by_property("release_year").greater_or_equal(year_range[0]) &
-                    Filter.by_property("release_year").less_or_equal(year_range[1])
-                ),
-                limit=SEARCH_LIMIT,
-                alpha=SEARCH_MODES[mode][1],
-                grouped_task=rag_prompt,
-                grouped_properties=["title", "tagline"],
-            )
-
-            rag_response = response.generated
-
-            with st.chat_message("assistant"):
-                message_placeholder = st.empty()
-                full_response = ""
-                for chunk in rag_response.split():
-                    full_response += chunk + " "
-                    time.sleep(0.02)
-                    message_placeholder.markdown(full_response + "▌")
-                message_placeholder.markdown(full_response)
+        with st.chat_message("assistant"):
+            full_response = st.write_stream(rag_stream)
 
         st.session_state.messages.append(
             {"role": "assistant", "content": "Recommendation from these search results: " + full_response}
@@ -184,7 +162,7 @@ def main():
         st.session_state.messages = []
         st.session_state.greetings = False
 
-    display_chat_messages()
+    display_chat_messages(conn)
 
     if not st.session_state.greetings:
         with st.chat_message("assistant"):
@@ -1,5 +1,43 @@
-from .connection import WeaviateConnection
-from weaviate.classes.query import Filter, TargetVectors
+"""
+A Streamlit connection to Weaviate.
 
-WeaviateFilter = Filter
-WeaviateTargetVectors = TargetVectors
+The public names are imported on first access, so that importing the package does not load
+the Weaviate client, pandas or Streamlit until they are needed.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from weaviate.classes.aggregate import Metrics as WeaviateMetrics
+    from weaviate.classes.query import Filter as WeaviateFilter
+    from weaviate.classes.query import TargetVectors as WeaviateTargetVectors
+
+    from .connection import WeaviateConnection
+
+__all__ = [
+    "WeaviateConnection",
+    "WeaviateFilter",
+    "WeaviateMetrics",
+    "WeaviateTargetVectors",
+]
+
+_LAZY_ATTRIBUTES = {
+    "WeaviateConnection": (".connection", "WeaviateConnection"),
+    "WeaviateFilter": ("weaviate.classes.query", "Filter"),
+    "WeaviateMetrics": ("weaviate.classes.aggregate", "Metrics"),
+    "WeaviateTargetVectors": ("weaviate.classes.query", "TargetVectors"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -0,0 +1,286 @@
+import asyncio
+import contextlib
+import contextvars
+import enum
+import heapq
+import itertools
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional
+
+AdmissionInfo = namedtuple(
+    "AdmissionInfo",
+    ["in_flight", "queue_depth", "admitted", "rate_limited", "queue_full", "timed_out"],
+)
+
+# The number of idle sessions whose token buckets are kept before full buckets are dropped
+MAX_IDLE_BUCKETS = 1024
+
+_session_override: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "st_weaviate_session", default=None
+)
+
+
+class Priority(enum.IntEnum):
+    """
+    The priority of a request waiting for admission. Lower values are admitted first.
+    """
+
+    KEYWORD = 0
+    QUERY = 1
+    GENERATE = 2
+
+
+class AdmissionRejectedError(RuntimeError):
+    """
+    Raised when a request is not admitted: its session is over its rate, the wait queue is full,
+    or it waited longer than the queue timeout.
+    """
+
+    def __init__(self, message: str, reason: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
+def current_session_id() -> Optional[str]:
+    """
+    Return the id of the Streamlit session running the current script, or None outside of a session.
+    """
+    session = _session_override.get()
+    if session is not None:
+        return session
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return None if ctx is None else ctx.session_id
+
+
+@contextlib.contextmanager
+def session_scope(session_id: Optional[str]) -> Iterator[None]:
+    """
+    Attribute the requests of the current thread to a session, e.g. in a worker thread started by a script.
+    """
+    token = _session_override.set(session_id)
+    try:
+        yield
+    finally:
+        _session_override.reset(token)
+
+
+class _Bucket:
+    def __init__(self, tokens: float, now: float) -> None:
+        self.tokens = tokens
+        self.updated = now
+
+
+class _Waiter:
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.admitted = False
+        self.cancelled = False
+
+
+class AdmissionController:
+    """
+    Admit requests to Weaviate under a global concurrency cap and per-session rate limits.
+
+    Each session has a token bucket that refills at `session_rate` tokens per second, up to
+    `session_burst` tokens, and each request takes one token. A request of a session without
+    tokens is rejected right away. Requests beyond `max_in_flight` wait in a queue of at most
+    `max_queue` requests, ordered by priority and then by arrival, and are rejected after
+    waiting `queue_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        session_rate: Optional[float] = None,
+        session_burst: Optional[int] = None,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Parameters
+        ----------
+        max_in_flight : int, optional
+            The maximum number of requests running at the same time. If None, there is no cap. Default: None.
+        session_rate : float, optional
+            The number of requests per second each session can sustain. If None, sessions are not
+            rate limited. Default: None.
+        session_burst : int, optional
+            The number of requests a session can send at once after being idle.
+            Default: twice `session_rate`, and at least 1.
+        max_queue : int, optional
+            The maximum number of requests waiting for admission. Default: 64.
+        queue_timeout : float, optional
+            The maximum number of seconds a request waits for admission. Default: 10.
+        """
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if session_rate is not None and session_rate <= 0:
+            raise ValueError("session_rate must be positive")
+        self.max_in_flight = max_in_flight
+        self.session_rate = session_rate
+        if session_burst is None and session_rate is not None:
+            session_burst = max(1, int(2 * session_rate))
+        self.session_burst = session_burst
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._queue: List[tuple] = []
+        self._waiting = 0
+        self._arrivals = itertools.count()
+        self._buckets: Dict[Optional[str], _Bucket] = {}
+        self._admitted = 0
+        self._rate_limited = 0
+        self._queue_full = 0
+        self._timed_out = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight is not None or self.session_rate is not None
+
+    def acquire(
+        self, priority: int = Priority.QUERY, session_id: Optional[str] = None
+    ) -> None:
+        """
+        Wait for admission. Every successful call must be followed by a call to `release`.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the request is not admitted.
+        """
+        waiter = self._enter(priority, session_id)
+        if waiter is not None:
+            self._wait(waiter)
+
+    async def acquire_async(
+        self, priority: int = Priority.QUERY, session_id: Optional[str] = None
+    ) -> None:
+        """
+        Wait for admission without blocking the event loop. Every successful call must be followed
+        by a call to `release`.
+
+        A request that has to queue waits on a worker thread. If the caller is cancelled while waiting,
+        the slot is released as soon as it is handed over.
+
+        Raises
+        ------
+        AdmissionRejectedError
+            If the request is not admitted.
+        """
+        waiter = self._enter(priority, session_id)
+        if waiter is None:
+            return
+        waiting = asyncio.ensure_future(asyncio.to_thread(self._wait, waiter))
+        try:
+            await asyncio.shield(waiting)
+        except asyncio.CancelledError:
+            waiting.add_done_callback(self._release_if_admitted)
+            raise
+
+    def _enter(self, priority: int, session_id: Optional[str]) -> Optional[_Waiter]:
+        # Admits the request and returns None, or queues it and returns its waiter
+        with self._lock:
+            self._take_token(session_id)
+            if self.max_in_flight is None or (
+                self._in_flight < self.max_in_flight and not self._waiting
+            ):
+                self._in_flight += 1
+                self._admitted += 1
+                return None
+            if self._waiting >= self.max_queue:
+                self._queue_full += 1
+                raise AdmissionRejectedError(
+                    f"The admission queue is full with {self._waiting} waiting requests",
+                    "queue_full",
+                )
+            waiter = _Waiter()
+            heapq.heappush(self._queue, (int(priority), next(self._arrivals), waiter))
+            self._waiting += 1
+            return waiter
+
+    def _wait(self, waiter: _Waiter) -> None:
+        waiter.event.wait(self.queue_timeout)
+        with self._lock:
+            if waiter.admitted:
+                return
+            # Dequeued lazily by `release`
+            waiter.cancelled = True
+            self._waiting -= 1
+            self._timed_out += 1
+        raise AdmissionRejectedError(
+            f"The request waited more than {self.queue_timeout} seconds for admission",
+            "timed_out",
+        )
+
+    def _release_if_admitted(self, waiting: "asyncio.Future[None]") -> None:
+        if not waiting.cancelled() and waiting.exception() is None:
+            self.release()
+
+    def release(self) -> None:
+        """
+        Release an admission slot, handing it to the first waiting request.
+        """
+        with self._lock:
+            while self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                if not waiter.cancelled:
+                    # The slot is handed over, so the number of requests in flight is unchanged
+                    waiter.admitted = True
+                    self._waiting -= 1
+                    self._admitted += 1
+                    waiter.event.set()
+                    return
+            self._in_flight -= 1
+
+    def info(self) -> AdmissionInfo:
+        """
+        Return the number of requests in flight and waiting, and the admission and rejection counts.
+        """
+        with self._lock:
+            return AdmissionInfo(
+                self._in_flight,
+                self._waiting,
+                self._admitted,
+                self._rate_limited,
+                self._queue_full,
+                self._timed_out,
+            )
+
+    def _take_token(self, session_id: Optional[str]) -> None:
+        if self.session_rate is None:
+            return
+        now = time.monotonic()
+        bucket = self._buckets.get(session_id)
+        if bucket is None:
+            if len(self._buckets) >= MAX_IDLE_BUCKETS:
+                self._drop_full_buckets(now)
+            bucket = self._buckets[session_id] = _Bucket(self.session_burst, now)
+        else:
+            bucket.tokens = min(
+                self.session_burst,
+                bucket.tokens + (now - bucket.updated) * self.session_rate,
+            )
+            bucket.updated = now
+        if bucket.tokens < 1:
+            self._rate_limited += 1
+            raise AdmissionRejectedError(
+                f"Too many requests from this session, the limit is {self.session_rate} per second",
+                "rate_limited",
+            )
+        bucket.tokens -= 1
+
+    def _drop_full_buckets(self, now: float) -> None:
+        # A bucket that has refilled is the same as a new one
+        refill = self.session_burst / self.session_rate
+        for session_id, bucket in list(self._buckets.items()):
+            if now - bucket.updated >= refill:
+                del self._buckets[session_id]
@@ -0,0 +1,53 @@
+import asyncio
+import weakref
+from typing import Callable
+
+from weaviate.client import WeaviateAsyncClient
+
+
+class AsyncClients:
+    """
+    Create, connect and cache one Weaviate async client per event loop.
+
+    Async clients are bound to the event loop they are created in, so each
+    running loop gets its own client. The client of a loop is connected once
+    and reused by every coroutine running in that loop.
+    """
+
+    def __init__(self, factory: Callable[[], WeaviateAsyncClient]) -> None:
+        """
+        Initialize the registry.
+
+        Parameters
+        ----------
+        factory : Callable[[], WeaviateAsyncClient]
+            Creates a new, unconnected async client.
+        """
+        self._factory = factory
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def get(self) -> WeaviateAsyncClient:
+        """
+        Return the connected async client of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            entry = self._clients[loop] = (self._factory(), asyncio.Lock())
+        client, lock = entry
+        if not client.is_connected():
+            async with lock:
+                if not client.is_connected():
+                    await client.connect()
+        return client
+
+    async def close(self) -> None:
+        """
+        Close the async client of the running event loop, if there is one.
+        """
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].close()
+
@@ -0,0 +1,270 @@
+import dataclasses
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from weaviate.classes.config import DataType
+
+from .dataframes import ADDITIONAL_PREFIX, Schema, _transpose, vector_column_name
+
+# Converted with `str`, as Arrow has no type for them
+_STRING_TYPES = {DataType.UUID, DataType.UUID_ARRAY}
+
+
+def import_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Arrow output requires pyarrow. Install it with `pip install pyarrow`."
+        ) from e
+    return pyarrow
+
+
+def table_to_output(table: Any, output: str) -> Any:
+    """
+    Return an Arrow table as is for the "arrow" output, or as a `polars.DataFrame` for "polars".
+
+    The polars DataFrame shares the memory of the table.
+    """
+    if output != "polars":
+        return table
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError(
+            "Polars output requires polars. Install it with `pip install polars`."
+        ) from e
+    return polars.from_arrow(table)
+
+
+def objects_to_table(
+    objects: Sequence[Any],
+    return_properties: Optional[Sequence[str]] = None,
+    schema: Optional[Schema] = None,
+    include_metadata: bool = False,
+    include_vector: bool = False,
+) -> Any:
+    """
+    Convert Weaviate objects to a `pyarrow.Table`. Takes the arguments of `objects_to_columns`.
+
+    The columns are named like those of `objects_to_columns`. Properties are typed from the schema,
+    or inferred from the values, object properties are flattened into `<property>.<field>` columns,
+    and vectors of the same length are stored as fixed-size lists of float32.
+    """
+    pa = import_pyarrow()
+    properties = [obj.properties for obj in objects]
+    values_by_name = _transpose(properties)
+    if return_properties is None:
+        names = list(values_by_name)
+    else:
+        names = [
+            name if isinstance(name, str) else name.name for name in return_properties
+        ]
+
+    columns: Dict[str, Any] = {}
+    for name in names:
+        values = values_by_name.get(name)
+        if values is None:
+            values = [None] * len(properties)
+        data_type = schema.get(name) if schema is not None else None
+        array = _typed_array(pa, values, data_type)
+        if pa.types.is_struct(array.type):
+            columns.update(_flatten_struct(pa, name, array, values))
+        else:
+            columns[name] = array
+
+    if include_metadata:
+        columns[ADDITIONAL_PREFIX + "id"] = pa.array(
+            [str(obj.uuid) for obj in objects], type=pa.string()
+        )
+        columns.update(_metadata_arrays(pa, objects))
+    if include_vector:
+        vector_names = dict.fromkeys(
+            name for obj in objects for name in obj.vector or {}
+        )
+        for name in vector_names:
+            columns[vector_column_name(name)] = vectors_to_array(
+                [(obj.vector or {}).get(name) for obj in objects]
+            )
+    return pa.table(columns)
+
+
+def gql_rows_to_table(rows: List[Dict[str, Any]]) -> Any:
+    """
+    Convert GraphQL result rows to a `pyarrow.Table`.
+
+    Nested fields are flattened into `<field>.<subfield>` columns, like `pd.json_normalize`,
+    and the vectors in `_additional` are stored as fixed-size lists of float32.
+    """
+    pa = import_pyarrow()
+    if not rows:
+        return pa.table({})
+    try:
+        array = pa.array(rows)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # A field has values of mixed types, e.g. numbers and strings: convert the columns one by one
+        array = None
+    if array is None or not pa.types.is_struct(array.type):
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        columns = {
+            name: _infer_array(pa, [row.get(name) for row in rows]) for name in names
+        }
+    else:
+        columns = dict(_flatten_struct(pa, None, array, rows))
+    return pa.table(_with_fixed_size_vectors(pa, columns))
+
+
+def dataframe_to_table(df: Any) -> Any:
+    """
+    Convert a DataFrame with the columns of `objects_to_columns` to a `pyarrow.Table`,
+    storing its vectors as fixed-size lists of float32.
+    """
+    pa = import_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    columns = {
+        name: column.combine_chunks()
+        for name, column in zip(table.column_names, table.columns)
+    }
+    return pa.table(_with_fixed_size_vectors(pa, columns))
+
+
+def vectors_to_array(vectors: Sequence[Optional[Sequence[float]]]) -> Any:
+    """
+    Store vectors in a `pyarrow.FixedSizeListArray` of float32, or a list array if their lengths differ.
+
+    Missing vectors are null.
+    """
+    pa = import_pyarrow()
+    present = [v for v in vectors if v is not None]
+    dims = {len(v) for v in present}
+    if len(dims) > 1:
+        return pa.array(vectors, type=pa.list_(pa.float32()))
+    dim = dims.pop() if dims else 0
+    if len(present) < len(vectors) or dim == 0:
+        return pa.array(vectors, type=pa.list_(pa.float32(), dim))
+    flat = np.asarray(vectors, dtype=np.float32).reshape(-1)
+    return pa.FixedSizeListArray.from_arrays(pa.array(flat), dim)
+
+
+def _with_fixed_size_vectors(pa: Any, columns: Dict[str, Any]) -> Dict[str, Any]:
+    prefixes = (ADDITIONAL_PREFIX + "vector", ADDITIONAL_PREFIX + "vectors.")
+    return {
+        name: (
+            _fixed_size_vectors(pa, column)
+            if name.startswith(prefixes) and pa.types.is_list(column.type)
+            else column
+        )
+        for name, column in columns.items()
+    }
+
+
+def _fixed_size_vectors(pa: Any, column: Any) -> Any:
+    import pyarrow.compute as pc
+
+    bounds = pc.min_max(pc.list_value_length(column))
+    dim = bounds["min"].as_py()
+    if column.null_count or dim is None or dim != bounds["max"].as_py():
+        return vectors_to_array(column.to_pylist())
+    values = column.flatten().cast(pa.float32())
+    return pa.FixedSizeListArray.from_arrays(values, dim)
+
+
+def _typed_array(pa: Any, values: List[Any], data_type: Optional[DataType]) -> Any:
+    if data_type in _STRING_TYPES:
+        values = [_str_values(v) for v in values]
+    arrow_type = _arrow_type(pa, data_type)
+    if arrow_type is not None:
+        try:
+            return pa.array(values, type=arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            pass
+    return _infer_array(pa, values)
+
+
+def _arrow_type(pa: Any, data_type: Optional[DataType]) -> Any:
+    types = {
+        DataType.TEXT: pa.string(),
+        DataType.UUID: pa.string(),
+        DataType.BLOB: pa.string(),
+        DataType.INT: pa.int64(),
+        DataType.NUMBER: pa.float64(),
+        DataType.BOOL: pa.bool_(),
+        DataType.DATE: pa.timestamp("us", tz="UTC"),
+        DataType.TEXT_ARRAY: pa.list_(pa.string()),
+        DataType.UUID_ARRAY: pa.list_(pa.string()),
+        DataType.INT_ARRAY: pa.list_(pa.int64()),
+        DataType.NUMBER_ARRAY: pa.list_(pa.float64()),
+        DataType.BOOL_ARRAY: pa.list_(pa.bool_()),
+        DataType.DATE_ARRAY: pa.list_(pa.timestamp("us", tz="UTC")),
+    }
+    return types.get(data_type)
+
+
+def _infer_array(pa: Any, values: List[Any]) -> Any:
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return pa.array(
+            [None if v is None else str(v) for v in values], type=pa.string()
+        )
+
+
+def _str_values(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [_str_values(v) for v in value]
+    return str(value)
+
+
+def _flatten_struct(
+    pa: Any, name: Optional[str], array: Any, values: List[Any]
+) -> List[Any]:
+    columns = _struct_fields(pa, name, array)
+    # Arrow sorts inferred struct fields by name, `pd.json_normalize` keeps their order of first appearance
+    order = _field_order(pa, array.type, values, name, {})
+    return sorted(columns, key=lambda column: order.get(column[0], len(order)))
+
+
+def _struct_fields(pa: Any, name: Optional[str], array: Any) -> List[Any]:
+    # `flatten` propagates the nulls of the struct to its fields
+    columns = []
+    for field, child in zip(array.type, array.flatten()):
+        child_name = field.name if name is None else f"{name}.{field.name}"
+        if pa.types.is_struct(child.type):
+            columns.extend(_struct_fields(pa, child_name, child))
+        else:
+            columns.append((child_name, child))
+    return columns
+
+
+def _field_order(
+    pa: Any,
+    struct_type: Any,
+    values: List[Any],
+    name: Optional[str],
+    order: Dict[str, int],
+) -> Dict[str, int]:
+    dicts = [v for v in values if isinstance(v, dict)]
+    layouts = dict.fromkeys(tuple(v) for v in dicts)
+    for key in dict.fromkeys(key for layout in layouts for key in layout):
+        child_name = key if name is None else f"{name}.{key}"
+        child_type = struct_type.field(key).type
+        if pa.types.is_struct(child_type):
+            children = [v.get(key) for v in dicts]
+            _field_order(pa, child_type, children, child_name, order)
+        else:
+            order.setdefault(child_name, len(order))
+    return order
+
+
+def _metadata_arrays(pa: Any, objects: Sequence[Any]) -> Dict[str, Any]:
+    metadata = [obj.metadata for obj in objects]
+    if not metadata or not dataclasses.is_dataclass(metadata[0]):
+        return {}
+    columns = {}
+    for field in dataclasses.fields(metadata[0]):
+        values = [getattr(m, field.name, None) for m in metadata]
+        if any(v is not None for v in values):
+            columns[ADDITIONAL_PREFIX + field.name] = _infer_array(pa, values)
+    return columns
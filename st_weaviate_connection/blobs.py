@@ -0,0 +1,172 @@
+import base64
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .cache import CacheInfo
+
+BlobFetcher = Callable[[str, str, List[str]], Dict[str, Optional[str]]]
+
+
+class BlobRef:
+    """
+    A lazy handle to a BLOB property of an object, loaded from Weaviate when it is first needed.
+    """
+
+    __slots__ = ("store", "collection_name", "uuid", "property")
+
+    def __init__(
+        self, store: "BlobStore", collection_name: str, uuid: Any, property: str
+    ) -> None:
+        self.store = store
+        self.collection_name = collection_name
+        self.uuid = str(uuid)
+        self.property = property
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.collection_name, self.property, self.uuid)
+
+    def load(self) -> Optional[bytes]:
+        """
+        Return the decoded bytes of the BLOB, or None if it is empty.
+        """
+        return self.store.load([self])[0]
+
+    def data_uri(self, mime_type: str = "image/png") -> Optional[str]:
+        """
+        Return the BLOB as a `data:` URI, e.g. for an HTML `<img>` tag.
+        """
+        data = self.load()
+        if data is None:
+            return None
+        return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BlobRef) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"BlobRef({self.collection_name}/{self.uuid}.{self.property})"
+
+
+class BlobStore:
+    """
+    Load BLOB properties in bulk and keep the decoded bytes in an LRU cache bounded by their total size.
+    """
+
+    def __init__(self, fetch: BlobFetcher, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Initialize the store.
+
+        Parameters
+        ----------
+        fetch : Callable[[str, str, List[str]], Dict[str, Optional[str]]]
+            Fetches the base64-encoded values of a property of a collection, by uuid.
+        max_bytes : int, optional
+            The maximum total size of the cached BLOBs. BLOBs larger than this are not cached.
+            Default: 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self._fetch = fetch
+        self._entries: "OrderedDict[Tuple[str, str, str], Optional[bytes]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def ref(self, collection_name: str, uuid: Any, property: str) -> BlobRef:
+        """
+        Return a lazy handle to a BLOB property of an object.
+        """
+        return BlobRef(self, collection_name, uuid, property)
+
+    def load(self, refs: Iterable[Optional[BlobRef]]) -> List[Optional[bytes]]:
+        """
+        Return the decoded bytes of each handle, fetching the missing BLOBs with one request per property.
+
+        Items that are not handles are returned as they are.
+        """
+        refs = list(refs)
+        found: Dict[Tuple[str, str, str], Optional[bytes]] = {}
+        missing: Dict[Tuple[str, str], List[str]] = {}
+        with self._lock:
+            for ref in refs:
+                if not isinstance(ref, BlobRef) or ref.key in found:
+                    continue
+                if ref.key in self._entries:
+                    self._entries.move_to_end(ref.key)
+                    found[ref.key] = self._entries[ref.key]
+                    self._hits += 1
+                else:
+                    missing.setdefault((ref.collection_name, ref.property), []).append(
+                        ref.uuid
+                    )
+                    found[ref.key] = None
+                    self._misses += 1
+
+        for (collection_name, property), uuids in missing.items():
+            values = self._fetch(collection_name, property, uuids)
+            for uuid in uuids:
+                value = values.get(uuid)
+                data = base64.b64decode(value) if value else None
+                found[(collection_name, property, uuid)] = data
+                self._put((collection_name, property, uuid), data)
+
+        return [found[ref.key] if isinstance(ref, BlobRef) else ref for ref in refs]
+
+    def clear(self, collection_name: Optional[str] = None) -> None:
+        """
+        Remove the cached BLOBs, or only those of one collection.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if collection_name is None or key[0] == collection_name:
+                    self._bytes -= _size(self._entries.pop(key))
+
+    def info(self) -> CacheInfo:
+        """
+        Return the hit and miss counts, the maximum size and the current size of the cache, in bytes.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.max_bytes, self._bytes)
+
+    def _put(self, key: Tuple[str, str, str], data: Optional[bytes]) -> None:
+        size = _size(data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= _size(self._entries.pop(key))
+            self._entries[key] = data
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _size(evicted)
+
+
+def attach_blob_refs(
+    df: Optional[pd.DataFrame],
+    store: BlobStore,
+    collection_name: str,
+    objects: Sequence[Any],
+    properties: Sequence[str],
+) -> Optional[pd.DataFrame]:
+    """
+    Fill the BLOB columns of a result with lazy handles, one per object.
+    """
+    if df is None:
+        return df
+    for name in properties:
+        df[name] = [store.ref(collection_name, obj.uuid, name) for obj in objects]
+    return df
+
+
+def _size(data: Optional[bytes]) -> int:
+    return 0 if data is None else len(data)
@@ -0,0 +1,429 @@
+import dataclasses
+import datetime
+import enum
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from weaviate.collections.classes.filters import _FilterAnd, _FilterOr, _Filters
+
+if TYPE_CHECKING:
+    from .disk_cache import DiskCache
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+MISSING = object()
+
+_GRAPHQL_TOKENS = re.compile(
+    r'(?P<string>"""[\s\S]*?"""|"(?:\\.|[^"\\])*")|(?P<comment>#[^\n]*)|(?P<space>[\s,]+)'
+)
+_GRAPHQL_PUNCTUATORS = set("{}()[]:=!$@|&")
+
+_result_caches: Dict[Hashable, "QueryCache"] = {}
+_result_caches_lock = threading.Lock()
+
+
+def serialize_filters(filters: Optional[_Filters]) -> Any:
+    """
+    Convert a Weaviate filter tree to a JSON-serializable structure.
+
+    The structure only depends on the operators, targets and values of the filters,
+    so two filter trees built separately from the same arguments serialize identically.
+    """
+    if filters is None:
+        return None
+    if isinstance(filters, (_FilterAnd, _FilterOr)):
+        return {
+            "operator": filters.operator.value,
+            "filters": [serialize_filters(f) for f in filters.filters],
+        }
+    return {
+        "operator": filters.operator.value,
+        "target": _to_jsonable(filters.target),
+        "value": _to_jsonable(filters.value),
+    }
+
+
+def _to_jsonable(value: Any) -> Any:
+    if isinstance(value, _Filters):
+        return serialize_filters(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(_to_jsonable(v) for v in value)
+    if type(value).__module__ == "numpy" and hasattr(value, "tolist"):
+        # numpy arrays and scalars, by value: the repr of large arrays is truncated
+        return _to_jsonable(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if hasattr(value, "model_dump"):
+        return _to_jsonable(value.model_dump())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _to_jsonable(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+        }
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_graphql(query: str) -> str:
+    """
+    Collapse the whitespace, commas and comments of a GraphQL query.
+
+    String literals are kept as they are, so two queries normalize to the same text
+    if and only if they only differ in formatting.
+    """
+    tokens = []
+    position = 0
+    for match in _GRAPHQL_TOKENS.finditer(query):
+        tokens.append(query[position : match.start()])
+        tokens.append(match.group() if match.group("string") is not None else None)
+        position = match.end()
+    tokens.append(query[position:])
+
+    parts = []
+    pending_space = False
+    for token in tokens:
+        if token is None:
+            pending_space = True
+        elif token:
+            if pending_space and parts and _needs_space(parts[-1], token):
+                parts.append(" ")
+            parts.append(token)
+            pending_space = False
+    return "".join(parts)
+
+
+def _needs_space(before: str, after: str) -> bool:
+    return (
+        before[-1] not in _GRAPHQL_PUNCTUATORS
+        and after[0] not in _GRAPHQL_PUNCTUATORS
+    )
+
+
+def get_result_cache(
+    identity: Hashable, max_entries: int = 128, disk: Optional["DiskCache"] = None
+) -> "QueryCache":
+    """
+    Return the process-wide result cache of a connection.
+
+    Parameters
+    ----------
+    identity : Hashable
+        Identifies the connection, e.g. its name and URL. Connections with the same
+        identity share one cache, which outlives the connection objects.
+    max_entries : int, optional
+        The maximum number of entries of the cache. Default: 128.
+    disk : DiskCache, optional
+        A disk cache to keep the entries in as well, shared with other processes
+        under a namespace derived from `identity`. An existing cache keeps its disk
+        cache if None. Default: None.
+    """
+    with _result_caches_lock:
+        cache = _result_caches.get(identity)
+        if cache is None:
+            cache = _result_caches[identity] = QueryCache(
+                max_entries=max_entries,
+                disk=disk,
+                namespace=make_cache_key("result_cache", identity),
+            )
+        else:
+            cache.max_entries = max_entries
+            if disk is not None:
+                cache.disk = disk
+        return cache
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from query arguments.
+
+    Parameters
+    ----------
+    *parts : Any
+        The values identifying a query, e.g. the collection name, the query text,
+        the limit and the filters. Weaviate filter trees, target vector joins,
+        enums, dates and UUIDs are serialized by value.
+    """
+    payload = "[" + ",".join(serialize_key_part(part) for part in parts) + "]"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def serialize_key_part(part: Any) -> str:
+    """
+    Serialize one of the parts of `make_cache_key` to its JSON text.
+    """
+    return json.dumps(
+        _to_jsonable(part), sort_keys=True, separators=(",", ":"), default=repr
+    )
+
+
+def serialize_all_of(parts: Iterable[str]) -> str:
+    """
+    Return the JSON text of `Filter.all_of` on filters, given the JSON text of each filter.
+    """
+    operator = serialize_key_part(_FilterAnd([]).operator)
+    return '{"filters":[' + ",".join(parts) + '],"operator":' + operator + "}"
+
+
+class CacheKeyTemplate:
+    """
+    Build the keys of `make_cache_key(*prefix, kwargs, *suffix)` for arguments that mostly stay the same.
+
+    The prefix, the suffix and the initial value of each argument are serialized once. On each call,
+    only the arguments whose value is not the initial object, or whose JSON text is given, are serialized.
+    The keys are equal to those of `make_cache_key`.
+    """
+
+    def __init__(
+        self, prefix: Iterable[Any], kwargs: Dict[str, Any], suffix: Iterable[Any] = ()
+    ) -> None:
+        self._prefix = "[" + "".join(serialize_key_part(p) + "," for p in prefix) + "{"
+        self._suffix = "}" + "".join("," + serialize_key_part(p) for p in suffix) + "]"
+        self._values = dict(kwargs)
+        self._names = {name: json.dumps(name) for name in sorted(kwargs)}
+        self._parts = {name: serialize_key_part(v) for name, v in kwargs.items()}
+
+    def part(self, name: str) -> str:
+        """
+        Return the JSON text of the initial value of an argument.
+        """
+        return self._parts[name]
+
+    def key(self, kwargs: Dict[str, Any], **parts: str) -> str:
+        """
+        Return the cache key of the arguments, given the JSON text of some of them in `parts`.
+        """
+        items = []
+        for name, quoted in self._names.items():
+            part = parts.get(name)
+            if part is None:
+                value = kwargs[name]
+                if value is self._values[name]:
+                    part = self._parts[name]
+                else:
+                    part = serialize_key_part(value)
+            items.append(f"{quoted}:{part}")
+        payload = self._prefix + ",".join(items) + self._suffix
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class QueryCache:
+    """
+    A thread-safe, size-bounded LRU cache whose entries expire after a time-to-live.
+
+    With a disk cache, entries are written to both, and entries missing from memory are
+    looked up on disk, e.g. after a restart or when another process computed them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        disk: Optional["DiskCache"] = None,
+        namespace: str = "",
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of entries to keep. The least recently used entry is
+            evicted when the cache is full. Default: 128.
+        disk : DiskCache, optional
+            A second, persistent tier of the cache. Default: None.
+        namespace : str, optional
+            Separates the entries of this cache from those of other caches on the same disk.
+            Default: "".
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.disk = disk
+        self.namespace = namespace
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is absent or expired.
+        """
+        disk = self.disk
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            if disk is None:
+                self._misses += 1
+                return default
+
+        # The disk is read without holding the lock, so that memory hits never wait for it
+        value, ttl, tags = disk.get(self.namespace, str(key))
+        with self._lock:
+            if value is MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._store(key, value, ttl, tags)
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Store `value` under `key`.
+
+        Parameters
+        ----------
+        key : Hashable
+            The cache key, e.g. as returned by `make_cache_key`.
+        value : Any
+            The value to cache.
+        ttl : float, optional
+            The number of seconds after which the entry expires.
+            If not provided, the entry only leaves the cache through LRU eviction.
+        tags : Iterable[str], optional
+            Labels for the entry, e.g. the names of the queried collections,
+            which `invalidate` can remove it by.
+        """
+        tags = frozenset(tags)
+        disk = self.disk
+        with self._lock:
+            self._store(key, value, ttl, tags)
+        if disk is not None:
+            disk.set(self.namespace, str(key), value, ttl=ttl, tags=tags)
+
+    def invalidate(self, tag: str) -> int:
+        """
+        Remove all entries labelled with `tag` and return how many were removed.
+
+        With a disk cache, the entries are removed from the disk as well,
+        and the count includes those only found on disk.
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if tag in entry[2]]
+            for key in keys:
+                del self._entries[key]
+        if self.disk is None:
+            return len(keys)
+        return max(len(keys), self.disk.invalidate(self.namespace, tag))
+
+    def clear(self) -> None:
+        """
+        Remove all entries, including those on disk, and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+        if self.disk is not None:
+            self.disk.clear(self.namespace)
+
+    def _store(
+        self, key: Hashable, value: Any, ttl: Optional[float], tags: frozenset
+    ) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, expires_at, tags)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        """
+        Return the hit and miss counts, the maximum size and the current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self.max_entries, len(self._entries)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into a single execution.
+
+    While a call for a key is in flight, other callers with the same key wait for it
+    and receive its result, or its exception, instead of running their own call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `fn` unless a call with the same key is in flight, and return its result.
+
+        Returns
+        -------
+        Tuple[Any, bool]
+            The result, and whether it was handed to more than one caller.
+            Shared results must not be mutated in place.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                call.done.set()
+        return call.value, call.waiters > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._calls)
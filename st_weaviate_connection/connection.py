@@ -1,34 +1,247 @@
-from typing import Optional, List, Tuple
+import contextlib
+import functools
+import inspect
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
+import streamlit as st
 import weaviate
 from streamlit.connections import BaseConnection
-from streamlit.runtime.caching import cache_data
-from weaviate.client import WeaviateClient
+from weaviate.client import WeaviateAsyncClient, WeaviateClient
 from weaviate.auth import _APIKey
 from weaviate.classes.init import Auth
 from weaviate.collections.classes.internal import _RawGQLReturn
 from weaviate.collections.classes.filters import (
     _Filters,
 )
+from weaviate.collections.classes.aggregate import PropertiesMetrics
 from weaviate.collections.classes.grpc import TargetVectorJoinType
 from weaviate.collections.classes.data import DataObject
 from weaviate.collections.classes.types import WeaviateProperties
+from weaviate.classes.aggregate import GroupByAggregate
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter, MetadataQuery
+from weaviate.exceptions import WeaviateBaseError
+
+from .admission import (
+    AdmissionController,
+    AdmissionInfo,
+    Priority,
+    current_session_id,
+    session_scope,
+)
+from .aio import AsyncClients
+from .blobs import BlobStore, attach_blob_refs
+from .cache import (
+    MISSING,
+    CacheInfo,
+    CacheKeyTemplate,
+    SingleFlight,
+    get_result_cache,
+    make_cache_key,
+    normalize_graphql,
+)
+from .dataframes import (
+    ADDITIONAL_PREFIX,
+    Schema,
+    VectorResult,
+    aggregate_to_dataframe,
+    check_output,
+    collection_schema,
+    is_arrow_table,
+    objects_to_dataframe,
+    objects_to_matrices,
+    pop_gql_vectors,
+    vector_column_name,
+)
+from .filters import UnsupportedFilterError, filter_mask, filter_properties
+from .ingest import BATCHING_MODES, dataframe_objects
+from .lifecycle import ConnectionInfo, ConnectionManager
+from .pagination import QueryPages
+from .prepared import FilterParam, PreparedQuery, validate_query
+from .stats import Stats, StatsHook, annotate, phase, result_size
+
+# Imported when they are first used, as most apps use neither several endpoints, re-ranking nor Arrow output
+if TYPE_CHECKING:
+    from .rerank import Reranker
+    from .routing import EndpointInfo
 
 
 def weaviate_response_objects_to_df(
-    objects: List[DataObject[WeaviateProperties, None]]
-) -> pd.DataFrame:
+    objects: List[DataObject[WeaviateProperties, None]],
+    return_properties: Optional[List[str]] = None,
+    schema: Optional[Schema] = None,
+    include_metadata: bool = False,
+    include_vector: bool = False,
+    output: str = "pandas",
+) -> Any:
     """
     Convert a list of Weaviate DataObjects to a pandas DataFrame.
+
+    Columns are built directly from the object properties. Only object properties are
+    flattened with `pd.json_normalize`, into `<property>.<field>` columns.
+    With `output="arrow"` or `output="polars"`, a `pyarrow.Table` or a `polars.DataFrame`
+    with the same columns is built instead, without pandas.
+
+    Parameters
+    ----------
+    objects : List[DataObject]
+        The objects to convert, e.g. `response.objects`.
+    return_properties : List[str], optional
+        The properties to convert, in column order.
+        If not provided, all properties of the objects are converted.
+    schema : Dict[str, DataType], optional
+        The data types of the properties, used to build typed columns.
+        If not provided, the column types are inferred from the values.
+    include_metadata : bool, optional
+        Whether to add the `_additional.id` column and an `_additional.<field>` column
+        for each metadata field returned by the query. Default: False.
+    include_vector : bool, optional
+        Whether to add the `_additional.vector` column, or an `_additional.vectors.<name>`
+        column for each named vector. Default: False.
+    output : str, optional
+        The type of the result: "pandas" for a pandas DataFrame, "arrow" for a `pyarrow.Table`, or
+        "polars" for a `polars.DataFrame`. Arrow and polars columns are typed from `schema`, and
+        vectors are fixed-size lists of float32. Default: "pandas".
     """
+    check_output(output)
+    if objects and output != "pandas":
+        from .arrow import objects_to_table, table_to_output
+
+        table = objects_to_table(
+            objects,
+            return_properties=return_properties,
+            schema=schema,
+            include_metadata=include_metadata,
+            include_vector=include_vector,
+        )
+        return table_to_output(table, output)
     if objects:
-        df = pd.json_normalize([obj.properties for obj in objects])
+        df = objects_to_dataframe(
+            objects,
+            return_properties=return_properties,
+            schema=schema,
+            include_metadata=include_metadata,
+            include_vector=include_vector,
+        )
         return df
     else:
         return None
 
 
+QueryResult = namedtuple("QueryResult", ["df", "error", "seconds"])
+
+GenerateResult = namedtuple("GenerateResult", ["df", "stream"])
+
+ConnectionStats = namedtuple(
+    "ConnectionStats", ["histograms", "cache", "blob_cache", "connection", "admission"]
+)
+
+InsertResult = namedtuple(
+    "InsertResult", ["inserted", "failed", "seconds", "objects_per_second"]
+)
+
+VECTOR_FORMATS = ("column", "matrix")
+
+HYBRID_METADATA = MetadataQuery(score=True, explain_score=True)
+
+PREFILTER_CACHE_TTL = 600
+
+BLOB_FETCH_SIZE = 100
+
+# The number of closest objects aggregated by `aggregate` with `near_text` or `near_vector`, if not given
+AGGREGATE_OBJECT_LIMIT = 100
+
+
+def _check_vector_format(vector_format: str) -> None:
+    if vector_format not in VECTOR_FORMATS:
+        raise ValueError(
+            f"vector_format must be one of {VECTOR_FORMATS}, got {vector_format!r}"
+        )
+
+
+def _copy_result(result: Any) -> Any:
+    if isinstance(result, VectorResult):
+        # The vector matrices are read-only, so they can be shared
+        return VectorResult(_copy_result(result.df), dict(result.vectors))
+    if (
+        result is None
+        or isinstance(result, (str, QueryPages))
+        or is_arrow_table(result)
+    ):
+        # Arrow tables are immutable, so they can be shared
+        return result
+    if hasattr(result, "clone"):
+        # polars DataFrames have no `copy`
+        return result.clone()
+    return result.copy()
+
+
+def _check_output(output: str, lazy_blobs: bool = False) -> None:
+    check_output(output)
+    if lazy_blobs and output != "pandas":
+        raise ValueError("lazy_blobs requires output='pandas'")
+
+
+def _cache_output(output: str) -> str:
+    # Polars results are converted from cached Arrow tables, so that both share them
+    return "pandas" if output == "pandas" else "arrow"
+
+
+def _output_key(output: str) -> Tuple[str, ...]:
+    # Only Arrow and polars results get a different key, so that existing keys are unchanged
+    return () if output == "pandas" else ("arrow",)
+
+
+def _to_output(result: Any, output: str) -> Any:
+    if output == "pandas" or result is None:
+        return result
+    if isinstance(result, VectorResult):
+        return VectorResult(_to_output(result.df, output), result.vectors)
+    from .arrow import dataframe_to_table, table_to_output
+
+    if isinstance(result, pd.DataFrame):
+        # Prefiltered results are filtered locally as DataFrames
+        result = dataframe_to_table(result)
+    return table_to_output(result, output)
+
+
+def _priority(hybrid_kwargs: Dict[str, Any]) -> Priority:
+    # Keyword queries skip the vector search, so they are cheaper than hybrid queries
+    return Priority.KEYWORD if hybrid_kwargs["alpha"] == 0 else Priority.QUERY
+
+
+def _lazy_key(lazy_blobs: bool) -> Tuple[str, ...]:
+    # Only lazy queries get a different key, so that `aquery` shares the results of `query`
+    return ("lazy_blobs",) if lazy_blobs else ()
+
+
+def _is_memory_url(url: Optional[str]) -> bool:
+    # Checked without importing the memory backend, which is only loaded for `memory://` URLs
+    return url is not None and url.startswith("memory://")
+
+
+def _gql_tags(results: _RawGQLReturn) -> List[str]:
+    return list(results.get) + list(results.aggregate)
+
+
 class WeaviateConnection(BaseConnection["WeaviateClient"]):
     """
     A Streamlit connection to a Weaviate database.
@@ -37,9 +250,24 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
     def __init__(
         self,
         connection_name: str,
-        url: str=None,
+        url: Union[str, List[str]]=None,
         api_key=None,
         additional_headers=None,
+        cache_max_entries: int = 128,
+        health_check_interval: Optional[float] = 30.0,
+        blob_cache_bytes: int = 64 * 1024 * 1024,
+        instrument: bool = True,
+        hedge_percentile: Optional[float] = None,
+        eject_seconds: float = 30.0,
+        warm_up: Union[bool, List[str]] = False,
+        max_in_flight: Optional[int] = None,
+        session_rate: Optional[float] = None,
+        session_burst: Optional[int] = None,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+        disk_cache: Optional[str] = None,
+        disk_cache_bytes: int = 1024**3,
+        disk_cache_pickle: bool = False,
         **kwargs,
     ) -> None:
         """
@@ -52,6 +280,12 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
         url : str, optional
             The URL of a Weaviate Cloud cluster.
             Provide this or the `weaviate_client` parameter.
+            Use "localhost" for a local instance, or a `memory://` URL such as "memory://movies"
+            for an in-process database, see `st_weaviate_connection.memory`.
+            A list of URLs connects to several replicas of the same database: `query` and
+            `graphql_query` are routed to the endpoint with the lowest observed latency and load,
+            and fail over to the other endpoints on connection errors. Writes and all other
+            methods use the first URL.
             Default: None.
         api_key : str, optional
             The Weaviate API key to use for authentication. Default: None.
@@ -59,29 +293,232 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
             Additional headers to include in the request.
             e.g.: "X-<PROVIDER>-Api-Key": "<API_KEY>".
             Default: None.
+        cache_max_entries : int, optional
+            The maximum number of `query` and `graphql_query` results to keep in the result cache.
+            Least recently used results are evicted first. Default: 128.
+        health_check_interval : float, optional
+            The minimum number of seconds between two liveness probes of the open connection.
+            The client is connected once and only reconnected after a failed probe or request.
+            If None, the connection is never probed. Default: 30.
+        blob_cache_bytes : int, optional
+            The maximum total size in bytes of the BLOBs loaded through lazy handles, see `query`.
+            Least recently used BLOBs are evicted first. Default: 64 MiB.
+        instrument : bool, optional
+            Whether to record the latency, phase timings, row counts and result sizes of
+            `query`, `graphql_query` and `client` calls, see `stats`. Default: True.
+        hedge_percentile : float, optional
+            With several URLs, send a `query` or `graphql_query` request that has not completed after
+            this percentile of the recent latencies, e.g. 0.95, to a second endpoint as well,
+            and return the first response. If None, requests are not hedged. Default: None.
+        eject_seconds : float, optional
+            With several URLs, how long an endpoint gets no traffic after a connection error.
+            It doubles with each consecutive error, and the endpoint is probed before it is used again.
+            Default: 30.
+        warm_up : bool or List[str], optional
+            Whether to create and connect the clients on a background thread instead of in the constructor,
+            so that the app renders without waiting for Weaviate. Calls that need a client wait for the
+            warm-up to finish. With a list of collection names, the warm-up also fetches the schema of
+            each collection and runs a one-object query on it, so that the first real query finds open
+            channels. See `wait_for_warm_up`. Default: False.
+        max_in_flight : int, optional
+            The maximum number of requests that `query`, `graphql_query`, `aggregate` and `generate`
+            send to Weaviate at the same time, across all sessions. Further requests wait in a queue,
+            where keyword queries (`alpha=0`) go before hybrid queries and GraphQL queries, which go before
+            text generation. Cached results are returned without waiting. If None, there is no cap. Default: None.
+        session_rate : float, optional
+            The number of requests per second that each Streamlit session can send to Weaviate, on average.
+            Requests over the rate raise an `AdmissionRejectedError`. If None, sessions are not rate limited.
+            Default: None.
+        session_burst : int, optional
+            The number of requests a session can send at once after being idle. Default: twice `session_rate`.
+        max_queue : int, optional
+            The maximum number of requests waiting for admission under `max_in_flight`.
+            Requests beyond it raise an `AdmissionRejectedError`. Default: 64.
+        queue_timeout : float, optional
+            The maximum number of seconds a request waits for admission before raising
+            an `AdmissionRejectedError`. Default: 10.
+        disk_cache : str, optional
+            The path of a SQLite file in which to keep the cached `query`, `graphql_query` and `aggregate`
+            results as well, e.g. "/var/cache/app/weaviate.db". All processes that use the same file share
+            the results of connections with the same name and URL, and the results survive restarts.
+            Results missing from the in-process cache are looked up in the file first.
+            If None, results are only cached in-process. Default: None.
+        disk_cache_bytes : int, optional
+            The maximum total size in bytes of the results in the disk cache.
+            Least recently used results are evicted first. Default: 1 GiB.
+        disk_cache_pickle : bool, optional
+            Whether to pickle the results that the disk cache cannot store as Arrow tables, JSON or
+            NumPy arrays, e.g. DataFrames with columns of mixed types. Reading them runs code from the file,
+            so only enable it if the file is only writable by the user running the app. Default: False.
         """
 
         self.url = url
         self.api_key = api_key
         self.additional_headers = additional_headers
+        self._stats = Stats(enabled=instrument)
+        self._urls = [url] if url is None or isinstance(url, str) else list(url)
+        self._disk_cache = None
+        if disk_cache is not None:
+            from .disk_cache import get_disk_cache
+
+            self._disk_cache = get_disk_cache(
+                disk_cache, max_bytes=disk_cache_bytes, allow_pickle=disk_cache_pickle
+            )
+        self._result_cache = get_result_cache(
+            (connection_name, tuple(self._urls)),
+            max_entries=cache_max_entries,
+            disk=self._disk_cache,
+        )
+        from .routing import Endpoint, EndpointRouter
+
+        endpoints = []
+        for endpoint_url in self._urls:
+            if warm_up:
+                manager = ConnectionManager(
+                    health_check_interval=health_check_interval,
+                    client_factory=functools.partial(self._create_client, endpoint_url),
+                )
+            else:
+                start = time.perf_counter()
+                client = self._create_client(endpoint_url)
+                manager = ConnectionManager(
+                    client,
+                    health_check_interval=health_check_interval,
+                    connect_seconds=time.perf_counter() - start,
+                )
+            endpoints.append(Endpoint(endpoint_url, manager))
+        self._router = EndpointRouter(
+            endpoints, eject_seconds=eject_seconds, hedge_percentile=hedge_percentile
+        )
+        self._connection_manager = endpoints[0].manager
+        self._in_flight = SingleFlight()
+        self._admission = AdmissionController(
+            max_in_flight=max_in_flight,
+            session_rate=session_rate,
+            session_burst=session_burst,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout,
+        )
+        self._blobs = BlobStore(self._fetch_blobs, max_bytes=blob_cache_bytes)
+        self._schemas: Dict[str, Schema] = {}
+        self._async_clients = AsyncClients(self._create_async_client)
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._warm_up_error: Optional[BaseException] = None
+        # The base class connects in its constructor, which the warm-up defers
+        self._defer_connect = bool(warm_up)
+        super().__init__(connection_name, **kwargs)
+        if warm_up:
+            self._warm_up_thread = threading.Thread(
+                target=self._warm_up,
+                args=([] if warm_up is True else list(warm_up),),
+                name="weaviate-warm-up",
+                daemon=True,
+            )
+            self._warm_up_thread.start()
+
+    def _create_client(self, url: Optional[str]) -> WeaviateClient:
+        if _is_memory_url(url):
+            from . import memory
+
+            return memory.connect(url)
         if url == "localhost":
-            self._client = weaviate.connect_to_local(
+            return weaviate.connect_to_local(
                 auth_credentials=self._create_auth_config(),
                 headers=self.additional_headers,
                 skip_init_checks=True,
             )
         else:
-            self._client = weaviate.connect_to_weaviate_cloud(
+            return weaviate.connect_to_weaviate_cloud(
                 cluster_url=url,
                 auth_credentials=self._create_auth_config(),
                 headers=self.additional_headers,
                 skip_init_checks=True,
             )
-        super().__init__(connection_name, **kwargs)
 
-    def _connect(self) -> WeaviateClient:
-        self._client.connect()
-        return self._client
+    def _create_async_client(self) -> WeaviateAsyncClient:
+        url = self._urls[0]
+        if _is_memory_url(url):
+            from . import memory
+
+            return memory.use_async(url)
+        if url == "localhost":
+            return weaviate.use_async_with_local(
+                auth_credentials=self._create_auth_config(),
+                headers=self.additional_headers,
+                skip_init_checks=True,
+            )
+        else:
+            return weaviate.use_async_with_weaviate_cloud(
+                cluster_url=url,
+                auth_credentials=self._create_auth_config(),
+                headers=self.additional_headers,
+                skip_init_checks=True,
+            )
+
+    def _connect(self) -> Optional[WeaviateClient]:
+        if self._defer_connect:
+            self._defer_connect = False
+            return None
+        return self._connection_manager.acquire()
+
+    def _warm_up(self, collection_names: List[str]) -> None:
+        try:
+            with self._stats.span("warm_up"):
+                for endpoint in self._router.endpoints:
+                    client = endpoint.manager.acquire()
+                    for name in collection_names:
+                        collection = client.collections.get(name=name)
+                        with phase("schema"):
+                            self._collection_schema(name, collection)
+                        with phase("query"):
+                            collection.query.fetch_objects(limit=1, return_properties=[])
+        except Exception as e:
+            # The error is raised again by the first call that needs the failing client
+            self._warm_up_error = e
+
+    def wait_for_warm_up(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background warm-up started with `warm_up` to finish.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait. If None, wait until the warm-up finishes.
+
+        Returns
+        -------
+        bool
+            True if the warm-up completed without errors, or if there is no warm-up.
+            False if it failed or is still running after `timeout`.
+        """
+
+        if self._warm_up_thread is None:
+            return True
+        self._warm_up_thread.join(timeout)
+        return not self._warm_up_thread.is_alive() and self._warm_up_error is None
+
+    def reset(self) -> None:
+        """
+        Reconnect the clients the next time the connection is used.
+        """
+
+        self._router.mark_failed()
+        super().reset()
+
+    def connection_info(self) -> ConnectionInfo:
+        """
+        Return the connect and failure counts and the connect latencies (in seconds) of the connection.
+        """
+
+        return self._connection_manager.info()
+
+    def endpoint_info(self) -> List["EndpointInfo"]:
+        """
+        Return the health, latency moving average (in seconds), outstanding requests and request and
+        failure counts of each endpoint `query` and `graphql_query` are routed to.
+        """
+
+        return self._router.info()
 
     def _create_auth_config(self) -> Optional[_APIKey]:
         api_key = self.api_key or self._secrets.get("WEAVIATE_API_KEY")
@@ -90,10 +527,25 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
         else:
             return None
 
-    def _gql_to_dataframe(self, results: _RawGQLReturn) -> pd.DataFrame:
+    def _gql_to_dataframe(
+        self,
+        results: _RawGQLReturn,
+        vector_format: str = "column",
+        output: str = "pandas",
+    ) -> Any:
+        if results.errors is not None:
+            error_message = f"The GraphQL query returned an error: {results.errors}"
+            raise Exception(error_message)
         collection_name = list(results.get.keys())[0]
         data = results.get[collection_name]
-        df = pd.json_normalize(data)
+        if output == "pandas":
+            to_frame = pd.json_normalize
+        else:
+            from .arrow import gql_rows_to_table as to_frame
+        if vector_format == "matrix":
+            data, vectors = pop_gql_vectors(data)
+            return VectorResult(to_frame(data), vectors)
+        df = to_frame(data)
         return df
 
     def query(
@@ -106,12 +558,20 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
         query_properties: Optional[List[str]] = None,
         return_properties: Optional[List[str]] = None,
         alpha: float = 0.7,
-    ) -> pd.DataFrame:
+        cache_ttl: Optional[int] = None,
+        include_metadata: bool = False,
+        include_vector: Union[bool, List[str]] = False,
+        vector_format: str = "column",
+        prefilter: Optional[_Filters] = None,
+        candidate_limit: Optional[int] = None,
+        lazy_blobs: bool = False,
+        output: str = "pandas",
+        paginate: bool = False,
+        rerank: Union["Reranker", Sequence["Reranker"], None] = None,
+    ) -> Any:
         """
         Query a Weaviate collection using a simplified hybrid query.
 
-        Note that this method does not support caching via the `cache_ttl` parameter. If you need caching, use the `graphql_query` method.
-
         Parameters
         ----------
         collection_name : str
@@ -137,24 +597,764 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
         alpha: float, optional
             The weight of the semantic search part of the query. (alpha=1 is a semantic search, alpha=0 is a keyword search).
             If not provided, the Weaviate server default value is used.
+        cache_ttl : int, optional
+            The time-to-live in seconds of the cached result.
+            Results are cached in-process and keyed on all of the query arguments.
+            If not provided, the result is not cached. Default: None.
+        include_metadata : bool, optional
+            Whether to return the uuid, score and explain score of each object,
+            in the `_additional.id`, `_additional.score` and `_additional.explain_score` columns.
+            Default: False.
+        include_vector : bool, List[str], optional
+            Whether to return the vectors of each object, or the names of the named vectors to return.
+            Vectors are returned in the `_additional.vector` column, or the `_additional.vectors.<name>` columns.
+            Default: False.
+        vector_format : str, optional
+            How to return the vectors. With "column", the vectors are returned as lists in DataFrame columns.
+            With "matrix", a `(df, vectors)` tuple is returned instead, where `vectors` maps each vector name
+            (`default` for the unnamed vector) to a read-only float32 NumPy matrix of shape `(len(df), dim)`,
+            aligned with the rows of `df`. "matrix" implies `include_vector=True`. Default: "column".
+        prefilter : Filter, optional
+            A broad filter, e.g. the full range of a slider, that the objects must match in addition to `filters`.
+            If provided, the top `candidate_limit` objects matching `prefilter` are fetched once and cached,
+            and `filters` is evaluated on them locally, so narrowing `filters` does not query Weaviate again.
+            Weaviate is only queried again if `filters` cannot be evaluated locally (e.g. text comparisons),
+            or if fewer than `limit` candidates match and more candidates may exist.
+            The candidates are cached for `cache_ttl` seconds, or 600 seconds if `cache_ttl` is not provided.
+            Default: None.
+        candidate_limit : int, optional
+            The number of candidates to fetch with `prefilter` or `rerank`. Default: 10 times `limit`.
+        lazy_blobs : bool, optional
+            Whether to return BLOB properties as lazy `BlobRef` handles instead of base64 strings.
+            The BLOBs are then left out of the response, and loaded in bulk by `load_blobs` when they are displayed.
+            If `return_properties` is not provided, a handle is returned for every BLOB property. Default: False.
+        output : str, optional
+            The type of the result: "pandas" for a pandas DataFrame, "arrow" for a `pyarrow.Table` built directly
+            from the response, or "polars" for a `polars.DataFrame` on top of it. Arrow and polars columns are
+            typed from the collection schema and vectors are fixed-size lists of float32, so large results take
+            less memory and render faster in `st.dataframe`. Requires pyarrow, and polars for "polars".
+            Cannot be combined with `lazy_blobs`. Default: "pandas".
+        paginate : bool, optional
+            Whether to return a `QueryPages` handle holding the first `limit` results in its `df` attribute,
+            instead of the results. `next_page(n)` then fetches only the next `n` results, using the offset of
+            the hybrid query, and appends them to `df`, e.g. for a "Show more" button. Each page is cached
+            like a query for `cache_ttl` seconds, and the first page shares the cache of the same query without
+            `paginate`. Cannot be combined with `prefilter`, and requires `output="pandas"`. Default: False.
+        rerank : Callable, List[Callable], optional
+            Stages that re-rank the results locally, from `st_weaviate_connection.rerank`: `MMR` to diversify
+            them by vector similarity, `Remix` to re-weight the keyword and vector scores at a new alpha, or
+            `Scorer` to rank them by the scores of a function. The top `candidate_limit` objects are fetched
+            once with their scores, explain scores and vectors and cached like `prefilter` candidates, the
+            stages are applied in turn, and the top `limit` rows are returned, with their new scores in
+            `_additional.score` if `include_metadata` is set. Changing the parameters of the stages does not
+            query Weaviate again. Cannot be combined with `prefilter` or `paginate`. Default: None.
         """
-        self._connect()
+        _check_output(output, lazy_blobs)
+        hybrid_kwargs = self._hybrid_kwargs(
+            query,
+            limit,
+            filters,
+            target_vectors,
+            query_properties,
+            return_properties,
+            alpha,
+            include_metadata,
+            include_vector,
+            vector_format,
+        )
+        if rerank is not None:
+            if prefilter is not None or paginate:
+                raise ValueError("rerank cannot be combined with prefilter or paginate")
+            with self._stats.span("query"):
+                result = self._reranked_query(
+                    collection_name,
+                    hybrid_kwargs,
+                    [rerank] if callable(rerank) else list(rerank),
+                    candidate_limit or 10 * limit,
+                    cache_ttl,
+                    vector_format,
+                    lazy_blobs,
+                )
+                result = _to_output(result, output)
+                result_size(result)
+                return result
+        if paginate:
+            if prefilter is not None:
+                raise ValueError("paginate cannot be combined with prefilter")
+            if output != "pandas":
+                raise ValueError("paginate requires output='pandas'")
+            return self._paginate(
+                collection_name, hybrid_kwargs, cache_ttl, vector_format, lazy_blobs
+            )
+        with self._stats.span("query"):
+            result = self._query(
+                collection_name,
+                hybrid_kwargs,
+                cache_ttl,
+                vector_format,
+                prefilter,
+                candidate_limit,
+                lazy_blobs,
+                output,
+            )
+            result_size(result)
+            return result
+
+    def _query(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        cache_ttl: Optional[int],
+        vector_format: str,
+        prefilter: Optional[_Filters],
+        candidate_limit: Optional[int],
+        lazy_blobs: bool,
+        output: str = "pandas",
+    ) -> Any:
+        if prefilter is not None:
+            result = self._prefiltered_query(
+                collection_name,
+                prefilter,
+                candidate_limit or 10 * hybrid_kwargs["limit"],
+                cache_ttl,
+                hybrid_kwargs,
+                vector_format,
+                lazy_blobs,
+            )
+            return _to_output(result, output)
+        key = self._query_cache_key(
+            collection_name,
+            hybrid_kwargs,
+            vector_format,
+            *_lazy_key(lazy_blobs),
+            *_output_key(output),
+        )
+        result = self._cached(
+            key,
+            cache_ttl,
+            lambda: (
+                self._hybrid_query(
+                    collection_name,
+                    hybrid_kwargs,
+                    vector_format,
+                    lazy_blobs,
+                    output=_cache_output(output),
+                ),
+                [collection_name],
+            ),
+            _priority(hybrid_kwargs),
+        )
+        return _to_output(result, output)
+
+    def _paginate(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        cache_ttl: Optional[int],
+        vector_format: str,
+        lazy_blobs: bool,
+    ) -> QueryPages:
+        def _fetch(offset: int, limit: int) -> Any:
+            # The first page has no offset, so that it shares the cached results of `query`
+            kwargs = dict(hybrid_kwargs, limit=limit)
+            if offset:
+                kwargs["offset"] = offset
+            with self._stats.span("query"):
+                annotate("page_offset", offset)
+                result = self._query(
+                    collection_name,
+                    kwargs,
+                    cache_ttl,
+                    vector_format,
+                    None,
+                    None,
+                    lazy_blobs,
+                )
+                result_size(result)
+                return result
+
+        pages = QueryPages(collection_name, hybrid_kwargs["limit"], _fetch)
+        pages.next_page()
+        return pages
+
+    def prepare(
+        self,
+        collection_name: str,
+        limit: int = 10,
+        filters: Optional[_Filters] = None,
+        filter_params: Optional[Dict[str, FilterParam]] = None,
+        target_vectors: Optional[TargetVectorJoinType] = None,
+        query_properties: Optional[List[str]] = None,
+        return_properties: Optional[List[str]] = None,
+        alpha: float = 0.7,
+        cache_ttl: Optional[int] = None,
+        include_metadata: bool = False,
+        include_vector: Union[bool, List[str]] = False,
+        vector_format: str = "column",
+        lazy_blobs: bool = False,
+        output: str = "pandas",
+    ) -> PreparedQuery:
+        """
+        Prepare a hybrid query for repeated calls, e.g. in a search box that reruns on every keystroke.
+
+        The collection and its schema are resolved once, and the property names, query property types
+        and target vectors are checked against the schema, so mistakes raise here instead of after a
+        round trip. The returned `PreparedQuery` is called with the query text, and optionally `limit`,
+        `alpha` and the values of `filter_params`, and returns the same result as `query`.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to query.
+        filters : Filter, optional
+            The filters applied to every call.
+        filter_params : Dict[str, Callable], optional
+            Named filter parameters, each mapped to a function building a filter from the value of the
+            parameter, typically a method of `WeaviateFilter.by_property(...)`, e.g.
+            `{"min_year": WeaviateFilter.by_property("release_year").greater_or_equal}`.
+            The filters of the parameters given to a call are combined with `filters`.
+
+        The other parameters are those of `query`, and are the defaults of the calls.
+
+        Raises
+        ------
+        ValueError
+            If a property or target vector does not exist in the collection, or a query property is not
+            a text property.
+        """
+        _check_output(output, lazy_blobs)
+        hybrid_kwargs = self._hybrid_kwargs(
+            "",
+            limit,
+            filters,
+            target_vectors,
+            query_properties,
+            return_properties,
+            alpha,
+            include_metadata,
+            include_vector,
+            vector_format,
+        )
+        filter_params = dict(filter_params or {})
+        with self._connection_manager.connected() as client:
+            config = client.collections.get(name=collection_name).config.get(
+                simple=True
+            )
+        schema = collection_schema(config)
+        vector_config = getattr(config, "vector_config", None)
+        validate_query(
+            collection_name,
+            schema,
+            None if vector_config is None else list(vector_config),
+            hybrid_kwargs,
+            filter_params,
+        )
+        self._schemas[collection_name] = schema
+        collections: Dict[WeaviateClient, Any] = {}
+
+        def _collection(client: WeaviateClient) -> Any:
+            collection = collections.get(client)
+            if collection is None:
+                collection = collections[client] = client.collections.get(
+                    name=collection_name
+                )
+            return collection
+
+        # The keys match the keys of the same `query` calls, so both share cached results
+        key_template = CacheKeyTemplate(
+            ("query", collection_name),
+            hybrid_kwargs,
+            (vector_format, *_lazy_key(lazy_blobs), *_output_key(output)),
+        )
+
+        def _run(kwargs: Dict[str, Any], key: str) -> Any:
+            with self._stats.span("query"):
+                annotate("prepared", True)
+                result = self._cached(
+                    key,
+                    cache_ttl,
+                    lambda: (
+                        self._hybrid_query(
+                            collection_name,
+                            kwargs,
+                            vector_format,
+                            lazy_blobs,
+                            _collection,
+                            _cache_output(output),
+                        ),
+                        [collection_name],
+                    ),
+                    _priority(kwargs),
+                )
+                result = _to_output(result, output)
+                result_size(result)
+                return result
+
+        return PreparedQuery(
+            collection_name, hybrid_kwargs, filter_params, key_template, _run
+        )
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Return the hit and miss counts, the maximum size and the current size of the result cache.
+
+        The result cache holds the results of `query` and `graphql_query` and is shared by all connections
+        with the same name and URL in this process.
+        """
+
+        return self._result_cache.info()
+
+    def disk_cache_info(self) -> Optional[CacheInfo]:
+        """
+        Return the hit and miss counts of this process, the maximum size and the current size in bytes
+        of the disk cache, or None without a disk cache.
+        """
+
+        return None if self._disk_cache is None else self._disk_cache.info()
+
+    def clear_cache(self, collection_name: Optional[str] = None) -> None:
+        """
+        Remove cached `query` and `graphql_query` results, including those in the disk cache.
+
+        Parameters
+        ----------
+        collection_name : str, optional
+            Only remove the results of queries on this collection.
+            If not provided, all cached results are removed.
+        """
+
+        if collection_name is None:
+            self._result_cache.clear()
+            self._schemas.clear()
+        else:
+            self._result_cache.invalidate(collection_name)
+            self._schemas.pop(collection_name, None)
+        self._blobs.clear(collection_name)
+
+    def _query_cache_key(self, *args: Any) -> str:
+        return make_cache_key("query", *args)
+
+    def _cached(
+        self,
+        key: str,
+        cache_ttl: Optional[int],
+        compute: Callable[[], Tuple[Any, List[str]]],
+        priority: Priority = Priority.QUERY,
+    ) -> Any:
+        df = self._cache_lookup(key, cache_ttl)
+        if df is not MISSING:
+            annotate("cache", "hit")
+            return df
+
+        def _compute() -> Any:
+            with self._admitted(priority):
+                df, tags = compute()
+            if cache_ttl:
+                self._result_cache.set(key, df, ttl=cache_ttl, tags=tags)
+            return df
+
+        # Concurrent callers with the same key, e.g. sessions loading the same page, share one request
+        df, shared = self._in_flight.do(key, _compute)
+        annotate("cache", "shared" if shared else "miss")
+        if shared or cache_ttl:
+            return _copy_result(df)
+        return df
 
-        collection = self._client.collections.get(name=collection_name)
+    @contextlib.contextmanager
+    def _admitted(self, priority: Priority) -> Iterator[None]:
+        if not self._admission.enabled:
+            yield
+            return
+        with phase("admission"):
+            self._admission.acquire(priority, current_session_id())
+        try:
+            yield
+        finally:
+            self._admission.release()
 
-        response = collection.query.hybrid(
-            query=query,
-            limit=limit,
-            filters=filters,
-            target_vector=target_vectors,
-            query_properties=query_properties,
+    @contextlib.asynccontextmanager
+    async def _aadmitted(self, priority: Priority) -> AsyncIterator[None]:
+        if not self._admission.enabled:
+            yield
+            return
+        with phase("admission"):
+            await self._admission.acquire_async(priority, current_session_id())
+        try:
+            yield
+        finally:
+            self._admission.release()
+
+    def admission_info(self) -> AdmissionInfo:
+        """
+        Return the number of requests in flight and waiting for admission, and the admission and rejection counts.
+
+        Requests are rejected when their session is over `session_rate` (`rate_limited`), when the queue
+        already holds `max_queue` requests (`queue_full`), or after waiting `queue_timeout` seconds (`timed_out`).
+        """
+
+        return self._admission.info()
+
+    def _cache_lookup(self, key: str, cache_ttl: Optional[int]) -> Any:
+        if not cache_ttl:
+            return MISSING
+        df = self._result_cache.get(key)
+        if df is MISSING:
+            return df
+        return _copy_result(df)
+
+    def _cache_store(
+        self,
+        key: str,
+        df: Optional[pd.DataFrame],
+        cache_ttl: Optional[int],
+        tags: List[str],
+    ) -> Optional[pd.DataFrame]:
+        if not cache_ttl:
+            return df
+        self._result_cache.set(key, df, ttl=cache_ttl, tags=tags)
+        return _copy_result(df)
+
+    def _hybrid_kwargs(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[_Filters],
+        target_vectors: Optional[TargetVectorJoinType],
+        query_properties: Optional[List[str]],
+        return_properties: Optional[List[str]],
+        alpha: float,
+        include_metadata: bool,
+        include_vector: Union[bool, List[str]],
+        vector_format: str,
+    ) -> Dict[str, Any]:
+        _check_vector_format(vector_format)
+        if vector_format == "matrix" and not include_vector:
+            include_vector = True
+        return {
+            "query": query,
+            "limit": limit,
+            "filters": filters,
+            "target_vector": target_vectors,
+            "query_properties": query_properties,
+            "return_properties": return_properties,
+            "alpha": alpha,
+            "include_vector": include_vector,
+            "return_metadata": HYBRID_METADATA if include_metadata else None,
+        }
+
+    def _hybrid_query(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        vector_format: str = "column",
+        lazy_blobs: bool = False,
+        get_collection: Optional[Callable[[WeaviateClient], Any]] = None,
+        output: str = "pandas",
+    ) -> Any:
+        objects, schema = self._hybrid_objects(
+            collection_name, hybrid_kwargs, lazy_blobs, get_collection
+        )
+        result = self._objects_to_df(
+            objects, schema, hybrid_kwargs, vector_format, output
+        )
+        if lazy_blobs:
+            result = self._attach_blobs(
+                result, collection_name, objects, schema, hybrid_kwargs
+            )
+        return result
+
+    def _prefiltered_query(
+        self,
+        collection_name: str,
+        prefilter: _Filters,
+        candidate_limit: int,
+        cache_ttl: Optional[int],
+        hybrid_kwargs: Dict[str, Any],
+        vector_format: str,
+        lazy_blobs: bool = False,
+    ) -> Union[pd.DataFrame, VectorResult]:
+        filters = hybrid_kwargs["filters"]
+        limit = hybrid_kwargs["limit"]
+        return_properties = hybrid_kwargs["return_properties"]
+        # The candidates hold the filtered properties, which are dropped from the result afterwards
+        if return_properties is not None:
+            return_properties = list(
+                dict.fromkeys(
+                    [*return_properties, *sorted(filter_properties(filters))]
+                )
+            )
+        candidate_kwargs = dict(
+            hybrid_kwargs,
+            filters=prefilter,
+            limit=candidate_limit,
             return_properties=return_properties,
-            alpha=alpha,
         )
+        candidates = self._cached(
+            self._query_cache_key(
+                collection_name, candidate_kwargs, vector_format, *_lazy_key(lazy_blobs)
+            ),
+            cache_ttl or PREFILTER_CACHE_TTL,
+            lambda: (
+                self._hybrid_query(
+                    collection_name, candidate_kwargs, vector_format, lazy_blobs
+                ),
+                [collection_name],
+            ),
+            _priority(hybrid_kwargs),
+        )
+        df = candidates.df if isinstance(candidates, VectorResult) else candidates
+        if df is None:
+            # No object matches the prefilter, so none matches both filters either
+            return candidates
+
+        try:
+            with phase("local_filter"):
+                mask = filter_mask(df, filters, self._schemas.get(collection_name, {}))
+        except UnsupportedFilterError:
+            mask = None
+        if mask is None or (mask.sum() < limit and len(df) >= candidate_limit):
+            effective_kwargs = dict(
+                hybrid_kwargs,
+                filters=prefilter if filters is None else prefilter & filters,
+            )
+            key = self._query_cache_key(
+                collection_name, effective_kwargs, vector_format, *_lazy_key(lazy_blobs)
+            )
+            return self._cached(
+                key,
+                cache_ttl,
+                lambda: (
+                    self._hybrid_query(
+                        collection_name, effective_kwargs, vector_format, lazy_blobs
+                    ),
+                    [collection_name],
+                ),
+                _priority(hybrid_kwargs),
+            )
+
+        rows = np.flatnonzero(mask)[:limit]
+        if len(rows) == 0:
+            df = None
+        else:
+            columns = list(df.columns)
+            if hybrid_kwargs["return_properties"] is not None:
+                extra = set(return_properties) - set(hybrid_kwargs["return_properties"])
+                columns = [c for c in columns if c not in extra]
+            df = df.iloc[rows][columns].reset_index(drop=True)
+        if isinstance(candidates, VectorResult):
+            vectors = {}
+            for name, matrix in candidates.vectors.items():
+                vectors[name] = matrix[rows]
+                vectors[name].setflags(write=False)
+            return VectorResult(df, vectors)
+        return df
+
+    def _reranked_query(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        rerankers: List["Reranker"],
+        candidate_limit: int,
+        cache_ttl: Optional[int],
+        vector_format: str,
+        lazy_blobs: bool,
+    ) -> Union[pd.DataFrame, VectorResult, None]:
+        from .rerank import needs_vectors
+        from .rerank import rerank as rerank_candidates
+
+        include_vector = hybrid_kwargs["include_vector"]
+        # The scores and vectors are fetched in all cases, so that the candidates are shared by all stages
+        candidate_kwargs = dict(
+            hybrid_kwargs,
+            limit=candidate_limit,
+            include_vector=True if needs_vectors(rerankers) else include_vector,
+            return_metadata=HYBRID_METADATA,
+        )
+        candidates = self._cached(
+            self._query_cache_key(
+                collection_name, candidate_kwargs, "matrix", *_lazy_key(lazy_blobs)
+            ),
+            cache_ttl or PREFILTER_CACHE_TTL,
+            lambda: (
+                self._hybrid_query(
+                    collection_name, candidate_kwargs, "matrix", lazy_blobs
+                ),
+                [collection_name],
+            ),
+            _priority(hybrid_kwargs),
+        )
+        with phase("rerank"):
+            df, vectors = rerank_candidates(
+                candidates.df,
+                candidates.vectors,
+                hybrid_kwargs["alpha"],
+                rerankers,
+                hybrid_kwargs["limit"],
+            )
+        if isinstance(include_vector, list):
+            vectors = {name: vectors[name] for name in include_vector if name in vectors}
+        elif not include_vector:
+            vectors = {}
+        if df is not None:
+            if hybrid_kwargs["return_metadata"] is None:
+                df = df.drop(columns=[c for c in df.columns if c.startswith(ADDITIONAL_PREFIX)])
+            if vector_format == "column":
+                for name, matrix in vectors.items():
+                    df[vector_column_name(name)] = list(matrix.tolist())
+        if vector_format == "matrix":
+            return VectorResult(df, vectors)
+        return df
+
+    def _hybrid_objects(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        lazy_blobs: bool = False,
+        get_collection: Optional[Callable[[WeaviateClient], Any]] = None,
+    ) -> Tuple[List[Any], Schema]:
+        def _search(client: WeaviateClient) -> Tuple[List[Any], Schema]:
+            with phase("collections_get"):
+                if get_collection is None:
+                    collection = client.collections.get(name=collection_name)
+                else:
+                    collection = get_collection(client)
+            with phase("schema"):
+                schema = self._collection_schema(collection_name, collection)
+            kwargs = hybrid_kwargs
+            if lazy_blobs and kwargs["return_properties"] is not None:
+                kwargs = dict(
+                    kwargs,
+                    return_properties=[
+                        name
+                        for name in kwargs["return_properties"]
+                        if schema.get(name) != DataType.BLOB
+                    ],
+                )
+
+            with phase("hybrid"):
+                response = collection.query.hybrid(**kwargs)
+            return response.objects, schema
+
+        return self._router.call(_search)
+
+    def _objects_to_df(
+        self,
+        objects: List[Any],
+        schema: Schema,
+        hybrid_kwargs: Dict[str, Any],
+        vector_format: str = "column",
+        output: str = "pandas",
+    ) -> Any:
+        with phase("to_dataframe"):
+            df = weaviate_response_objects_to_df(
+                objects,
+                return_properties=hybrid_kwargs["return_properties"],
+                schema=schema,
+                include_metadata=hybrid_kwargs["return_metadata"] is not None,
+                include_vector=(
+                    vector_format == "column"
+                    and bool(hybrid_kwargs["include_vector"])
+                ),
+                output=output,
+            )
+            if vector_format == "matrix":
+                return VectorResult(df, objects_to_matrices(objects))
+            return df
+
+    def _attach_blobs(
+        self,
+        result: Union[pd.DataFrame, VectorResult],
+        collection_name: str,
+        objects: List[Any],
+        schema: Schema,
+        hybrid_kwargs: Dict[str, Any],
+    ) -> Union[pd.DataFrame, VectorResult]:
+        names = hybrid_kwargs["return_properties"]
+        if names is None:
+            names = list(schema)
+        blob_properties = [name for name in names if schema.get(name) == DataType.BLOB]
+        if isinstance(result, VectorResult):
+            return result._replace(
+                df=attach_blob_refs(
+                    result.df, self._blobs, collection_name, objects, blob_properties
+                )
+            )
+        return attach_blob_refs(
+            result, self._blobs, collection_name, objects, blob_properties
+        )
+
+    def load_blobs(self, refs: Any) -> List[Optional[bytes]]:
+        """
+        Load the BLOBs of lazy handles, e.g. a BLOB column returned by `query(..., lazy_blobs=True)`.
+
+        The missing BLOBs are fetched with one request per property, and kept in an LRU cache
+        bounded by `blob_cache_bytes`, so displaying the same results again does not fetch them again.
+
+        Parameters
+        ----------
+        refs : Iterable[BlobRef]
+            The handles to load. Items that are not handles, such as None, are returned as they are.
+
+        Returns
+        -------
+        List[Optional[bytes]]
+            The decoded bytes of each BLOB, which can be passed to `st.image`.
+        """
+
+        return self._blobs.load(refs)
+
+    def blob_cache_info(self) -> CacheInfo:
+        """
+        Return the hit and miss counts, the maximum size and the current size in bytes of the BLOB cache.
+        """
+
+        return self._blobs.info()
+
+    def _fetch_blobs(
+        self, collection_name: str, property: str, uuids: List[str]
+    ) -> Dict[str, Optional[str]]:
+        from .export import chunked
 
-        return weaviate_response_objects_to_df(response.objects)
+        values = {}
+        with self._connection_manager.connected() as client:
+            collection = client.collections.get(name=collection_name)
+            for chunk in chunked(uuids, BLOB_FETCH_SIZE):
+                response = collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(chunk),
+                    limit=len(chunk),
+                    return_properties=[property],
+                )
+                for obj in response.objects:
+                    values[str(obj.uuid)] = obj.properties.get(property)
+        return values
 
-    def graphql_query(self, query: str, cache_ttl: int = 3600) -> pd.DataFrame:
+    def _collection_schema(self, collection_name: str, collection: Any) -> Schema:
+        schema = self._schemas.get(collection_name)
+        if schema is None:
+            try:
+                schema = collection_schema(collection.config.get(simple=True))
+            except WeaviateBaseError:
+                schema = {}
+            self._schemas[collection_name] = schema
+        return schema
+
+    async def _acollection_schema(self, collection_name: str, collection: Any) -> Schema:
+        schema = self._schemas.get(collection_name)
+        if schema is None:
+            try:
+                schema = collection_schema(await collection.config.get(simple=True))
+            except WeaviateBaseError:
+                schema = {}
+            self._schemas[collection_name] = schema
+        return schema
+
+    def graphql_query(
+        self,
+        query: str,
+        cache_ttl: int = 3600,
+        vector_format: str = "column",
+        output: str = "pandas",
+    ) -> Any:
         """
         Query Weaviate using a raw GraphQL query.
 
@@ -163,37 +1363,790 @@ class WeaviateConnection(BaseConnection["WeaviateClient"]):
         query : str
             The raw GraphQL query to execute.
         cache_ttl : int, optional
-            The Streamlit time-to-live for the cached data. Default: 3600.
+            The time-to-live in seconds of the cached result.
+            Results are cached in-process and keyed on the query text, ignoring whitespace and comments.
+            If None or 0, the result is not cached. Default: 3600.
+        vector_format : str, optional
+            How to return the vectors requested with `_additional { vector }` or `_additional { vectors { ... } }`.
+            With "column", the vectors are returned as lists in the `_additional.vector(s)` DataFrame columns.
+            With "matrix", a `(df, vectors)` tuple is returned instead, where `vectors` maps each vector name
+            (`default` for the unnamed vector) to a read-only float32 NumPy matrix aligned with the rows of `df`.
+            Default: "column".
+        output : str, optional
+            The type of the result: "pandas" for a pandas DataFrame, "arrow" for a `pyarrow.Table` built directly
+            from the response, or "polars" for a `polars.DataFrame` on top of it. Nested fields are flattened into
+            the same columns as with "pandas", and vectors are fixed-size lists of float32. Default: "pandas".
         """
 
-        @cache_data(ttl=cache_ttl)
-        def _graphql_query(_client: WeaviateClient, query: str):
-            results = _client.graphql_raw_query(query)
-            if results.errors is not None:
-                error_message = f"The GraphQL query returned an error: {results.errors}"
-                raise Exception(error_message)
-            else:
-                return results
+        _check_vector_format(vector_format)
+        check_output(output)
+        key = make_cache_key(
+            "graphql_query",
+            normalize_graphql(query),
+            vector_format,
+            *_output_key(output),
+        )
+
+        def _compute() -> Tuple[Any, List[str]]:
+            with phase("graphql"):
+                results = self._router.call(
+                    lambda client: client.graphql_raw_query(query)
+                )
+            with phase("to_dataframe"):
+                df = self._gql_to_dataframe(
+                    results, vector_format, _cache_output(output)
+                )
+            return df, _gql_tags(results)
+
+        with self._stats.span("graphql_query"):
+            df = _to_output(self._cached(key, cache_ttl, _compute), output)
+            result_size(df)
+            return df
+
+    def aggregate(
+        self,
+        collection_name: str,
+        group_by: Optional[str] = None,
+        metrics: Optional[PropertiesMetrics] = None,
+        filters: Optional[_Filters] = None,
+        near_text: Optional[str] = None,
+        near_vector: Optional[List[float]] = None,
+        object_limit: Optional[int] = None,
+        target_vector: Optional[str] = None,
+        group_limit: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Aggregate a Weaviate collection on the server, e.g. for facet counts and statistics.
+
+        Only the aggregated values are returned, so a facet panel costs one small response
+        instead of fetching every object:
+
+        ```python
+        df = conn.aggregate(
+            "MovieDemo",
+            group_by="release_year",
+            metrics=WeaviateMetrics("vote_average").number(mean=True, maximum=True),
+        )
+        ```
+
+        The result has one row per group, or a single row if `group_by` is not provided.
+        The grouped property is the first column, followed by the `total_count` column with
+        the number of objects, and a `<property>.<metric>` column per returned metric,
+        e.g. `vote_average.mean`.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to aggregate.
+        group_by : str, optional
+            The property to group the objects by. Array properties are grouped by their elements.
+            If not provided, all objects are aggregated together.
+        metrics : Metrics, List[Metrics], optional
+            The metrics of each property to return.
+            Import the `WeaviateMetrics` class from `st_weaviate_connection` to use this argument.
+            If not provided, only the object counts are returned.
+        filters : Filter, optional
+            The filters the aggregated objects must match.
+        near_text : str, optional
+            Only aggregate the objects closest to this text. Requires a vectorizer on the collection.
+        near_vector : List[float], optional
+            Only aggregate the objects closest to this vector.
+        object_limit : int, optional
+            The number of closest objects to aggregate with `near_text` or `near_vector`. Default: 100.
+        target_vector : str, optional
+            The named vector to search with `near_text` or `near_vector`.
+        group_limit : int, optional
+            The maximum number of groups to return, largest first. Default: the Weaviate server default.
+        cache_ttl : int, optional
+            The time-to-live in seconds of the cached result. Results are cached like those of `query`.
+            If not provided, the result is not cached. Default: None.
+        """
+        if near_text is not None and near_vector is not None:
+            raise ValueError("Only one of near_text and near_vector can be provided")
+        kwargs: Dict[str, Any] = {
+            "filters": filters,
+            "group_by": (
+                None
+                if group_by is None
+                else GroupByAggregate(prop=group_by, limit=group_limit)
+            ),
+            "return_metrics": metrics,
+        }
+        if near_text is not None or near_vector is not None:
+            kwargs["object_limit"] = object_limit or AGGREGATE_OBJECT_LIMIT
+            kwargs["target_vector"] = target_vector
+        key = make_cache_key("aggregate", collection_name, near_text, near_vector, kwargs)
+
+        def _aggregate(client: WeaviateClient) -> Tuple[Any, Schema]:
+            collection = client.collections.get(name=collection_name)
+            with phase("schema"):
+                schema = self._collection_schema(collection_name, collection)
+            with phase("aggregate"):
+                if near_text is not None:
+                    response = collection.aggregate.near_text(near_text, **kwargs)
+                elif near_vector is not None:
+                    response = collection.aggregate.near_vector(near_vector, **kwargs)
+                else:
+                    response = collection.aggregate.over_all(**kwargs)
+            return response, schema
 
-        with self.client() as client:
-            results = _graphql_query(client, query)
+        def _compute() -> Tuple[pd.DataFrame, List[str]]:
+            response, schema = self._router.call(_aggregate)
+            with phase("to_dataframe"):
+                df = aggregate_to_dataframe(response, schema)
+            return df, [collection_name]
 
-        return self._gql_to_dataframe(results)
+        with self._stats.span("aggregate"):
+            df = self._cached(key, cache_ttl, _compute)
+            result_size(df)
+            return df
+
+    def generate(
+        self,
+        collection_name: str,
+        query: str,
+        grouped_task: str,
+        grouped_properties: Optional[List[str]] = None,
+        limit: int = 10,
+        filters: Optional[_Filters] = None,
+        target_vectors: Optional[TargetVectorJoinType] = None,
+        query_properties: Optional[List[str]] = None,
+        return_properties: Optional[List[str]] = None,
+        alpha: float = 0.7,
+        cache_ttl: Optional[int] = 3600,
+        include_metadata: bool = False,
+        lazy_blobs: bool = False,
+    ) -> GenerateResult:
+        """
+        Run a hybrid query and generate a text from its results with the generative module of the collection.
+
+        The retrieved objects are returned right away, and the text is only generated when the stream is iterated,
+        so the results can be displayed while the text is being generated.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to query.
+        query : str
+            The query to search for.
+        grouped_task : str
+            The prompt to generate the text from, e.g. "Suggest one of these movies for a date night".
+            The retrieved objects are passed to the generative module along with it, in ranking order.
+        grouped_properties : List[str], optional
+            The properties of the retrieved objects passed to the generative module.
+            If not provided, all properties are passed.
+        limit, filters, target_vectors, query_properties, return_properties, alpha, include_metadata, lazy_blobs
+            The arguments of the hybrid query, see `query`.
+        cache_ttl : int, optional
+            The time-to-live in seconds of the generated text.
+            Texts are cached in-process and keyed on the query, the filters, the task and the ids of the retrieved objects,
+            so repeating a prompt over the same results does not generate the text again.
+            If None or 0, the text is not cached. Default: 3600.
+
+        Returns
+        -------
+        GenerateResult
+            A `(df, stream)` tuple. `df` holds the retrieved objects, or is None if there are none.
+            `stream` is a generator of text chunks, which can be passed to `st.write_stream`.
+        """
+
+        hybrid_kwargs = self._hybrid_kwargs(
+            query,
+            limit,
+            filters,
+            target_vectors,
+            query_properties,
+            return_properties,
+            alpha,
+            include_metadata,
+            False,
+            "column",
+        )
+        with self._admitted(_priority(hybrid_kwargs)):
+            objects, schema = self._hybrid_objects(
+                collection_name, hybrid_kwargs, lazy_blobs
+            )
+        df = self._objects_to_df(objects, schema, hybrid_kwargs)
+        if lazy_blobs:
+            df = self._attach_blobs(df, collection_name, objects, schema, hybrid_kwargs)
+        ids = [str(obj.uuid) for obj in objects]
+        key = make_cache_key(
+            "generate",
+            collection_name,
+            query,
+            filters,
+            grouped_task,
+            grouped_properties,
+            ids,
+        )
+
+        def _stream() -> Iterator[str]:
+            if not ids:
+                return
+            text = self._cached(
+                key,
+                cache_ttl,
+                lambda: (
+                    self._generate_text(
+                        collection_name, hybrid_kwargs, grouped_task, grouped_properties
+                    ),
+                    [collection_name],
+                ),
+                Priority.GENERATE,
+            )
+            if text:
+                yield text
+
+        return GenerateResult(df, _stream())
+
+    def _generate_text(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        grouped_task: str,
+        grouped_properties: Optional[List[str]],
+    ) -> Optional[str]:
+        # The same hybrid query is run, so that the objects are passed to the generative module in ranking order.
+        # The gRPC API of the client only returns the complete text, which is yielded as a single chunk.
+        with self._connection_manager.connected() as client:
+            collection = client.collections.get(name=collection_name)
+            response = collection.generate.hybrid(
+                grouped_task=grouped_task,
+                grouped_properties=grouped_properties,
+                **dict(
+                    hybrid_kwargs,
+                    return_properties=grouped_properties,
+                    include_vector=False,
+                    return_metadata=None,
+                ),
+            )
+        return response.generated
+
+    def iter_dataframes(
+        self,
+        collection_name: str,
+        chunk_size: int = 1000,
+        prefetch_depth: int = 2,
+        return_properties: Optional[List[str]] = None,
+        include_metadata: bool = False,
+        include_vector: Union[bool, List[str]] = False,
+        parquet_path: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read all objects of a collection as a sequence of DataFrames of at most `chunk_size` rows.
+
+        The objects are paged through with the collection iterator, which uses the `after` cursor.
+        The next chunks are fetched on a background thread while the current one is processed,
+        so at most `prefetch_depth + 1` chunks are held in memory, however large the collection.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to read.
+        chunk_size : int, optional
+            The number of objects fetched per request and the number of rows of each DataFrame.
+            Default: 1000.
+        prefetch_depth : int, optional
+            The maximum number of chunks fetched ahead of the consumer. Default: 2.
+        return_properties : List[str], optional
+            The properties to return.
+            If not provided, all properties are returned, except for BLOBs.
+        include_metadata : bool, optional
+            Whether to return the uuid of each object in the `_additional.id` column. Default: False.
+        include_vector : bool, List[str], optional
+            Whether to return the vectors of each object, or the names of the named vectors to return.
+            Default: False.
+        parquet_path : str, optional
+            If provided, each chunk is also appended to a Parquet file at this path, one row group per chunk.
+            The file is complete once the generator is exhausted. Requires pyarrow.
+            Default: None.
+        """
+
+        from .export import ParquetChunkWriter, prefetch
+
+        writer = None
+        if parquet_path is not None:
+            writer = ParquetChunkWriter(parquet_path)
+        # The chunks are produced on another thread, which fetches the collection schema first
+        chunks = prefetch(
+            self._collection_chunks(
+                collection_name,
+                chunk_size,
+                return_properties,
+                include_metadata,
+                include_vector,
+            ),
+            prefetch_depth,
+        )
+        try:
+            for df in chunks:
+                if writer is not None:
+                    if not writer.rows:
+                        writer.schema = self._schemas.get(collection_name, {})
+                    writer.write(df)
+                yield df
+        finally:
+            chunks.close()
+            if writer is not None:
+                writer.close()
+
+    def export_parquet(self, collection_name: str, path: str, **kwargs: Any) -> int:
+        """
+        Write all objects of a collection to a Parquet file and return the number of rows written.
+
+        Takes the arguments of `iter_dataframes`. Memory use is bounded by the chunk size, not the collection size.
+        """
+
+        rows = 0
+        for df in self.iter_dataframes(collection_name, parquet_path=path, **kwargs):
+            rows += len(df)
+        return rows
+
+    def _collection_chunks(
+        self,
+        collection_name: str,
+        chunk_size: int,
+        return_properties: Optional[List[str]],
+        include_metadata: bool,
+        include_vector: Union[bool, List[str]],
+    ) -> Iterator[pd.DataFrame]:
+        from .export import chunked
+
+        with self._connection_manager.connected() as client:
+            collection = client.collections.get(name=collection_name)
+            schema = self._collection_schema(collection_name, collection)
+            objects = collection.iterator(
+                include_vector=include_vector,
+                return_properties=return_properties,
+                cache_size=chunk_size,
+            )
+            for chunk in chunked(objects, chunk_size):
+                yield weaviate_response_objects_to_df(
+                    chunk,
+                    return_properties=return_properties,
+                    schema=schema,
+                    include_metadata=include_metadata,
+                    include_vector=bool(include_vector),
+                )
+
+    def insert_dataframe(
+        self,
+        collection_name: str,
+        df: pd.DataFrame,
+        vector_column: Optional[str] = None,
+        uuid_column: Optional[str] = None,
+        batching: str = "dynamic",
+        batch_size: int = 100,
+        concurrent_requests: int = 2,
+        requests_per_minute: Optional[int] = None,
+        chunk_size: int = 1000,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> InsertResult:
+        """
+        Insert the rows of a DataFrame into a collection, one object per row.
+
+        The rows are converted to objects a chunk at a time and sent with the batching of the Weaviate client,
+        so the whole frame is never held as dictionaries. Objects with an existing uuid are replaced.
+        Cached query results of the collection are invalidated.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to insert into.
+        df : pd.DataFrame
+            The rows to insert. Each column other than `vector_column` and `uuid_column` is a property.
+            Missing values are left out of the objects.
+        vector_column : str, optional
+            The column holding the vector of each object. If not provided, the objects are vectorized by the collection's vectorizer.
+        uuid_column : str, optional
+            The column holding the uuid of each object. If not provided, uuids are generated.
+        batching : str, optional
+            How to size the batches. With "dynamic", the batch size adapts to the load of the server.
+            With "rate_limit", the batches are throttled to `requests_per_minute`, e.g. for a rate limited vectorizer.
+            With "fixed_size", `concurrent_requests` batches of `batch_size` objects are sent at a time.
+            Default: "dynamic".
+        batch_size : int, optional
+            The number of objects per batch with "fixed_size" batching. Default: 100.
+        concurrent_requests : int, optional
+            The number of batches sent at the same time with "fixed_size" batching. Default: 2.
+        requests_per_minute : int, optional
+            The maximum number of vectorizer requests per minute. Required with "rate_limit" batching.
+        chunk_size : int, optional
+            The number of rows converted to objects at a time. Default: 1000.
+        on_progress : Callable[[int, int], None], optional
+            Called after each chunk with the number of rows added so far and the total number of rows,
+            e.g. to update a `st.progress` bar.
+
+        Returns
+        -------
+        InsertResult
+            An `(inserted, failed, seconds, objects_per_second)` tuple. `failed` holds the rows of `df`
+            that could not be inserted, with the error message in an `error` column.
+        """
+
+        if batching not in BATCHING_MODES:
+            raise ValueError(
+                f"batching must be one of {BATCHING_MODES}, got {batching!r}"
+            )
+        if batching == "rate_limit" and requests_per_minute is None:
+            raise ValueError("requests_per_minute is required with rate_limit batching")
+
+        start = time.perf_counter()
+        try:
+            with self._connection_manager.connected() as client:
+                collection = client.collections.get(name=collection_name)
+                if batching == "dynamic":
+                    batch_context = collection.batch.dynamic()
+                elif batching == "rate_limit":
+                    batch_context = collection.batch.rate_limit(requests_per_minute)
+                else:
+                    batch_context = collection.batch.fixed_size(
+                        batch_size=batch_size, concurrent_requests=concurrent_requests
+                    )
+                with batch_context as batch:
+                    added = 0
+                    for properties, uuid, vector in dataframe_objects(
+                        df, vector_column, uuid_column, chunk_size
+                    ):
+                        batch.add_object(properties=properties, uuid=uuid, vector=vector)
+                        added += 1
+                        if on_progress is not None and (
+                            added % chunk_size == 0 or added == len(df)
+                        ):
+                            on_progress(added, len(df))
+                failed_objects = collection.batch.failed_objects
+        finally:
+            self.clear_cache(collection_name)
+        seconds = time.perf_counter() - start
+
+        failed = df.iloc[[error.object_.index for error in failed_objects]].copy()
+        failed["error"] = [error.message for error in failed_objects]
+        inserted = len(df) - len(failed)
+        return InsertResult(
+            inserted, failed, seconds, inserted / seconds if seconds > 0 else 0.0
+        )
+
+    async def aclient(self) -> WeaviateAsyncClient:
+        """
+        Connect to Weaviate and return an async client object for use in queries.
+
+        Each running event loop gets its own async client, which stays connected between calls.
+        Call `aclose` before the event loop is closed if you run the loop yourself, e.g. with `asyncio.run`.
+        """
+
+        return await self._async_clients.get()
+
+    async def aquery(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 10,
+        filters: Optional[_Filters] = None,
+        target_vectors: Optional[TargetVectorJoinType] = None,
+        query_properties: Optional[List[str]] = None,
+        return_properties: Optional[List[str]] = None,
+        alpha: float = 0.7,
+        cache_ttl: Optional[int] = None,
+        include_metadata: bool = False,
+        include_vector: Union[bool, List[str]] = False,
+        vector_format: str = "column",
+        output: str = "pandas",
+    ) -> Any:
+        """
+        Query a Weaviate collection using a simplified hybrid query, asynchronously.
+
+        Takes the arguments of `query`, except `prefilter`, `candidate_limit`, `lazy_blobs`, `paginate`
+        and `rerank`, and shares its result cache, admission limits and statistics. Waiting for admission
+        does not block the event loop. Unlike `query`, concurrent identical calls are not coalesced, and
+        the requests go to the primary endpoint.
+        """
+        _check_output(output)
+        hybrid_kwargs = self._hybrid_kwargs(
+            query,
+            limit,
+            filters,
+            target_vectors,
+            query_properties,
+            return_properties,
+            alpha,
+            include_metadata,
+            include_vector,
+            vector_format,
+        )
+        key = self._query_cache_key(
+            collection_name, hybrid_kwargs, vector_format, *_output_key(output)
+        )
+        with self._stats.span("query"):
+            annotate("async", True)
+            df = self._cache_lookup(key, cache_ttl)
+            if df is not MISSING:
+                annotate("cache", "hit")
+                result = _to_output(df, output)
+                result_size(result)
+                return result
+            annotate("cache", "miss")
+
+            async with self._aadmitted(_priority(hybrid_kwargs)):
+                client = await self.aclient()
+                collection = client.collections.get(name=collection_name)
+                with phase("schema"):
+                    schema = await self._acollection_schema(collection_name, collection)
+                with phase("hybrid"):
+                    response = await collection.query.hybrid(**hybrid_kwargs)
+
+            df = self._cache_store(
+                key,
+                self._objects_to_df(
+                    response.objects,
+                    schema,
+                    hybrid_kwargs,
+                    vector_format,
+                    _cache_output(output),
+                ),
+                cache_ttl,
+                [collection_name],
+            )
+            result = _to_output(df, output)
+            result_size(result)
+            return result
+
+    async def agraphql_query(
+        self,
+        query: str,
+        cache_ttl: int = 3600,
+        vector_format: str = "column",
+        output: str = "pandas",
+    ) -> Any:
+        """
+        Query Weaviate using a raw GraphQL query, asynchronously.
+
+        Takes the same arguments as `graphql_query` and shares its result cache, admission limits and
+        statistics. Waiting for admission does not block the event loop. Unlike `graphql_query`, concurrent
+        identical calls are not coalesced, and the requests go to the primary endpoint.
+        """
+
+        _check_vector_format(vector_format)
+        check_output(output)
+        key = make_cache_key(
+            "graphql_query",
+            normalize_graphql(query),
+            vector_format,
+            *_output_key(output),
+        )
+        with self._stats.span("graphql_query"):
+            annotate("async", True)
+            df = self._cache_lookup(key, cache_ttl)
+            if df is not MISSING:
+                annotate("cache", "hit")
+                result = _to_output(df, output)
+                result_size(result)
+                return result
+            annotate("cache", "miss")
+
+            async with self._aadmitted(Priority.QUERY):
+                client = await self.aclient()
+                with phase("graphql"):
+                    results = await client.graphql_raw_query(query)
+
+            with phase("to_dataframe"):
+                df = self._gql_to_dataframe(results, vector_format, _cache_output(output))
+            df = self._cache_store(key, df, cache_ttl, _gql_tags(results))
+            result = _to_output(df, output)
+            result_size(result)
+            return result
+
+    def query_concurrently(
+        self, specs: List[Dict[str, Any]], max_workers: int = 8
+    ) -> List[pd.DataFrame]:
+        """
+        Run several hybrid queries concurrently and return their results in order.
+
+        The queries run on a bounded thread pool and go through `query`, so up to `max_workers` queries,
+        the total latency is that of the slowest query, and the queries share the result cache, count against
+        the admission limits of the calling session and are recorded in the statistics. The first error is raised.
+
+        Parameters
+        ----------
+        specs : List[Dict[str, Any]]
+            The queries to run, each given as a dictionary of `query` arguments,
+            e.g. `{"collection_name": "Movie", "query": "space", "limit": 5}`.
+        max_workers : int, optional
+            The maximum number of queries to run at the same time. Default: 8.
+        """
+
+        if not specs:
+            return []
+        # The queries of the worker threads count against the session of the caller
+        session_id = current_session_id()
+
+        def _run(spec: Dict[str, Any]) -> pd.DataFrame:
+            with session_scope(session_id):
+                return self.query(**spec)
+
+        self._connect()
+        workers = max(1, min(max_workers, len(specs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run, spec) for spec in specs]
+            return [future.result() for future in futures]
+
+    def query_many(
+        self, specs: List[Dict[str, Any]], max_workers: int = 8
+    ) -> List[QueryResult]:
+        """
+        Run several hybrid queries on a bounded thread pool and return their results in order.
+
+        The threads share the connection's client and its gRPC channel.
+        Identical specs are only run once.
+
+        Parameters
+        ----------
+        specs : List[Dict[str, Any]]
+            The queries to run, each given as a dictionary of `query` arguments,
+            e.g. `{"collection_name": "Movie", "query": "space", "alpha": 0.5}`.
+        max_workers : int, optional
+            The maximum number of queries to run at the same time. Default: 8.
+
+        Returns
+        -------
+        List[QueryResult]
+            One `(df, error, seconds)` tuple per spec. `df` is the query result, or None if the query raised `error`.
+            `seconds` is the time the query took.
+        """
+
+        signature = inspect.signature(self.query)
+        keys = []
+        unique_specs = {}
+        invalid = {}
+        for spec in specs:
+            try:
+                arguments = signature.bind(**spec)
+            except TypeError as e:
+                # A malformed spec fails on its own, without failing the batch
+                key = ("invalid", len(keys))
+                invalid[key] = QueryResult(None, e, 0.0)
+                keys.append(key)
+                continue
+            arguments.apply_defaults()
+            key = make_cache_key("query_many", arguments.arguments)
+            if arguments.arguments["paginate"]:
+                # Each paginated spec gets its own handle, as handles are extended in place
+                key = (key, len(keys))
+            keys.append(key)
+            unique_specs.setdefault(key, spec)
+
+        # The queries of the worker threads count against the session of the caller
+        session_id = current_session_id()
+
+        def _run(spec: Dict[str, Any]) -> QueryResult:
+            start = time.perf_counter()
+            try:
+                with session_scope(session_id):
+                    df, error = self.query(**spec), None
+            except Exception as e:
+                df, error = None, e
+            return QueryResult(df, error, time.perf_counter() - start)
+
+        results = dict(invalid)
+        if unique_specs:
+            self._connect()
+            workers = max(1, min(max_workers, len(unique_specs)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    key: executor.submit(_run, spec)
+                    for key, spec in unique_specs.items()
+                }
+                results.update(
+                    (key, future.result()) for key, future in futures.items()
+                )
+
+        returned = set()
+        ordered = []
+        for key in keys:
+            result = results[key]
+            if key in returned and result.df is not None:
+                result = result._replace(df=_copy_result(result.df))
+            returned.add(key)
+            ordered.append(result)
+        return ordered
+
+    async def aclose(self) -> None:
+        """
+        Close the async client of the running event loop.
+        """
+
+        await self._async_clients.close()
 
     def client(self) -> WeaviateClient:
         """
         Connect to Weaviate and return the client object for use in queries.
+
+        The client is shared by all users of the connection and stays connected between calls.
         """
 
-        self._connect()
+        with self._stats.span("client"):
+            return self._connect()
+
+    def stats(self) -> ConnectionStats:
+        """
+        Return the statistics of the connection.
+
+        Returns
+        -------
+        ConnectionStats
+            A `(histograms, cache, blob_cache, connection, admission)` tuple. `histograms` maps metric names to
+            `(count, total, min, max, p50, p90, p99)` summaries: the latency of each method (`query.seconds`),
+            of each of its phases (e.g. `query.connect.seconds`, `query.hybrid.seconds`, `query.to_dataframe.seconds`),
+            and the number of rows and the in-memory size of the results (`query.rows`, `query.bytes`).
+            `cache`, `blob_cache`, `connection` and `admission` are the results of `cache_info`, `blob_cache_info`,
+            `connection_info` and `admission_info`.
+        """
+
+        return ConnectionStats(
+            self._stats.snapshot(),
+            self.cache_info(),
+            self.blob_cache_info(),
+            self.connection_info(),
+            self.admission_info(),
+        )
+
+    def add_stats_hook(self, hook: StatsHook) -> None:
+        """
+        Call `hook` with a `Span` at the end of every instrumented call, e.g. to forward it to a tracing system.
+
+        Use `opentelemetry_hook()` or `prometheus_hook()` from `st_weaviate_connection.stats`
+        to export the spans to OpenTelemetry or Prometheus.
+        """
+
+        self._stats.add_hook(hook)
+
+    def stats_panel(self, expanded: bool = False) -> None:
+        """
+        Display the statistics of the connection in a Streamlit expander, e.g. in the sidebar of a debug page.
+        """
 
-        return self._client
+        stats = self.stats()
+        with st.expander("Weaviate connection stats", expanded=expanded):
+            cache = stats.cache
+            lookups = cache.hits + cache.misses
+            cols = st.columns(3)
+            cols[0].metric("Result cache hit rate", f"{cache.hits / lookups:.0%}" if lookups else "-")
+            cols[1].metric("Cached results", f"{cache.currsize} / {cache.maxsize}")
+            cols[2].metric("Connects", stats.connection.connects, f"{stats.connection.failures} failures", delta_color="off")
+            if self._admission.enabled:
+                admission = stats.admission
+                rejected = admission.rate_limited + admission.queue_full + admission.timed_out
+                cols = st.columns(3)
+                cols[0].metric("Requests in flight", admission.in_flight)
+                cols[1].metric("Queue depth", admission.queue_depth)
+                cols[2].metric("Rejected requests", rejected)
+            st.dataframe(self._stats.to_dataframe(), use_container_width=True)
 
     def close(self) -> None:
         """
         Close the connection to Weaviate.
         """
 
-        self._client.close()
+        self._router.close()
 
         return None
@@ -0,0 +1,336 @@
+import dataclasses
+import datetime
+import sys
+from collections import namedtuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from weaviate.classes.config import DataType
+
+Schema = Mapping[str, DataType]
+
+ADDITIONAL_PREFIX = "_additional."
+
+OUTPUT_FORMATS = ("pandas", "arrow", "polars")
+
+# The name of the object count column of aggregation results
+TOTAL_COUNT_COLUMN = "total_count"
+
+# The result of a query with `vector_format="matrix"`: the results and one vector matrix per vector name
+VectorResult = namedtuple("VectorResult", ["df", "vectors"])
+
+_DATE_METRICS = {"maximum", "median", "minimum", "mode"}
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def check_output(output: str) -> None:
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"output must be one of {OUTPUT_FORMATS}, got {output!r}")
+
+
+def is_arrow_table(value: Any) -> bool:
+    """
+    Return whether a value is a `pyarrow.Table`, without importing pyarrow.
+    """
+    pa = sys.modules.get("pyarrow")
+    return pa is not None and isinstance(value, pa.Table)
+
+
+def collection_schema(config: Any) -> Dict[str, DataType]:
+    """
+    Map the property names of a collection config to their data types.
+
+    Parameters
+    ----------
+    config : CollectionConfig or CollectionConfigSimple
+        The config of a collection, as returned by `collection.config.get()`.
+    """
+    return {prop.name: prop.data_type for prop in config.properties}
+
+
+def objects_to_columns(
+    objects: Sequence[Any],
+    return_properties: Optional[Sequence[str]] = None,
+    schema: Optional[Schema] = None,
+    include_metadata: bool = False,
+    include_vector: bool = False,
+) -> Dict[str, Any]:
+    """
+    Build typed columns from the properties, metadata and vectors of Weaviate objects.
+
+    Object properties are flattened into `<property>.<field>` columns.
+    The uuid and metadata columns are named `_additional.<field>`, the vector
+    columns `_additional.vector` for the default vector and `_additional.vectors.<name>`
+    for named vectors, matching the columns of GraphQL results.
+    """
+    properties = [obj.properties for obj in objects]
+    values_by_name = _transpose(properties)
+    if return_properties is None:
+        names = list(values_by_name)
+    else:
+        names = [
+            name if isinstance(name, str) else name.name for name in return_properties
+        ]
+
+    columns: Dict[str, Any] = {}
+    for name in names:
+        values = values_by_name.get(name)
+        if values is None:
+            values = [None] * len(properties)
+        data_type = schema.get(name) if schema is not None else None
+        if data_type is None:
+            column = _object_array(values)
+            if _has_objects(column):
+                columns.update(_flatten_objects(name, values))
+            else:
+                columns[name] = column
+        elif data_type == DataType.OBJECT:
+            columns.update(_flatten_objects(name, values))
+        else:
+            columns[name] = _typed_column(values, data_type)
+
+    if include_metadata:
+        columns[ADDITIONAL_PREFIX + "id"] = [str(obj.uuid) for obj in objects]
+        columns.update(_metadata_columns(objects))
+    if include_vector:
+        columns.update(_vector_columns(objects))
+    return columns
+
+
+def objects_to_dataframe(objects: Sequence[Any], **kwargs: Any) -> pd.DataFrame:
+    """
+    Convert Weaviate objects to a DataFrame. Takes the arguments of `objects_to_columns`.
+    """
+    df = pd.DataFrame(
+        objects_to_columns(objects, **kwargs), index=pd.RangeIndex(len(objects))
+    )
+    return df.infer_objects(copy=False)
+
+
+def _transpose(properties: List[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Turn a list of property dicts into a dict of value lists, in order of first appearance.
+    """
+    layouts = {tuple(props) for props in properties}
+    if len(layouts) == 1:
+        names = next(iter(layouts))
+        values = zip(*(props.values() for props in properties))
+        return {name: list(column) for name, column in zip(names, values)}
+    names = dict.fromkeys(name for props in properties for name in props)
+    return {name: [props.get(name) for props in properties] for name in names}
+
+
+def _typed_column(values: List[Any], data_type: DataType) -> Any:
+    try:
+        if data_type == DataType.INT:
+            if None in values:
+                return pd.array(values, dtype="Int64")
+            return np.array(values, dtype=np.int64)
+        if data_type == DataType.NUMBER:
+            return np.array(values, dtype=np.float64)
+        if data_type == DataType.BOOL:
+            if None in values:
+                return pd.array(values, dtype="boolean")
+            return np.array(values, dtype=bool)
+        if data_type == DataType.DATE:
+            return _datetime_column(values)
+    except (TypeError, ValueError):
+        pass
+    return _object_array(values)
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _datetime_column(values: List[Any]) -> Any:
+    if all(isinstance(v, datetime.datetime) for v in values):
+        micros = np.array(
+            [(_as_utc(v) - _EPOCH) // _MICROSECOND for v in values], dtype=np.int64
+        )
+        return pd.Series(micros.astype("datetime64[us]")).dt.tz_localize("UTC")
+    return pd.to_datetime(values, utc=True)
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def _has_objects(column: np.ndarray) -> bool:
+    if pd.api.types.infer_dtype(column, skipna=True) != "mixed":
+        return False
+    return any(isinstance(v, dict) for v in column)
+
+
+def _flatten_objects(name: str, values: List[Any]) -> Dict[str, Any]:
+    nested = pd.json_normalize([v if isinstance(v, dict) else {} for v in values])
+    return {f"{name}.{column}": nested[column].to_numpy() for column in nested.columns}
+
+
+def _metadata_columns(objects: Sequence[Any]) -> Dict[str, Any]:
+    metadata = [obj.metadata for obj in objects]
+    if not metadata or not dataclasses.is_dataclass(metadata[0]):
+        return {}
+    columns = {}
+    for field in dataclasses.fields(metadata[0]):
+        values = [getattr(m, field.name, None) for m in metadata]
+        if any(v is not None for v in values):
+            columns[ADDITIONAL_PREFIX + field.name] = pd.Series(values)
+    return columns
+
+
+def _vector_columns(objects: Sequence[Any]) -> Dict[str, Any]:
+    names: Dict[str, None] = {}
+    for obj in objects:
+        for name in obj.vector or {}:
+            names.setdefault(name)
+    columns = {}
+    for name in names:
+        columns[vector_column_name(name)] = _object_array(
+            [(obj.vector or {}).get(name) for obj in objects]
+        )
+    return columns
+
+
+def vector_column_name(name: str) -> str:
+    """
+    Return the DataFrame column name of a vector, `default` being the unnamed vector.
+    """
+    if name == "default":
+        return ADDITIONAL_PREFIX + "vector"
+    return ADDITIONAL_PREFIX + "vectors." + name
+
+
+def vectors_to_matrix(vectors: Sequence[Optional[Sequence[float]]]) -> np.ndarray:
+    """
+    Stack vectors into a read-only float32 matrix of shape `(n, dim)`.
+
+    Rows of missing vectors are filled with NaN.
+    """
+    if all(v is not None for v in vectors):
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+    else:
+        dim = next((len(v) for v in vectors if v is not None), 0)
+        matrix = np.full((len(vectors), dim), np.nan, dtype=np.float32)
+        for i, v in enumerate(vectors):
+            if v is not None:
+                matrix[i] = v
+    matrix.setflags(write=False)
+    return matrix
+
+
+def objects_to_matrices(objects: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Stack the vectors of Weaviate objects into one matrix per vector name, aligned by row.
+
+    The unnamed vector of a collection is named `default`.
+    """
+    names = dict.fromkeys(name for obj in objects for name in obj.vector or {})
+    return {
+        name: vectors_to_matrix([(obj.vector or {}).get(name) for obj in objects])
+        for name in names
+    }
+
+
+def pop_gql_vectors(
+    data: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    """
+    Split the `_additional { vector vectors {...} }` fields off GraphQL result rows.
+
+    Returns
+    -------
+    Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]
+        The rows without the vector fields, and one matrix per vector name, aligned by row.
+        The unnamed vector is named `default`.
+    """
+    rows = []
+    vectors: Dict[str, List[Any]] = {}
+    for i, row in enumerate(data):
+        additional = row.get("_additional")
+        if isinstance(additional, dict) and (
+            "vector" in additional or "vectors" in additional
+        ):
+            row = dict(row)
+            additional = dict(additional)
+            named = dict(additional.pop("vectors", None) or {})
+            if "vector" in additional:
+                named["default"] = additional.pop("vector")
+            for name, vector in named.items():
+                if name not in vectors:
+                    vectors[name] = [None] * len(data)
+                vectors[name][i] = vector
+            if additional:
+                row["_additional"] = additional
+            else:
+                del row["_additional"]
+        rows.append(row)
+    return rows, {name: vectors_to_matrix(v) for name, v in vectors.items()}
+
+
+def aggregate_to_dataframe(response: Any, schema: Optional[Schema] = None) -> pd.DataFrame:
+    """
+    Convert the response of a `collection.aggregate` call to a DataFrame.
+
+    The result has one row per group, or a single row if the aggregation is not grouped.
+    The grouped property is the first column, followed by the `total_count` column, and a
+    `<property>.<metric>` column per returned metric, e.g. `rating.mean` or `genre.top_occurrences`.
+    Top occurrences are lists of `{"value": ..., "count": ...}` dicts.
+
+    Parameters
+    ----------
+    response : AggregateReturn or AggregateGroupByReturn
+        The response of the aggregation.
+    schema : Dict[str, DataType], optional
+        The data types of the properties, used to type the grouped values and date metrics,
+        which Weaviate returns as strings.
+    """
+    schema = schema or {}
+    groups = getattr(response, "groups", None)
+    grouped = groups is not None
+    if not grouped:
+        groups = [response]
+    columns: Dict[str, Any] = {}
+    if grouped and groups:
+        prop = groups[0].grouped_by.prop
+        columns[prop] = _group_column(
+            [group.grouped_by.value for group in groups], schema.get(prop)
+        )
+    columns[TOTAL_COUNT_COLUMN] = [group.total_count for group in groups]
+
+    metrics: Dict[str, List[Any]] = {}
+    for i, group in enumerate(groups):
+        for name, result in group.properties.items():
+            for field in dataclasses.fields(result):
+                value = getattr(result, field.name)
+                if field.name == "top_occurrences":
+                    value = [
+                        {"value": top.value, "count": top.count} for top in value
+                    ] or None
+                column = f"{name}.{field.name.rstrip('_')}"
+                metrics.setdefault(column, [None] * len(groups))[i] = value
+    for column, values in metrics.items():
+        if all(v is None for v in values):
+            continue
+        name, metric = column.rsplit(".", 1)
+        if schema.get(name) == DataType.DATE and metric in _DATE_METRICS:
+            columns[column] = _datetime_column(values)
+        else:
+            columns[column] = _object_array(values)
+    df = pd.DataFrame(columns, index=pd.RangeIndex(len(groups)))
+    return df.infer_objects(copy=False)
+
+
+def _group_column(values: List[Any], data_type: Optional[DataType]) -> Any:
+    if data_type is None:
+        return _object_array(values)
+    # Array properties are grouped by their elements
+    data_type = DataType(data_type.value.removesuffix("[]"))
+    if data_type == DataType.BOOL:
+        return np.array([str(v).lower() == "true" for v in values], dtype=bool)
+    return _typed_column(values, data_type)
@@ -0,0 +1,383 @@
+import io
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import MISSING, CacheInfo
+from .dataframes import VectorResult, is_arrow_table
+
+# Hits only refresh the access time of an entry when it is older than this, so that
+# reads rarely need the write lock of the database
+ACCESS_RESOLUTION = 10.0
+
+# Stored as JSON, as they round-trip exactly
+_JSON_TYPES = (str, int, float, bool)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    format TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+"""
+
+_disk_caches: Dict[str, "DiskCache"] = {}
+_disk_caches_lock = threading.Lock()
+
+
+def get_disk_cache(
+    path: str, max_bytes: int = 1024**3, allow_pickle: bool = False
+) -> "DiskCache":
+    """
+    Return the process-wide disk cache stored at `path`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the SQLite database file. It is created if it does not exist.
+    max_bytes : int, optional
+        The maximum total size of the cached values. Default: 1 GiB.
+    allow_pickle : bool, optional
+        Whether to pickle the values that have no other format, and unpickle them on reads. Default: False.
+    """
+    path = os.path.abspath(path)
+    with _disk_caches_lock:
+        cache = _disk_caches.get(path)
+        if cache is None:
+            cache = _disk_caches[path] = DiskCache(
+                path, max_bytes=max_bytes, allow_pickle=allow_pickle
+            )
+        else:
+            cache.max_bytes = max_bytes
+            cache.allow_pickle = allow_pickle
+        return cache
+
+
+def _serialize(value: Any, allow_pickle: bool = False) -> Tuple[str, bytes]:
+    if value is None or type(value) in _JSON_TYPES:
+        return "json", json.dumps(value).encode()
+    if type(value) is bytes:
+        return "bytes", value
+    if is_arrow_table(value):
+        return "arrow", _table_to_ipc(value)
+    if isinstance(value, pd.DataFrame):
+        import pyarrow as pa
+
+        try:
+            return "pandas", _table_to_ipc(pa.Table.from_pandas(value))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            # e.g. columns of lazy BLOB handles or of mixed types
+            if not allow_pickle:
+                raise TypeError(f"Cannot store the DataFrame in the Arrow format: {e}") from e
+    elif isinstance(value, VectorResult):
+        df_format, df_data = _serialize(value.df, allow_pickle)
+        if df_format != "pickle":
+            return "vectors", _vectors_to_npz(df_format, df_data, value.vectors)
+    if not allow_pickle:
+        raise TypeError(f"Cannot store a {type(value).__name__} without allow_pickle")
+    return "pickle", pickle.dumps(value, protocol=5)
+
+
+def _deserialize(format: str, data: bytes, allow_pickle: bool = False) -> Any:
+    if format == "json":
+        return json.loads(data)
+    if format == "bytes":
+        return data
+    if format == "arrow":
+        return _ipc_to_table(data)
+    if format == "pandas":
+        return _table_to_dataframe(_ipc_to_table(data))
+    if format == "vectors":
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            df = _deserialize(str(arrays["df_format"]), arrays["df"].tobytes())
+            vectors = {}
+            for i, name in enumerate(arrays["vector_names"].tolist()):
+                matrix = vectors[name] = arrays[f"vector_{i}"]
+                matrix.setflags(write=False)
+        return VectorResult(df, vectors)
+    if format == "pickle" and allow_pickle:
+        return pickle.loads(data)
+    raise ValueError(f"Cannot read an entry of format {format!r}")
+
+
+def _table_to_ipc(table: Any) -> bytes:
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _ipc_to_table(data: bytes) -> Any:
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(data).read_all()
+
+
+def _table_to_dataframe(table: Any) -> pd.DataFrame:
+    import pyarrow as pa
+
+    df = table.to_pandas()
+    # Arrow converts list cells to arrays, while query results hold lists, e.g. of TEXT_ARRAY properties
+    for i, field in enumerate(table.schema):
+        if field.name in df.columns and (
+            pa.types.is_list(field.type) or pa.types.is_large_list(field.type)
+        ):
+            df[field.name] = table.column(i).to_pylist()
+    return df
+
+
+def _vectors_to_npz(
+    df_format: str, df_data: bytes, vectors: Dict[str, np.ndarray]
+) -> bytes:
+    # Vector names are not valid member names of the archive in general, so the matrices are numbered
+    arrays = {f"vector_{i}": matrix for i, matrix in enumerate(vectors.values())}
+    sink = io.BytesIO()
+    np.savez(
+        sink,
+        df_format=np.array(df_format),
+        df=np.frombuffer(df_data, dtype=np.uint8),
+        vector_names=np.array(list(vectors), dtype=str),
+        **arrays,
+    )
+    return sink.getvalue()
+
+
+def _encode_tags(tags: Iterable[str]) -> str:
+    return "".join(f"|{tag}" for tag in sorted(tags)) + "|"
+
+
+def _decode_tags(tags: str) -> FrozenSet[str]:
+    return frozenset(tag for tag in tags.split("|") if tag)
+
+
+class DiskCache:
+    """
+    A result cache in a SQLite database, shared by all processes that open the same file.
+
+    Entries expire after their time-to-live, and the least recently used entries are evicted
+    once the total size of the values exceeds `max_bytes`. DataFrames and Arrow tables are stored in
+    the Arrow IPC format, vector matrices in the NumPy format, and strings and numbers as JSON, so
+    reading an entry never runs code from the file. Other values, e.g. DataFrames of lazy BLOB handles,
+    are not stored unless `allow_pickle` is set, which pickles them and requires that the file is
+    only writable by trusted users.
+    Errors of the database, e.g. a lock held for longer than the busy timeout, are counted and
+    treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 1024**3,
+        timeout: float = 5.0,
+        allow_pickle: bool = False,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        path : str
+            The path of the SQLite database file. It is created if it does not exist.
+        max_bytes : int, optional
+            The maximum total size of the cached values. Values larger than this are not cached.
+            Default: 1 GiB.
+        timeout : float, optional
+            The number of seconds to wait for a lock held by another process. Default: 5.
+        allow_pickle : bool, optional
+            Whether to pickle the values that have no other format, and unpickle them on reads.
+            Any process that can write to the file can then run code in this one. Default: False.
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "The disk cache requires pyarrow. Install it with `pip install pyarrow`."
+            ) from e
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.allow_pickle = allow_pickle
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def get(
+        self, namespace: str, key: str
+    ) -> Tuple[Any, Optional[float], FrozenSet[str]]:
+        """
+        Return the value, the remaining time-to-live and the tags of an entry,
+        or `(MISSING, None, frozenset())` if it is absent or expired.
+        """
+        now = time.time()
+        try:
+            db = self._db()
+            row = db.execute(
+                "SELECT format, value, expires_at, accessed_at, tags FROM entries "
+                "WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, now),
+            ).fetchone()
+            if row is not None and now - row[3] > ACCESS_RESOLUTION:
+                with db:
+                    db.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                        (now, namespace, key),
+                    )
+        except sqlite3.Error:
+            self._count("_errors")
+            row = None
+        if row is None:
+            self._count("_misses")
+            return MISSING, None, frozenset()
+
+        format, data, expires_at, _, tags = row
+        try:
+            value = _deserialize(format, data, self.allow_pickle)
+        except Exception:
+            # e.g. written by an incompatible version of a library, or pickled without `allow_pickle`
+            self._count("_errors")
+            self._count("_misses")
+            return MISSING, None, frozenset()
+        self._count("_hits")
+        ttl = None if expires_at is None else expires_at - now
+        return value, ttl, _decode_tags(tags)
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """
+        Store `value` under `key` and return whether it was stored.
+
+        Values that cannot be serialized, e.g. DataFrames of lazy BLOB handles without `allow_pickle`,
+        and values larger than `max_bytes` are not stored.
+        """
+        try:
+            format, data = _serialize(value, self.allow_pickle)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        try:
+            db = self._db()
+            with db:
+                # Take the write lock right away, so that the eviction sees the committed size
+                db.execute("BEGIN IMMEDIATE")
+                db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, key, format, data, len(data), expires_at, now, _encode_tags(tags)),
+                )
+                self._evict(db, now)
+        except sqlite3.Error:
+            self._count("_errors")
+            return False
+        return True
+
+    def invalidate(self, namespace: str, tag: str) -> int:
+        """
+        Remove all entries of a namespace labelled with `tag` and return how many were removed.
+        """
+        return self._delete(
+            "DELETE FROM entries WHERE namespace = ? AND instr(tags, ?) > 0",
+            (namespace, f"|{tag}|"),
+        )
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """
+        Remove all entries, or only those of one namespace, and return how many were removed.
+        """
+        if namespace is None:
+            return self._delete("DELETE FROM entries", ())
+        return self._delete("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def info(self) -> CacheInfo:
+        """
+        Return the hit and miss counts of this process, the maximum size and the current size of the cache, in bytes.
+        """
+        try:
+            size = self._db().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        except sqlite3.Error:
+            self._count("_errors")
+            size = 0
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.max_bytes, size)
+
+    @property
+    def errors(self) -> int:
+        """
+        The number of database errors in this process.
+        """
+        with self._lock:
+            return self._errors
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        size = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if size <= self.max_bytes:
+            return
+        rows = db.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed_at"
+        )
+        evicted = []
+        for namespace, key, entry_size in rows:
+            if size <= self.max_bytes:
+                break
+            evicted.append((namespace, key))
+            size -= entry_size
+        db.executemany(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?", evicted
+        )
+
+    def _delete(self, sql: str, params: tuple) -> int:
+        try:
+            db = self._db()
+            with db:
+                return db.execute(sql, params).rowcount
+        except sqlite3.Error:
+            self._count("_errors")
+            return 0
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread, and new ones in a forked process
+        db = getattr(self._local, "db", None)
+        if db is not None and self._local.pid == os.getpid():
+            return db
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        # Readers do not block the writer, and the writer does not block readers
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        self._local.db = db
+        self._local.pid = os.getpid()
+        return db
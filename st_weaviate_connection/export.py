@@ -0,0 +1,179 @@
+import queue
+import threading
+from typing import Any, Iterable, Iterator, List, Optional, TypeVar
+
+import pandas as pd
+from weaviate.classes.config import DataType
+
+from .dataframes import Schema
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Group the items of an iterable into lists of at most `size` items.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def prefetch(chunks: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """
+    Iterate over `chunks` on a background thread, keeping up to `depth` chunks ready.
+
+    The producer thread blocks once `depth` chunks are waiting, so at most `depth + 1`
+    chunks are held in memory. Errors of the producer are raised by the consumer,
+    and closing the returned generator stops the producer.
+
+    Parameters
+    ----------
+    chunks : Iterable
+        The chunks to produce, e.g. a generator reading pages of a collection.
+    depth : int, optional
+        The maximum number of chunks produced ahead of the consumer. Default: 2.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    ready: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce() -> None:
+        iterator = iter(chunks)
+        try:
+            for chunk in iterator:
+                if not _put(chunk):
+                    return
+        except BaseException as e:
+            _put(_Failure(e))
+        else:
+            _put(_DONE)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(
+        target=_produce, name="st-weaviate-connection-prefetch", daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            item = ready.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+
+class ParquetChunkWriter:
+    """
+    Append DataFrame chunks to a Parquet file, one row group per chunk.
+
+    The file schema is taken from the first chunk. Columns that are empty in the first chunk
+    are typed from the collection schema, so that later chunks with values still fit.
+    """
+
+    def __init__(self, path: str, schema: Optional[Schema] = None) -> None:
+        """
+        Initialize the writer. The file is created when the first chunk is written.
+
+        Parameters
+        ----------
+        path : str
+            The path of the Parquet file to write.
+        schema : Dict[str, DataType], optional
+            The data types of the collection properties.
+        """
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Writing Parquet files requires pyarrow. Install it with `pip install pyarrow`."
+            ) from e
+        self.path = path
+        self.schema = schema or {}
+        self.rows = 0
+        self._writer: Any = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Append a chunk to the file.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._writer = pq.ParquetWriter(
+                self.path, _fill_null_types(table.schema, self.schema)
+            )
+        table = pa.Table.from_pandas(
+            df, schema=self._writer.schema, preserve_index=False
+        )
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        """
+        Write the file footer and close the file.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ParquetChunkWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _fill_null_types(arrow_schema: Any, schema: Schema) -> Any:
+    import pyarrow as pa
+
+    types = {
+        DataType.INT: pa.int64(),
+        DataType.NUMBER: pa.float64(),
+        DataType.BOOL: pa.bool_(),
+        DataType.DATE: pa.timestamp("us", tz="UTC"),
+        DataType.TEXT_ARRAY: pa.list_(pa.string()),
+        DataType.UUID_ARRAY: pa.list_(pa.string()),
+        DataType.INT_ARRAY: pa.list_(pa.int64()),
+        DataType.NUMBER_ARRAY: pa.list_(pa.float64()),
+        DataType.BOOL_ARRAY: pa.list_(pa.bool_()),
+    }
+    fields = []
+    for field in arrow_schema:
+        if pa.types.is_null(field.type):
+            field = field.with_type(types.get(schema.get(field.name), pa.string()))
+        fields.append(field)
+    return pa.schema(fields, metadata=arrow_schema.metadata)
@@ -0,0 +1,160 @@
+import datetime
+import operator
+from typing import Any, Optional, Set
+
+import numpy as np
+import pandas as pd
+from weaviate.classes.config import DataType
+from weaviate.collections.classes.filters import (
+    _FilterAnd,
+    _FilterOr,
+    _Filters,
+    _FilterValue,
+    _Operator,
+)
+
+from .dataframes import Schema
+
+# Text comparisons depend on the tokenization of the property, so only these types are evaluated locally
+LOCAL_FILTER_TYPES = {
+    DataType.INT: False,
+    DataType.NUMBER: False,
+    DataType.BOOL: False,
+    DataType.DATE: False,
+    DataType.UUID: False,
+    DataType.INT_ARRAY: True,
+    DataType.NUMBER_ARRAY: True,
+    DataType.BOOL_ARRAY: True,
+    DataType.DATE_ARRAY: True,
+    DataType.UUID_ARRAY: True,
+}
+
+_COMPARISONS = {
+    _Operator.EQUAL: operator.eq,
+    _Operator.NOT_EQUAL: operator.ne,
+    _Operator.LESS_THAN: operator.lt,
+    _Operator.LESS_THAN_EQUAL: operator.le,
+    _Operator.GREATER_THAN: operator.gt,
+    _Operator.GREATER_THAN_EQUAL: operator.ge,
+}
+
+
+class UnsupportedFilterError(ValueError):
+    """
+    Raised when a filter cannot be evaluated exactly on a DataFrame.
+    """
+
+
+def filter_properties(filters: Optional[_Filters]) -> Set[str]:
+    """
+    Return the names of the properties a filter tree compares.
+    """
+    if filters is None:
+        return set()
+    if isinstance(filters, (_FilterAnd, _FilterOr)):
+        return set().union(*(filter_properties(f) for f in filters.filters))
+    # Targets such as `_id` and `_creationTimeUnix` are not properties
+    if isinstance(filters.target, str) and not filters.target.startswith("_"):
+        return {filters.target}
+    return set()
+
+
+def filter_mask(df: pd.DataFrame, filters: Optional[_Filters], schema: Schema) -> np.ndarray:
+    """
+    Evaluate a Weaviate filter tree on the rows of a DataFrame.
+
+    Supports `&`, `|`, the comparison operators, `contains_any`, `contains_all` and `is_none`
+    on number, integer, boolean, date and uuid properties and their arrays, with the semantics
+    of the Weaviate server. Rows with a missing value never match a comparison.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The rows to filter, with one column per compared property.
+    filters : Filter, optional
+        The filter tree to evaluate. If None, all rows match.
+    schema : Dict[str, DataType]
+        The data types of the properties.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask of the matching rows.
+
+    Raises
+    ------
+    UnsupportedFilterError
+        If the filter uses an operator, a target or a property type that cannot be evaluated exactly,
+        e.g. text comparisons, references, geo ranges or properties that are not in `df`.
+    """
+    if filters is None:
+        return np.ones(len(df), dtype=bool)
+    if isinstance(filters, _FilterAnd):
+        mask = np.ones(len(df), dtype=bool)
+        for f in filters.filters:
+            mask &= filter_mask(df, f, schema)
+        return mask
+    if isinstance(filters, _FilterOr):
+        mask = np.zeros(len(df), dtype=bool)
+        for f in filters.filters:
+            mask |= filter_mask(df, f, schema)
+        return mask
+    if isinstance(filters, _FilterValue):
+        return _value_mask(df, filters, schema)
+    raise UnsupportedFilterError(f"Unsupported filter: {filters!r}")
+
+
+def _value_mask(df: pd.DataFrame, f: _FilterValue, schema: Schema) -> np.ndarray:
+    if not isinstance(f.target, str) or f.target not in df.columns:
+        raise UnsupportedFilterError(f"Cannot filter on {f.target!r} locally")
+    data_type = schema.get(f.target)
+    if data_type not in LOCAL_FILTER_TYPES:
+        raise UnsupportedFilterError(
+            f"Cannot filter on {f.target!r} of type {data_type} locally"
+        )
+    column = df[f.target]
+    present = column.notna().to_numpy()
+    if f.operator == _Operator.IS_NULL:
+        return ~present if f.value else present
+
+    if LOCAL_FILTER_TYPES[data_type]:
+        return _array_mask(column, f, data_type)
+    if data_type == DataType.UUID:
+        column = column.map(str, na_action="ignore")
+    if f.operator in _COMPARISONS:
+        compared = _COMPARISONS[f.operator](column, _comparable(f.value, data_type))
+        return compared.fillna(False).to_numpy(dtype=bool) & present
+    if f.operator == _Operator.CONTAINS_ANY:
+        values = [_comparable(v, data_type) for v in f.value]
+        return column.isin(values).to_numpy() & present
+    if f.operator == _Operator.CONTAINS_ALL:
+        values = {_comparable(v, data_type) for v in f.value}
+        if len(values) > 1:
+            return np.zeros(len(df), dtype=bool)
+        return column.isin(values).to_numpy() & present
+    raise UnsupportedFilterError(f"Unsupported operator: {f.operator}")
+
+
+def _array_mask(column: pd.Series, f: _FilterValue, data_type: DataType) -> np.ndarray:
+    if f.operator not in (_Operator.CONTAINS_ANY, _Operator.CONTAINS_ALL):
+        raise UnsupportedFilterError(f"Unsupported operator on arrays: {f.operator}")
+    values = {_comparable(v, data_type) for v in f.value}
+    any_of = f.operator == _Operator.CONTAINS_ANY
+    mask = np.zeros(len(column), dtype=bool)
+    for i, items in enumerate(column):
+        if items is None or (isinstance(items, float) and np.isnan(items)):
+            continue
+        items = {_comparable(item, data_type) for item in items}
+        mask[i] = not values.isdisjoint(items) if any_of else values <= items
+    return mask
+
+
+def _comparable(value: Any, data_type: DataType) -> Any:
+    if data_type in (DataType.DATE, DataType.DATE_ARRAY):
+        timestamp = pd.Timestamp(value)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(datetime.timezone.utc)
+        return timestamp
+    if data_type in (DataType.UUID, DataType.UUID_ARRAY):
+        return str(value)
+    return value
@@ -0,0 +1,84 @@
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+BATCHING_MODES = ("dynamic", "rate_limit", "fixed_size")
+
+
+def dataframe_objects(
+    df: pd.DataFrame,
+    vector_column: Optional[str] = None,
+    uuid_column: Optional[str] = None,
+    chunk_size: int = 1000,
+) -> Iterator[Tuple[Dict[str, Any], Optional[str], Optional[List[float]]]]:
+    """
+    Yield the `(properties, uuid, vector)` of each row of a DataFrame, in row order.
+
+    The rows are converted `chunk_size` at a time, so only one chunk of the frame
+    is held as dictionaries at once. Missing values are left out of the properties.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The rows to convert. Each column other than `vector_column` and `uuid_column` is a property.
+    vector_column : str, optional
+        The column holding the vector of each object, as a list or NumPy array.
+    uuid_column : str, optional
+        The column holding the uuid of each object.
+    chunk_size : int, optional
+        The number of rows converted at a time. Default: 1000.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    special = [c for c in (vector_column, uuid_column) if c is not None]
+    for name in special:
+        if name not in df.columns:
+            raise KeyError(f"Column {name!r} is not in the DataFrame")
+    properties = df.drop(columns=special)
+
+    for start in range(0, len(df), chunk_size):
+        stop = start + chunk_size
+        records = properties.iloc[start:stop].to_dict("records")
+        vectors = _column_values(df, vector_column, start, stop)
+        uuids = _column_values(df, uuid_column, start, stop)
+        for record, uuid, vector in zip(records, uuids, vectors):
+            yield _clean_properties(record), _clean_uuid(uuid), _clean_vector(vector)
+
+
+def _column_values(
+    df: pd.DataFrame, name: Optional[str], start: int, stop: int
+) -> List[Any]:
+    if name is None:
+        return [None] * len(df.iloc[start:stop])
+    return df[name].iloc[start:stop].tolist()
+
+
+def _clean_properties(record: Dict[str, Any]) -> Dict[str, Any]:
+    properties = {}
+    for name, value in record.items():
+        if hasattr(value, "tolist"):
+            value = value.tolist()
+        if not _is_missing(value):
+            properties[name] = value
+    return properties
+
+
+def _clean_uuid(value: Any) -> Optional[str]:
+    if _is_missing(value):
+        return None
+    return str(value)
+
+
+def _clean_vector(value: Any) -> Optional[List[float]]:
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if _is_missing(value):
+        return None
+    return value
+
+
+def _is_missing(value: Any) -> bool:
+    if value is None or value is pd.NaT or value is pd.NA:
+        return True
+    return isinstance(value, float) and math.isnan(value)
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from weaviate.client import WeaviateClient
+from weaviate.exceptions import (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateTimeoutError,
+)
+
+from .stats import phase
+
+CONNECTION_ERRORS = (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateTimeoutError,
+)
+
+ConnectionInfo = namedtuple(
+    "ConnectionInfo",
+    [
+        "connects",
+        "failures",
+        "health_checks",
+        "last_connect_seconds",
+        "total_connect_seconds",
+    ],
+)
+
+
+class ConnectionManager:
+    """
+    Keep a single Weaviate client connected and reuse its HTTP and gRPC channels across calls.
+
+    The client is connected once. Afterwards, a liveness probe runs at most every
+    `health_check_interval` seconds, and the client is only reconnected after the
+    probe or a request has failed.
+    """
+
+    def __init__(
+        self,
+        client: Optional[WeaviateClient] = None,
+        health_check_interval: Optional[float] = 30.0,
+        connect_seconds: Optional[float] = None,
+        client_factory: Optional[Callable[[], WeaviateClient]] = None,
+    ) -> None:
+        """
+        Initialize the connection manager.
+
+        Parameters
+        ----------
+        client : WeaviateClient, optional
+            The client to manage. It may or may not be connected already.
+        health_check_interval : float, optional
+            The minimum number of seconds between two liveness probes of a connected client.
+            If None, the client is never probed. Default: 30.
+        connect_seconds : float, optional
+            The time it took to connect `client`, if it is already connected.
+            It is reported as the first connect. Default: None.
+        client_factory : Callable[[], WeaviateClient], optional
+            Creates the client on the first `acquire`, if `client` is not provided,
+            e.g. to create it on a background thread.
+        """
+        if client is None and client_factory is None:
+            raise ValueError("Provide a client or a client_factory")
+        self.client = client
+        self._client_factory = client_factory
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._failed = False
+        self._last_checked = time.monotonic()
+        self._connects = 0 if connect_seconds is None else 1
+        self._failures = 0
+        self._health_checks = 0
+        self._last_connect_seconds = connect_seconds
+        self._total_connect_seconds = connect_seconds or 0.0
+
+    def acquire(self) -> WeaviateClient:
+        """
+        Return the client, connecting or reconnecting it first if needed.
+        """
+        with phase("connect"), self._lock:
+            if self.client is None:
+                self._create_client()
+            elif self._failed or not self.client.is_connected():
+                self._reconnect()
+            elif self._health_check_due():
+                self._health_checks += 1
+                self._last_checked = time.monotonic()
+                if not self.client.is_live():
+                    self._failures += 1
+                    self._reconnect()
+            return self.client
+
+    @contextmanager
+    def connected(self) -> Iterator[WeaviateClient]:
+        """
+        Acquire the client for the duration of a `with` block.
+
+        The connection is marked as failed if the block raises a connection error.
+        """
+        client = self.acquire()
+        try:
+            yield client
+        except CONNECTION_ERRORS:
+            self.mark_failed()
+            raise
+
+    def mark_failed(self) -> None:
+        """
+        Flag the connection as broken so that the next `acquire` reconnects the client.
+        """
+        with self._lock:
+            self._failed = True
+            self._failures += 1
+
+    def close(self) -> None:
+        """
+        Close the client, if it has been created.
+        """
+        with self._lock:
+            if self.client is not None:
+                self.client.close()
+
+    def info(self) -> ConnectionInfo:
+        """
+        Return the connect and failure counts and the connect latencies in seconds.
+        """
+        with self._lock:
+            return ConnectionInfo(
+                self._connects,
+                self._failures,
+                self._health_checks,
+                self._last_connect_seconds,
+                self._total_connect_seconds,
+            )
+
+    def _health_check_due(self) -> bool:
+        if self.health_check_interval is None:
+            return False
+        return time.monotonic() - self._last_checked >= self.health_check_interval
+
+    def _create_client(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.client = self._client_factory()
+        except Exception:
+            self._failures += 1
+            raise
+        self._record_connect(time.perf_counter() - start)
+
+    def _reconnect(self) -> None:
+        if self.client.is_connected():
+            self.client.close()
+        start = time.perf_counter()
+        try:
+            self.client.connect()
+        except Exception:
+            self._failed = True
+            self._failures += 1
+            raise
+        self._record_connect(time.perf_counter() - start)
+
+    def _record_connect(self, elapsed: float) -> None:
+        self._connects += 1
+        self._last_connect_seconds = elapsed
+        self._total_connect_seconds += elapsed
+        self._failed = False
+        self._last_checked = time.monotonic()
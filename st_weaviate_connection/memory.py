@@ -0,0 +1,1707 @@
+"""
+An in-process stand-in for a Weaviate instance, selected with `url="memory://"`.
+
+It implements the parts of the collection API used by `WeaviateConnection`: collections with
+a property schema, inserts and batches, `fetch_objects`, `bm25`, `near_vector` and `hybrid` queries
+with filters, `over_all` and `near_vector` aggregations, the collection iterator, and raw GraphQL
+`Get` queries. Vectors are scored by
+brute-force cosine similarity with NumPy, and keywords with a BM25 inverted index.
+There are no vectorizer modules: vectors must be provided with the objects and queries. Grouped generation
+with `generate.fetch_objects` and `generate.hybrid` echoes the task and the objects it is given.
+
+Databases are kept per URL for the lifetime of the process, so `memory://movies` and `memory://shows`
+are independent, and every client connected to the same URL sees the same data.
+"""
+
+import datetime
+import fnmatch
+import math
+import re
+import threading
+import uuid as uuid_package
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+from weaviate.collections.classes.aggregate import (
+    AggregateBoolean,
+    AggregateDate,
+    AggregateGroup,
+    AggregateGroupByReturn,
+    AggregateInteger,
+    AggregateNumber,
+    AggregateReturn,
+    AggregateText,
+    GroupByAggregate,
+    GroupedBy,
+    TopOccurrence,
+    _MetricsBoolean,
+    _MetricsDate,
+    _MetricsInteger,
+    _MetricsNumber,
+    _MetricsText,
+)
+from weaviate.collections.classes.batch import ErrorObject, _BatchObject
+from weaviate.collections.classes.filters import (
+    _FilterAnd,
+    _FilterOr,
+    _Filters,
+    _FilterValue,
+    _Operator,
+)
+from weaviate.collections.classes.grpc import MetadataQuery
+from weaviate.collections.classes.internal import (
+    GenerativeObject,
+    GenerativeReturn,
+    MetadataReturn,
+    Object,
+    QueryReturn,
+    _RawGQLReturn,
+)
+from weaviate.exceptions import (
+    WeaviateClosedClientError,
+    WeaviateInvalidInputError,
+    WeaviateQueryError,
+)
+
+MEMORY_SCHEME = "memory://"
+
+DEFAULT_LIMIT = 10
+
+# The number of best keyword and vector results fused by hybrid queries
+HYBRID_CANDIDATES = 100
+
+# The number of top occurrences of text aggregations, if not given
+TOP_OCCURRENCES_LIMIT = 5
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TEXT_TYPES = {DataType.TEXT, DataType.TEXT_ARRAY}
+
+_ARRAY_TYPES = {
+    DataType.TEXT_ARRAY: DataType.TEXT,
+    DataType.INT_ARRAY: DataType.INT,
+    DataType.NUMBER_ARRAY: DataType.NUMBER,
+    DataType.BOOL_ARRAY: DataType.BOOL,
+    DataType.DATE_ARRAY: DataType.DATE,
+    DataType.UUID_ARRAY: DataType.UUID,
+}
+
+_databases: Dict[str, "MemoryDatabase"] = {}
+_databases_lock = threading.Lock()
+
+
+def is_memory_url(url: Optional[str]) -> bool:
+    """
+    Return whether a connection URL selects the in-process backend.
+    """
+    return url is not None and url.startswith(MEMORY_SCHEME)
+
+
+def get_database(url: str = MEMORY_SCHEME) -> "MemoryDatabase":
+    """
+    Return the database of a `memory://` URL, creating it if needed.
+    """
+    with _databases_lock:
+        database = _databases.get(url)
+        if database is None:
+            database = _databases[url] = MemoryDatabase()
+        return database
+
+
+def drop_database(url: str = MEMORY_SCHEME) -> None:
+    """
+    Delete the database of a `memory://` URL and all of its collections.
+    """
+    with _databases_lock:
+        _databases.pop(url, None)
+
+
+def connect(url: str = MEMORY_SCHEME) -> "MemoryClient":
+    """
+    Return a connected client of the database of a `memory://` URL.
+    """
+    client = MemoryClient(get_database(url))
+    client.connect()
+    return client
+
+
+def use_async(url: str = MEMORY_SCHEME) -> "MemoryAsyncClient":
+    """
+    Return an unconnected async client of the database of a `memory://` URL.
+    """
+    return MemoryAsyncClient(get_database(url))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into lowercase words, like the `word` tokenization of Weaviate.
+    """
+    return re.findall(r"[^\W_]+", text.lower())
+
+
+class BM25Index:
+    """
+    An inverted index of the text properties of a collection, scoring documents with BM25F.
+
+    Each property is indexed separately, and the score of a document is the sum of its property scores.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, Dict[int, int]]] = {}
+        self._lengths: Dict[str, Dict[int, int]] = {}
+
+    def add(self, slot: int, texts: Dict[str, str]) -> None:
+        """
+        Index the text properties of the document stored in `slot`.
+        """
+        for name, text in texts.items():
+            tokens = tokenize(text)
+            self._lengths.setdefault(name, {})[slot] = len(tokens)
+            postings = self._postings.setdefault(name, {})
+            for term, count in Counter(tokens).items():
+                postings.setdefault(term, {})[slot] = count
+
+    def remove(self, slot: int, texts: Dict[str, str]) -> None:
+        """
+        Remove the document stored in `slot` from the index.
+        """
+        for name, text in texts.items():
+            self._lengths.get(name, {}).pop(slot, None)
+            postings = self._postings.get(name, {})
+            for term in set(tokenize(text)):
+                documents = postings.get(term)
+                if documents is not None:
+                    documents.pop(slot, None)
+                    if not documents:
+                        del postings[term]
+
+    def scores(
+        self, query: str, size: int, properties: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        Return the BM25 score of each slot for a keyword query, 0 for non-matching slots.
+
+        Parameters
+        ----------
+        query : str
+            The keywords to search for.
+        size : int
+            The number of slots of the collection.
+        properties : List[str], optional
+            The properties to search. Default: all indexed properties.
+        """
+        scores = np.zeros(size, dtype=np.float64)
+        terms = set(tokenize(query))
+        names = self._lengths if properties is None else properties
+        for name in names:
+            lengths = self._lengths.get(name)
+            if not lengths:
+                continue
+            postings = self._postings.get(name, {})
+            count = len(lengths)
+            average_length = sum(lengths.values()) / count or 1.0
+            for term in terms:
+                documents = postings.get(term)
+                if not documents:
+                    continue
+                slots = np.fromiter(documents.keys(), dtype=np.int64, count=len(documents))
+                frequencies = np.fromiter(
+                    documents.values(), dtype=np.float64, count=len(documents)
+                )
+                document_lengths = np.fromiter(
+                    (lengths[slot] for slot in documents),
+                    dtype=np.float64,
+                    count=len(documents),
+                )
+                idf = math.log(1 + (count - len(documents) + 0.5) / (len(documents) + 0.5))
+                scores[slots] += (
+                    idf
+                    * frequencies
+                    * (self.k1 + 1)
+                    / (
+                        frequencies
+                        + self.k1
+                        * (1 - self.b + self.b * document_lengths / average_length)
+                    )
+                )
+        return scores
+
+
+@dataclass
+class MemoryProperty:
+    name: str
+    data_type: DataType
+
+
+@dataclass
+class MemoryCollectionConfig:
+    name: str
+    properties: List[MemoryProperty]
+
+
+class MemoryDatabase:
+    """
+    The collections of one `memory://` URL.
+    """
+
+    def __init__(self) -> None:
+        self.collections: Dict[str, "CollectionData"] = {}
+        self.lock = threading.RLock()
+
+    def create(self, name: str, properties: Sequence[Any] = ()) -> "CollectionData":
+        name = _capitalize(name)
+        with self.lock:
+            if name in self.collections:
+                raise WeaviateInvalidInputError(f"Collection {name} already exists")
+            data = self.collections[name] = CollectionData(name, self.lock)
+            for prop in properties:
+                data.add_property(prop.name, DataType(_data_type_of(prop)))
+            return data
+
+    def get(self, name: str) -> "CollectionData":
+        data = self.collections.get(_capitalize(name))
+        if data is None:
+            raise WeaviateQueryError(
+                f"could not find class {_capitalize(name)} in schema", "memory"
+            )
+        return data
+
+
+class CollectionData:
+    """
+    The objects, vectors and indexes of a collection.
+
+    Objects are stored in slots. Replacing or deleting an object frees its slot,
+    so the indexes never have to be compacted.
+    """
+
+    def __init__(self, name: str, lock: threading.RLock) -> None:
+        self.name = name
+        self.lock = lock
+        self.schema: Dict[str, DataType] = {}
+        self.uuids: List[Optional[str]] = []
+        self.properties: List[Optional[Dict[str, Any]]] = []
+        self.vectors: List[Dict[str, np.ndarray]] = []
+        self.times: List[Tuple[datetime.datetime, datetime.datetime]] = []
+        self.slots: Dict[str, int] = {}
+        self.bm25 = BM25Index()
+        self._matrices: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._counter = 0
+
+    def next_uuid(self) -> str:
+        """
+        Return a new uuid, derived from the collection name and a counter so that runs are reproducible.
+        """
+        with self.lock:
+            self._counter += 1
+            return str(uuid_package.uuid5(uuid_package.NAMESPACE_URL, f"{self.name}/{self._counter}"))
+
+    def add_property(self, name: str, data_type: DataType) -> None:
+        self.schema[name] = data_type
+
+    def config(self) -> MemoryCollectionConfig:
+        return MemoryCollectionConfig(
+            self.name, [MemoryProperty(n, t) for n, t in self.schema.items()]
+        )
+
+    def put(
+        self,
+        properties: Optional[Dict[str, Any]],
+        uuid: Optional[Any] = None,
+        vector: Optional[Any] = None,
+    ) -> str:
+        """
+        Validate and store an object, replacing the object with the same uuid. Return its uuid.
+
+        Raises
+        ------
+        ValueError
+            If a property value does not match the type of the property.
+        """
+        object_uuid = str(uuid) if uuid is not None else self.next_uuid()
+        values = {}
+        with self.lock:
+            for name, value in (properties or {}).items():
+                if value is None:
+                    continue
+                data_type = self.schema.get(name)
+                if data_type is None:
+                    data_type = _infer_data_type(value)
+                values[name] = _coerce(name, value, data_type)
+                if name not in self.schema:
+                    self.add_property(name, data_type)
+            vectors = _named_vectors(vector)
+            now = datetime.datetime.now(datetime.timezone.utc)
+            created = now
+            previous = self.slots.get(object_uuid)
+            if previous is not None:
+                created = self.times[previous][0]
+                self._free(previous)
+            slot = len(self.uuids)
+            self.uuids.append(object_uuid)
+            self.properties.append(values)
+            self.vectors.append(vectors)
+            self.times.append((created, now))
+            self.slots[object_uuid] = slot
+            self.bm25.add(slot, self._texts(values))
+            self._matrices.clear()
+        return object_uuid
+
+    def delete(self, uuid: Any) -> bool:
+        with self.lock:
+            slot = self.slots.get(str(uuid))
+            if slot is None:
+                return False
+            self._free(slot)
+            self._matrices.clear()
+            return True
+
+    def live_slots(self) -> np.ndarray:
+        """
+        Return the slots of the stored objects, in uuid order.
+        """
+        return np.array(
+            [self.slots[u] for u in sorted(self.slots)], dtype=np.int64
+        )
+
+    def matching_slots(self, filters: Optional[_Filters]) -> np.ndarray:
+        slots = self.live_slots()
+        if filters is None:
+            return slots
+        return np.array(
+            [slot for slot in slots if self._matches(slot, filters)], dtype=np.int64
+        )
+
+    def keyword_scores(
+        self, query: str, properties: Optional[Sequence[str]]
+    ) -> np.ndarray:
+        if properties is not None:
+            properties = [p.split("^")[0] for p in properties]
+        return self.bm25.scores(query, len(self.uuids), properties)
+
+    def vector_similarities(
+        self, vector: Any, target_vector: Any = None
+    ) -> np.ndarray:
+        """
+        Return the cosine similarity of each slot with `vector`, NaN for slots without the target vector.
+        """
+        names = _target_names(target_vector)
+        similarities = []
+        for name in names:
+            matrix, present = self._matrix(name)
+            query = np.asarray(vector, dtype=np.float32)
+            if matrix.shape[1] and query.shape[0] != matrix.shape[1]:
+                raise WeaviateQueryError(
+                    f"vector lengths don't match: {query.shape[0]} vs {matrix.shape[1]}",
+                    "memory",
+                )
+            norm = np.linalg.norm(query)
+            scores = matrix @ (query / norm if norm else query) if matrix.shape[1] else np.zeros(len(present))
+            similarities.append(np.where(present, scores, np.nan))
+        return np.mean(similarities, axis=0) if similarities else np.full(len(self.uuids), np.nan)
+
+    def to_object(
+        self,
+        slot: int,
+        return_properties: Optional[Sequence[Any]],
+        include_vector: Any,
+        metadata: Set[str],
+        **scores: Any,
+    ) -> Object:
+        properties = self.properties[slot]
+        if return_properties is None:
+            names = [
+                n for n in self.schema if self.schema[n] != DataType.BLOB and n in properties
+            ]
+        else:
+            names = [n for n in return_properties if isinstance(n, str) and n in properties]
+        if include_vector is True:
+            vector = {n: v.tolist() for n, v in self.vectors[slot].items()}
+        elif include_vector:
+            wanted = [include_vector] if isinstance(include_vector, str) else include_vector
+            vector = {n: v.tolist() for n, v in self.vectors[slot].items() if n in wanted}
+        else:
+            vector = {}
+        created, updated = self.times[slot]
+        values = dict(scores, creation_time=created, last_update_time=updated)
+        return Object(
+            uuid=uuid_package.UUID(self.uuids[slot]),
+            metadata=MetadataReturn(
+                **{k: v for k, v in values.items() if k in metadata}
+            ),
+            properties={n: properties[n] for n in names},
+            references=None,
+            vector=vector,
+            collection=self.name,
+        )
+
+    def _free(self, slot: int) -> None:
+        object_uuid = self.uuids[slot]
+        self.bm25.remove(slot, self._texts(self.properties[slot]))
+        del self.slots[object_uuid]
+        self.uuids[slot] = None
+        self.properties[slot] = None
+        self.vectors[slot] = {}
+
+    def _texts(self, values: Dict[str, Any]) -> Dict[str, str]:
+        texts = {}
+        for name, value in values.items():
+            data_type = self.schema.get(name)
+            if data_type == DataType.TEXT:
+                texts[name] = value
+            elif data_type == DataType.TEXT_ARRAY:
+                texts[name] = " ".join(value)
+        return texts
+
+    def _matrix(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._matrices.get(name)
+        if cached is not None:
+            return cached
+        vectors = [v.get(name) for v in self.vectors]
+        dim = next((len(v) for v in vectors if v is not None), 0)
+        matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+        present = np.zeros(len(vectors), dtype=bool)
+        for slot, vector in enumerate(vectors):
+            if vector is not None and len(vector) == dim:
+                matrix[slot] = vector
+                present[slot] = True
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        self._matrices[name] = (matrix, present)
+        return matrix, present
+
+    def _matches(self, slot: int, filters: _Filters) -> bool:
+        if isinstance(filters, _FilterAnd):
+            return all(self._matches(slot, f) for f in filters.filters)
+        if isinstance(filters, _FilterOr):
+            return any(self._matches(slot, f) for f in filters.filters)
+        if not isinstance(filters, _FilterValue) or not isinstance(filters.target, str):
+            raise WeaviateInvalidInputError(
+                f"Filter {filters!r} is not supported by the memory backend"
+            )
+        if filters.target == "_id":
+            return _compare(
+                filters.operator, self.uuids[slot], filters.value, DataType.UUID
+            )
+        if filters.target in ("_creationTimeUnix", "_lastUpdateTimeUnix"):
+            index = 0 if filters.target == "_creationTimeUnix" else 1
+            return _compare(
+                filters.operator, self.times[slot][index], filters.value, DataType.DATE
+            )
+        data_type = self.schema.get(filters.target)
+        if data_type is None:
+            raise WeaviateQueryError(
+                f"no such prop with name '{filters.target}' found in class '{self.name}'",
+                "memory",
+            )
+        value = self.properties[slot].get(filters.target)
+        return _compare(filters.operator, value, filters.value, data_type)
+
+
+def _compare(operator: _Operator, value: Any, target: Any, data_type: DataType) -> bool:
+    if operator == _Operator.IS_NULL:
+        return (value is None) == bool(target)
+    if value is None:
+        return False
+    element_type = _ARRAY_TYPES.get(data_type, data_type)
+    values = value if data_type in _ARRAY_TYPES else [value]
+    if element_type == DataType.TEXT:
+        tokens = {token for v in values for token in tokenize(v)}
+        if operator == _Operator.LIKE:
+            pattern = target.lower()
+            return any(fnmatch.fnmatchcase(token, pattern) for token in tokens) or any(
+                fnmatch.fnmatchcase(v.lower(), pattern) for v in values
+            )
+        targets = target if isinstance(target, list) else [target]
+        wanted = [set(tokenize(t)) for t in targets]
+        if operator == _Operator.EQUAL:
+            return wanted[0] <= tokens
+        if operator == _Operator.NOT_EQUAL:
+            return not wanted[0] <= tokens
+        if operator == _Operator.CONTAINS_ANY:
+            return any(w <= tokens for w in wanted)
+        if operator == _Operator.CONTAINS_ALL:
+            return all(w <= tokens for w in wanted)
+        raise WeaviateInvalidInputError(f"Operator {operator} is not supported on text")
+
+    values = [_comparable(v, element_type) for v in values]
+    if operator == _Operator.CONTAINS_ANY:
+        return any(_comparable(t, element_type) in values for t in target)
+    if operator == _Operator.CONTAINS_ALL:
+        return all(_comparable(t, element_type) in values for t in target)
+    target = _comparable(target, element_type)
+    compare = {
+        _Operator.EQUAL: lambda v: v == target,
+        _Operator.NOT_EQUAL: lambda v: v != target,
+        _Operator.LESS_THAN: lambda v: v < target,
+        _Operator.LESS_THAN_EQUAL: lambda v: v <= target,
+        _Operator.GREATER_THAN: lambda v: v > target,
+        _Operator.GREATER_THAN_EQUAL: lambda v: v >= target,
+    }.get(operator)
+    if compare is None:
+        raise WeaviateInvalidInputError(
+            f"Operator {operator} is not supported by the memory backend"
+        )
+    if operator == _Operator.NOT_EQUAL:
+        return all(compare(v) for v in values)
+    return any(compare(v) for v in values)
+
+
+def _comparable(value: Any, data_type: DataType) -> Any:
+    if data_type == DataType.DATE:
+        return _as_datetime(value)
+    if data_type == DataType.UUID:
+        return str(value)
+    return value
+
+
+def _as_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, (int, float)):
+        value = datetime.datetime.fromtimestamp(value / 1000, datetime.timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def _coerce(name: str, value: Any, data_type: DataType) -> Any:
+    element_type = _ARRAY_TYPES.get(data_type)
+    if element_type is not None:
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"invalid {data_type.value} property '{name}': {value!r} is not a list")
+        return [_coerce(name, v, element_type) for v in value]
+    valid = {
+        DataType.TEXT: lambda v: isinstance(v, str),
+        DataType.BLOB: lambda v: isinstance(v, str),
+        DataType.INT: lambda v: isinstance(v, int) and not isinstance(v, bool),
+        DataType.NUMBER: lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+        DataType.BOOL: lambda v: isinstance(v, bool),
+        DataType.OBJECT: lambda v: isinstance(v, dict),
+    }.get(data_type)
+    if valid is not None:
+        if not valid(value):
+            raise ValueError(
+                f"invalid {data_type.value} property '{name}': {value!r} is of type {type(value).__name__}"
+            )
+        return float(value) if data_type == DataType.NUMBER else value
+    if data_type == DataType.DATE:
+        try:
+            return _as_datetime(value)
+        except (TypeError, ValueError, AttributeError):
+            raise ValueError(f"invalid date property '{name}': {value!r}") from None
+    if data_type == DataType.UUID:
+        return uuid_package.UUID(str(value))
+    return value
+
+
+def _infer_data_type(value: Any) -> DataType:
+    if isinstance(value, bool):
+        return DataType.BOOL
+    if isinstance(value, int):
+        return DataType.INT
+    if isinstance(value, float):
+        return DataType.NUMBER
+    if isinstance(value, datetime.datetime):
+        return DataType.DATE
+    if isinstance(value, uuid_package.UUID):
+        return DataType.UUID
+    if isinstance(value, dict):
+        return DataType.OBJECT
+    if isinstance(value, (list, tuple)) and value:
+        element_type = _infer_data_type(value[0])
+        for array_type, array_element_type in _ARRAY_TYPES.items():
+            if array_element_type == element_type:
+                return array_type
+    return DataType.TEXT
+
+
+def _named_vectors(vector: Any) -> Dict[str, np.ndarray]:
+    if vector is None:
+        return {}
+    if isinstance(vector, dict):
+        return {name: np.asarray(v, dtype=np.float32) for name, v in vector.items()}
+    return {"default": np.asarray(vector, dtype=np.float32)}
+
+
+def _target_names(target_vector: Any) -> List[str]:
+    if target_vector is None:
+        return ["default"]
+    if isinstance(target_vector, str):
+        return [target_vector]
+    if hasattr(target_vector, "target_vectors"):
+        return list(target_vector.target_vectors)
+    return list(target_vector)
+
+
+def _data_type_of(prop: Any) -> str:
+    data_type = getattr(prop, "dataType", None) or getattr(prop, "data_type")
+    return data_type.value if isinstance(data_type, DataType) else data_type
+
+
+def _capitalize(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+
+def _metadata_fields(return_metadata: Any) -> Set[str]:
+    if return_metadata is None:
+        return set()
+    if isinstance(return_metadata, MetadataQuery):
+        return {name for name, wanted in return_metadata.model_dump().items() if wanted}
+    return set(return_metadata)
+
+
+def _normalized(scores: Dict[int, float]) -> Dict[int, float]:
+    if not scores:
+        return {}
+    low, high = min(scores.values()), max(scores.values())
+    if high == low:
+        return {slot: 1.0 for slot in scores}
+    return {slot: (score - low) / (high - low) for slot, score in scores.items()}
+
+
+def _top(scores: np.ndarray, slots: np.ndarray, k: int) -> Dict[int, float]:
+    values = scores[slots]
+    keep = ~np.isnan(values)
+    slots, values = slots[keep], values[keep]
+    order = np.argsort(-values, kind="stable")[:k]
+    return {int(slots[i]): float(values[i]) for i in order}
+
+
+class _Query:
+    def __init__(self, collection: "MemoryCollection") -> None:
+        self._collection = collection
+
+    @property
+    def _data(self) -> CollectionData:
+        return self._collection._data()
+
+    def fetch_objects(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after: Optional[Any] = None,
+        filters: Optional[_Filters] = None,
+        include_vector: Any = False,
+        return_metadata: Any = None,
+        return_properties: Optional[Sequence[Any]] = None,
+        **kwargs: Any,
+    ) -> QueryReturn:
+        _check_unsupported(kwargs)
+        data = self._data
+        with data.lock:
+            slots = data.matching_slots(filters)
+            if after is not None:
+                after = str(after)
+                slots = np.array(
+                    [s for s in slots if data.uuids[s] > after], dtype=np.int64
+                )
+            start = offset or 0
+            slots = slots[start : start + (limit or DEFAULT_LIMIT)]
+            metadata = _metadata_fields(return_metadata)
+            return QueryReturn(
+                objects=[
+                    data.to_object(s, return_properties, include_vector, metadata)
+                    for s in slots
+                ]
+            )
+
+    def bm25(
+        self,
+        query: Optional[str],
+        query_properties: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        filters: Optional[_Filters] = None,
+        include_vector: Any = False,
+        return_metadata: Any = None,
+        return_properties: Optional[Sequence[Any]] = None,
+        **kwargs: Any,
+    ) -> QueryReturn:
+        _check_unsupported(kwargs)
+        data = self._data
+        with data.lock:
+            slots = data.matching_slots(filters)
+            scores = data.keyword_scores(query or "", query_properties)
+            ranked = {
+                slot: score
+                for slot, score in _top(scores, slots, len(slots)).items()
+                if score > 0
+            }
+            return self._objects(
+                ranked, {}, offset, limit, include_vector, return_metadata, return_properties
+            )
+
+    def near_vector(
+        self,
+        near_vector: Any,
+        certainty: Optional[float] = None,
+        distance: Optional[float] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        filters: Optional[_Filters] = None,
+        target_vector: Any = None,
+        include_vector: Any = False,
+        return_metadata: Any = None,
+        return_properties: Optional[Sequence[Any]] = None,
+        **kwargs: Any,
+    ) -> QueryReturn:
+        _check_unsupported(kwargs)
+        data = self._data
+        with data.lock:
+            slots = data.matching_slots(filters)
+            similarities = data.vector_similarities(near_vector, target_vector)
+            ranked = _top(similarities, slots, len(slots))
+            if distance is not None:
+                ranked = {s: v for s, v in ranked.items() if 1 - v <= distance}
+            if certainty is not None:
+                ranked = {s: v for s, v in ranked.items() if (1 + v) / 2 >= certainty}
+            return self._objects(
+                {},
+                ranked,
+                offset,
+                limit,
+                include_vector,
+                return_metadata,
+                return_properties,
+            )
+
+    def hybrid(
+        self,
+        query: Optional[str],
+        alpha: float = 0.7,
+        vector: Any = None,
+        query_properties: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        filters: Optional[_Filters] = None,
+        target_vector: Any = None,
+        include_vector: Any = False,
+        return_metadata: Any = None,
+        return_properties: Optional[Sequence[Any]] = None,
+        **kwargs: Any,
+    ) -> QueryReturn:
+        """
+        Fuse the best keyword and vector results with relative score fusion.
+
+        Without a query vector, only the keyword results are used, as there is no vectorizer.
+        Without a query either, the objects are returned in uuid order.
+        """
+        _check_unsupported(kwargs)
+        data = self._data
+        with data.lock:
+            slots = data.matching_slots(filters)
+            candidates = max(HYBRID_CANDIDATES, (offset or 0) + (limit or DEFAULT_LIMIT))
+            keyword = {}
+            if query and alpha < 1:
+                keyword = {
+                    slot: score
+                    for slot, score in _top(
+                        data.keyword_scores(query, query_properties), slots, candidates
+                    ).items()
+                    if score > 0
+                }
+            semantic = {}
+            if vector is not None and alpha > 0:
+                semantic = _top(
+                    data.vector_similarities(vector, target_vector), slots, candidates
+                )
+            if not query and vector is None:
+                ranked = {int(slot): 0.0 for slot in slots}
+                return self._objects(
+                    {}, {}, offset, limit, include_vector, return_metadata, return_properties, ranked
+                )
+
+            keyword_normalized = _normalized(keyword)
+            semantic_normalized = _normalized(semantic)
+            fused = {}
+            explain = {}
+            for slot in dict.fromkeys([*keyword, *semantic]):
+                score = (1 - alpha) * keyword_normalized.get(slot, 0.0) + alpha * semantic_normalized.get(slot, 0.0)
+                fused[slot] = score
+                parts = []
+                if slot in keyword:
+                    parts.append(
+                        f"\nHybrid (Result Set keyword,bm25) Document {data.uuids[slot]}: original score {keyword[slot]}, normalized score: {(1 - alpha) * keyword_normalized[slot]}"
+                    )
+                if slot in semantic:
+                    parts.append(
+                        f"\nHybrid (Result Set vector,hybridVector) Document {data.uuids[slot]}: original score {semantic[slot]}, normalized score: {alpha * semantic_normalized[slot]}"
+                    )
+                explain[slot] = " - ".join(parts)
+            return self._objects(
+                {},
+                {},
+                offset,
+                limit,
+                include_vector,
+                return_metadata,
+                return_properties,
+                fused,
+                explain,
+            )
+
+    def _objects(
+        self,
+        keyword: Dict[int, float],
+        semantic: Dict[int, float],
+        offset: Optional[int],
+        limit: Optional[int],
+        include_vector: Any,
+        return_metadata: Any,
+        return_properties: Optional[Sequence[Any]],
+        fused: Optional[Dict[int, float]] = None,
+        explain: Optional[Dict[int, str]] = None,
+    ) -> QueryReturn:
+        data = self._data
+        scores = fused if fused is not None else keyword or semantic
+        ranked = sorted(scores, key=lambda slot: (-scores[slot], data.uuids[slot]))
+        start = offset or 0
+        ranked = ranked[start : start + (limit or DEFAULT_LIMIT)]
+        metadata = _metadata_fields(return_metadata)
+        objects = []
+        for slot in ranked:
+            values = {}
+            if keyword or fused is not None:
+                values["score"] = scores[slot]
+                values["explain_score"] = (explain or {}).get(
+                    slot, f", BM25F_score: {scores[slot]}" if keyword else ""
+                )
+            if semantic:
+                values["distance"] = 1 - semantic[slot]
+                values["certainty"] = (1 + semantic[slot]) / 2
+            objects.append(
+                data.to_object(slot, return_properties, include_vector, metadata, **values)
+            )
+        return QueryReturn(objects=objects)
+
+
+def _check_unsupported(kwargs: Dict[str, Any]) -> None:
+    for name in ("group_by", "rerank", "return_references", "sort"):
+        if kwargs.pop(name, None) is not None:
+            raise WeaviateInvalidInputError(
+                f"{name} is not supported by the memory backend"
+            )
+    kwargs.pop("fusion_type", None)
+    kwargs.pop("auto_limit", None)
+    if kwargs:
+        raise TypeError(f"Unexpected arguments: {', '.join(kwargs)}")
+
+
+class _Config:
+    def __init__(self, collection: "MemoryCollection") -> None:
+        self._collection = collection
+
+    def get(self, simple: bool = False) -> MemoryCollectionConfig:
+        return self._collection._data().config()
+
+
+class _Data:
+    def __init__(self, collection: "MemoryCollection") -> None:
+        self._collection = collection
+
+    def insert(
+        self,
+        properties: Optional[Dict[str, Any]] = None,
+        uuid: Optional[Any] = None,
+        vector: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> uuid_package.UUID:
+        try:
+            object_uuid = self._collection._data().put(properties, uuid, vector)
+        except ValueError as e:
+            raise WeaviateInvalidInputError(str(e)) from None
+        return uuid_package.UUID(object_uuid)
+
+    def insert_many(self, objects: Sequence[Any]) -> Dict[int, Any]:
+        """
+        Insert objects given as property dicts or `DataObject`s. Return the uuid or error message of each object, by index.
+        """
+        results = {}
+        data = self._collection._data()
+        for index, obj in enumerate(objects):
+            if hasattr(obj, "properties"):
+                args = (obj.properties, obj.uuid, obj.vector)
+            else:
+                args = (obj, None, None)
+            try:
+                results[index] = uuid_package.UUID(data.put(*args))
+            except ValueError as e:
+                results[index] = str(e)
+        return results
+
+    def delete_by_id(self, uuid: Any) -> bool:
+        return self._collection._data().delete(uuid)
+
+
+class _BatchContext:
+    def __init__(self, batch: "_Batch") -> None:
+        self._batch = batch
+        self._index = 0
+
+    def __enter__(self) -> "_BatchContext":
+        self._batch.failed_objects = []
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def add_object(
+        self,
+        properties: Optional[Dict[str, Any]] = None,
+        references: Optional[Any] = None,
+        uuid: Optional[Any] = None,
+        vector: Optional[Any] = None,
+    ) -> uuid_package.UUID:
+        if uuid is None:
+            uuid = self._batch._collection._data().next_uuid()
+        object_uuid = str(uuid)
+        index = self._index
+        self._index += 1
+        try:
+            self._batch._collection._data().put(properties, object_uuid, vector)
+        except ValueError as e:
+            self._batch.failed_objects.append(
+                ErrorObject(
+                    message=str(e),
+                    object_=_BatchObject(
+                        collection=self._batch._collection.name,
+                        vector=vector,
+                        uuid=object_uuid,
+                        properties=properties,
+                        tenant=None,
+                        references=references,
+                        index=index,
+                    ),
+                )
+            )
+        return uuid_package.UUID(object_uuid)
+
+    @property
+    def number_errors(self) -> int:
+        return len(self._batch.failed_objects)
+
+
+class _Batch:
+    def __init__(self, collection: "MemoryCollection") -> None:
+        self._collection = collection
+        self.failed_objects: List[ErrorObject] = []
+
+    def dynamic(self) -> _BatchContext:
+        return _BatchContext(self)
+
+    def fixed_size(self, batch_size: int = 100, concurrent_requests: int = 2) -> _BatchContext:
+        return _BatchContext(self)
+
+    def rate_limit(self, requests_per_minute: int) -> _BatchContext:
+        return _BatchContext(self)
+
+
+class _Aggregate:
+    def __init__(self, collection: "MemoryCollection") -> None:
+        self._collection = collection
+
+    def over_all(
+        self,
+        *,
+        filters: Optional[_Filters] = None,
+        group_by: Any = None,
+        total_count: bool = True,
+        return_metrics: Any = None,
+    ) -> Any:
+        data = self._collection._data()
+        with data.lock:
+            slots = data.matching_slots(filters)
+            return _aggregate(data, slots, group_by, total_count, return_metrics)
+
+    def near_vector(
+        self,
+        near_vector: Any,
+        *,
+        certainty: Optional[float] = None,
+        distance: Optional[float] = None,
+        object_limit: Optional[int] = None,
+        filters: Optional[_Filters] = None,
+        group_by: Any = None,
+        target_vector: Any = None,
+        total_count: bool = True,
+        return_metrics: Any = None,
+    ) -> Any:
+        """
+        Aggregate the `object_limit` objects closest to `near_vector`, or those within `certainty` or `distance`.
+        """
+        if object_limit is None and certainty is None and distance is None:
+            raise WeaviateQueryError(
+                "must provide limit, certainty or distance to an aggregation with near_vector",
+                "memory",
+            )
+        data = self._collection._data()
+        with data.lock:
+            slots = data.matching_slots(filters)
+            similarities = data.vector_similarities(near_vector, target_vector)
+            ranked = _top(similarities, slots, object_limit or len(slots))
+            if distance is not None:
+                ranked = {s: v for s, v in ranked.items() if 1 - v <= distance}
+            if certainty is not None:
+                ranked = {s: v for s, v in ranked.items() if (1 + v) / 2 >= certainty}
+            slots = np.array(list(ranked), dtype=np.int64)
+            return _aggregate(data, slots, group_by, total_count, return_metrics)
+
+    def near_text(self, *args: Any, **kwargs: Any) -> Any:
+        raise WeaviateInvalidInputError(
+            "near_text is not supported by the memory backend, which has no vectorizer"
+        )
+
+    def hybrid(self, *args: Any, **kwargs: Any) -> Any:
+        raise WeaviateInvalidInputError(
+            "hybrid aggregations are not supported by the memory backend"
+        )
+
+
+def _aggregate(
+    data: CollectionData,
+    slots: np.ndarray,
+    group_by: Any,
+    total_count: bool,
+    return_metrics: Any,
+) -> Any:
+    if return_metrics is None:
+        metrics = []
+    elif isinstance(return_metrics, list):
+        metrics = return_metrics
+    else:
+        metrics = [return_metrics]
+    for metric in metrics:
+        if metric.property_name not in data.schema:
+            raise WeaviateQueryError(
+                f"no such prop with name '{metric.property_name}' found in class '{data.name}'",
+                "memory",
+            )
+
+    def _properties(group: Sequence[int]) -> Dict[str, Any]:
+        return {m.property_name: _metric(data, group, m) for m in metrics}
+
+    if group_by is None:
+        return AggregateReturn(
+            properties=_properties(slots),
+            total_count=len(slots) if total_count else None,
+        )
+
+    if isinstance(group_by, str):
+        group_by = GroupByAggregate(prop=group_by)
+    if group_by.prop not in data.schema:
+        raise WeaviateQueryError(
+            f"no such prop with name '{group_by.prop}' found in class '{data.name}'",
+            "memory",
+        )
+    groups: Dict[Any, List[int]] = {}
+    for slot in slots:
+        for value in _values(data, slot, group_by.prop):
+            groups.setdefault(value, []).append(int(slot))
+    # The largest groups first, like Weaviate
+    ordered = sorted(groups.items(), key=lambda item: -len(item[1]))
+    if group_by.limit is not None:
+        ordered = ordered[: group_by.limit]
+    return AggregateGroupByReturn(
+        groups=[
+            AggregateGroup(
+                grouped_by=GroupedBy(prop=group_by.prop, value=_gql_scalar(value)),
+                properties=_properties(group),
+                total_count=len(group) if total_count else None,
+            )
+            for value, group in ordered
+        ]
+    )
+
+
+def _values(data: CollectionData, slot: int, name: str) -> List[Any]:
+    value = data.properties[slot].get(name)
+    if value is None:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _metric(data: CollectionData, slots: Sequence[int], metric: Any) -> Any:
+    values = [v for slot in slots for v in _values(data, slot, metric.property_name)]
+    count = len(values) if metric.count else None
+    if isinstance(metric, _MetricsText):
+        occurrences = Counter(values).most_common(
+            metric.min_occurrences or TOP_OCCURRENCES_LIMIT
+        )
+        top = []
+        if metric.top_occurrences_count or metric.top_occurrences_value:
+            top = [
+                TopOccurrence(
+                    count=n if metric.top_occurrences_count else None,
+                    value=value if metric.top_occurrences_value else None,
+                )
+                for value, n in occurrences
+            ]
+        return AggregateText(count=count, top_occurrences=top)
+    if isinstance(metric, _MetricsBoolean):
+        total = len(values)
+        true = sum(1 for v in values if v)
+        false = total - true
+        return AggregateBoolean(
+            count=count,
+            percentage_false=false / total if metric.percentage_false and total else None,
+            percentage_true=true / total if metric.percentage_true and total else None,
+            total_false=false if metric.total_false else None,
+            total_true=true if metric.total_true else None,
+        )
+    ordered = sorted(values)
+    mode = Counter(values).most_common(1)[0][0] if values else None
+    median = ordered[len(ordered) // 2] if ordered else None
+    if isinstance(metric, _MetricsDate):
+        return AggregateDate(
+            count=count,
+            maximum=_gql_scalar(ordered[-1]) if metric.maximum and ordered else None,
+            median=_gql_scalar(median) if metric.median and ordered else None,
+            minimum=_gql_scalar(ordered[0]) if metric.minimum and ordered else None,
+            mode=_gql_scalar(mode) if metric.mode and ordered else None,
+        )
+    if isinstance(metric, (_MetricsInteger, _MetricsNumber)):
+        result = AggregateInteger if isinstance(metric, _MetricsInteger) else AggregateNumber
+        if ordered and len(ordered) % 2 == 0:
+            median = (ordered[len(ordered) // 2 - 1] + ordered[len(ordered) // 2]) / 2
+        return result(
+            count=count,
+            maximum=ordered[-1] if metric.maximum and ordered else None,
+            mean=float(np.mean(values)) if metric.mean and values else None,
+            median=float(median) if metric.median and ordered else None,
+            minimum=ordered[0] if metric.minimum and ordered else None,
+            mode=mode if metric.mode else None,
+            sum_=sum(values) if metric.sum_ and values else None,
+        )
+    raise WeaviateInvalidInputError(
+        f"Metrics {metric!r} are not supported by the memory backend"
+    )
+
+
+def _gql_scalar(value: Any) -> str:
+    # Aggregations return grouped values and dates as strings, formatted like GraphQL values
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.datetime):
+        utc = _as_datetime(value).astimezone(datetime.timezone.utc)
+        return utc.isoformat().replace("+00:00", "Z")
+    return str(value)
+
+
+class _Generate:
+    """
+    Grouped generation with an echo module: the generated text is the grouped task followed by
+    the grouped properties of each object, one line per object in the order of the results.
+    """
+
+    def __init__(self, collection: "MemoryCollection") -> None:
+        self._query = collection.query
+
+    def fetch_objects(
+        self,
+        single_prompt: Optional[str] = None,
+        grouped_task: Optional[str] = None,
+        grouped_properties: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> GenerativeReturn:
+        _check_single_prompt(single_prompt)
+        return _generated(self._query.fetch_objects(**kwargs), grouped_task, grouped_properties)
+
+    def hybrid(
+        self,
+        query: Optional[str],
+        single_prompt: Optional[str] = None,
+        grouped_task: Optional[str] = None,
+        grouped_properties: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> GenerativeReturn:
+        _check_single_prompt(single_prompt)
+        return _generated(self._query.hybrid(query, **kwargs), grouped_task, grouped_properties)
+
+    def __getattr__(self, name: str) -> Any:
+        raise WeaviateInvalidInputError(
+            f"generative {name} is not supported by the memory backend"
+        )
+
+
+def _check_single_prompt(single_prompt: Optional[str]) -> None:
+    if single_prompt is not None:
+        raise WeaviateInvalidInputError(
+            "single prompts are not supported by the memory backend"
+        )
+
+
+def _generated(
+    response: QueryReturn,
+    grouped_task: Optional[str],
+    grouped_properties: Optional[List[str]],
+) -> GenerativeReturn:
+    generated = None
+    if grouped_task is not None:
+        lines = [grouped_task]
+        for obj in response.objects:
+            names = grouped_properties or list(obj.properties)
+            lines.append(", ".join(f"{name}: {obj.properties.get(name)}" for name in names))
+        generated = "\n".join(lines)
+    objects = [
+        GenerativeObject(
+            uuid=obj.uuid,
+            metadata=obj.metadata,
+            properties=obj.properties,
+            references=obj.references,
+            vector=obj.vector,
+            collection=obj.collection,
+            generated=None,
+        )
+        for obj in response.objects
+    ]
+    return GenerativeReturn(objects=objects, generated=generated)
+
+
+class MemoryCollection:
+    """
+    The collection API of the memory backend, mirroring `weaviate.collections.Collection`.
+    """
+
+    def __init__(self, client: "MemoryClient", name: str) -> None:
+        self._client = client
+        self.name = _capitalize(name)
+        self.query = _Query(self)
+        self.config = _Config(self)
+        self.data = _Data(self)
+        self.batch = _Batch(self)
+        self.aggregate = _Aggregate(self)
+        self.generate = _Generate(self)
+
+    def iterator(
+        self,
+        include_vector: Any = False,
+        return_metadata: Any = None,
+        return_properties: Optional[Sequence[Any]] = None,
+        cache_size: Optional[int] = None,
+    ) -> Iterator[Object]:
+        after = None
+        while True:
+            page = self.query.fetch_objects(
+                limit=cache_size or 100,
+                after=after,
+                include_vector=include_vector,
+                return_metadata=return_metadata,
+                return_properties=return_properties,
+            ).objects
+            if not page:
+                return
+            yield from page
+            after = page[-1].uuid
+
+    def __len__(self) -> int:
+        return len(self._data().slots)
+
+    def _data(self) -> CollectionData:
+        self._client._check_connected()
+        return self._client._database.get(self.name)
+
+
+class _Collections:
+    def __init__(self, client: "MemoryClient") -> None:
+        self._client = client
+
+    def create(
+        self, name: str, properties: Optional[Sequence[Any]] = None, **kwargs: Any
+    ) -> MemoryCollection:
+        self._client._check_connected()
+        self._client._database.create(name, properties or ())
+        return MemoryCollection(self._client, name)
+
+    def get(self, name: str, **kwargs: Any) -> MemoryCollection:
+        return MemoryCollection(self._client, name)
+
+    def exists(self, name: str) -> bool:
+        return _capitalize(name) in self._client._database.collections
+
+    def delete(self, name: Any) -> None:
+        names = [name] if isinstance(name, str) else name
+        with self._client._database.lock:
+            for n in names:
+                self._client._database.collections.pop(_capitalize(n), None)
+
+    def delete_all(self) -> None:
+        with self._client._database.lock:
+            self._client._database.collections.clear()
+
+    def list_all(self, simple: bool = True) -> Dict[str, MemoryCollectionConfig]:
+        return {
+            name: data.config()
+            for name, data in self._client._database.collections.items()
+        }
+
+
+class MemoryClient:
+    """
+    A client of an in-process database, mirroring the parts of `weaviate.WeaviateClient` used by the connection.
+    """
+
+    def __init__(self, database: MemoryDatabase) -> None:
+        self._database = database
+        self._connected = False
+        self.collections = _Collections(self)
+
+    def connect(self) -> None:
+        self._connected = True
+
+    def close(self) -> None:
+        self._connected = False
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def is_live(self) -> bool:
+        return self._connected
+
+    def is_ready(self) -> bool:
+        return self._connected
+
+    def graphql_raw_query(self, gql_query: str) -> _RawGQLReturn:
+        """
+        Run a GraphQL `Get` query, with `limit`, `offset`, `after`, `where`, `bm25`, `hybrid` and `nearVector` arguments.
+        """
+        self._check_connected()
+        try:
+            document = _GraphQLParser(gql_query).parse()
+            get = {}
+            for name, selection in document.items():
+                if name != "Get":
+                    raise WeaviateInvalidInputError(
+                        f'Cannot query field "{name}" on type "WeaviateObject"'
+                    )
+                for collection_name, (args, fields) in (selection[1] or {}).items():
+                    get[collection_name] = self._gql_get(collection_name, args, fields)
+        except (WeaviateInvalidInputError, WeaviateQueryError) as e:
+            return _RawGQLReturn(aggregate={}, explore={}, get={}, errors=[{"message": e.message}])
+        return _RawGQLReturn(aggregate={}, explore={}, get=get, errors=None)
+
+    def __enter__(self) -> "MemoryClient":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _check_connected(self) -> None:
+        if not self._connected:
+            raise WeaviateClosedClientError()
+
+    def _gql_get(
+        self, collection_name: str, args: Dict[str, Any], fields: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        collection = self.collections.get(collection_name)
+        additional = (fields.get("_additional") or (None, None))[1] or {}
+        properties = [name for name in fields if name != "_additional"]
+        metadata = set()
+        if "score" in additional or "explainScore" in additional:
+            metadata |= {"score", "explain_score"}
+        if "distance" in additional or "certainty" in additional:
+            metadata |= {"distance", "certainty"}
+        if "creationTimeUnix" in additional or "lastUpdateTimeUnix" in additional:
+            metadata |= {"creation_time", "last_update_time"}
+        include_vector: Any = "vector" in additional
+        if "vectors" in additional:
+            include_vector = True
+        common = dict(
+            limit=args.get("limit"),
+            offset=args.get("offset"),
+            filters=_gql_filters(args["where"]) if "where" in args else None,
+            include_vector=include_vector,
+            return_metadata=list(metadata),
+            return_properties=properties,
+        )
+        if "bm25" in args:
+            response = collection.query.bm25(
+                args["bm25"].get("query"),
+                query_properties=args["bm25"].get("properties"),
+                **common,
+            )
+        elif "hybrid" in args:
+            hybrid = args["hybrid"]
+            response = collection.query.hybrid(
+                hybrid.get("query"),
+                alpha=hybrid.get("alpha", 0.75),
+                vector=hybrid.get("vector"),
+                query_properties=hybrid.get("properties"),
+                **common,
+            )
+        elif "nearVector" in args:
+            response = collection.query.near_vector(
+                args["nearVector"]["vector"],
+                distance=args["nearVector"].get("distance"),
+                certainty=args["nearVector"].get("certainty"),
+                **common,
+            )
+        else:
+            response = collection.query.fetch_objects(
+                after=args.get("after"), **common
+            )
+
+        rows = []
+        for obj in response.objects:
+            row = {name: _gql_value(obj.properties.get(name), fields[name][1]) for name in properties}
+            if additional:
+                row["_additional"] = _gql_additional(obj, additional)
+            rows.append(row)
+        return rows
+
+
+def _gql_value(value: Any, selection: Optional[Dict[str, Any]]) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, uuid_package.UUID):
+        return str(value)
+    if selection and isinstance(value, dict):
+        return {k: _gql_value(value.get(k), s[1]) for k, s in selection.items()}
+    return value
+
+
+def _gql_additional(obj: Object, fields: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = obj.metadata
+    values = {
+        "id": str(obj.uuid),
+        "score": None if metadata.score is None else str(metadata.score),
+        "explainScore": metadata.explain_score,
+        "distance": metadata.distance,
+        "certainty": metadata.certainty,
+        "vector": (obj.vector or {}).get("default"),
+        "creationTimeUnix": None
+        if metadata.creation_time is None
+        else str(int(metadata.creation_time.timestamp() * 1000)),
+        "lastUpdateTimeUnix": None
+        if metadata.last_update_time is None
+        else str(int(metadata.last_update_time.timestamp() * 1000)),
+    }
+    additional = {}
+    for name, (_, selection) in fields.items():
+        if name == "vectors":
+            additional[name] = {
+                n: v for n, v in (obj.vector or {}).items() if not selection or n in selection
+            }
+        else:
+            additional[name] = values.get(name)
+    return additional
+
+
+_GQL_OPERATORS = {
+    "Equal": "equal",
+    "NotEqual": "not_equal",
+    "GreaterThan": "greater_than",
+    "GreaterThanEqual": "greater_or_equal",
+    "LessThan": "less_than",
+    "LessThanEqual": "less_or_equal",
+    "Like": "like",
+    "IsNull": "is_none",
+    "ContainsAny": "contains_any",
+    "ContainsAll": "contains_all",
+}
+
+
+def _gql_filters(where: Dict[str, Any]) -> _Filters:
+    operator = where.get("operator")
+    if operator in ("And", "Or"):
+        operands = [_gql_filters(w) for w in where.get("operands", [])]
+        return Filter.all_of(operands) if operator == "And" else Filter.any_of(operands)
+    method = _GQL_OPERATORS.get(operator)
+    if method is None:
+        raise WeaviateInvalidInputError(f"Unsupported where operator {operator}")
+    values = [v for k, v in where.items() if k.startswith("value")]
+    if not values:
+        raise WeaviateInvalidInputError(f"The where filter {where} has no value")
+    path = where.get("path") or []
+    target = path[-1] if isinstance(path, list) else path
+    if target == "id":
+        return getattr(Filter.by_id(), method)(values[0])
+    return getattr(Filter.by_property(target), method)(values[0])
+
+
+_GQL_TOKEN = re.compile(
+    r'\s*(?:(?P<string>"(?:\\.|[^"\\])*")|(?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+    r"|(?P<name>[_A-Za-z][_0-9A-Za-z]*)|(?P<punct>[{}()\[\]:,])|(?P<comment>#[^\n]*))"
+)
+
+
+class _GraphQLParser:
+    """
+    Parse the selection sets and arguments of a GraphQL query into nested dictionaries.
+
+    Each field maps to an `(arguments, selection)` tuple, where `selection` is None for leaf fields.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = _GQL_TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                if text[position:].strip():
+                    raise WeaviateInvalidInputError(
+                        f"Syntax Error: Unexpected character {text[position]!r}"
+                    )
+                break
+            position = match.end()
+            kind = match.lastgroup
+            if kind != "comment":
+                self.tokens.append((kind, match.group(kind)))
+        self.position = 0
+
+    def parse(self) -> Dict[str, Any]:
+        if self._peek() == ("name", "query") or self._peek() == ("name", "Query"):
+            self.position += 1
+        selection = self._selection()
+        if self.position != len(self.tokens):
+            raise WeaviateInvalidInputError("Syntax Error: Unexpected token after the query")
+        return selection
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise WeaviateInvalidInputError("Syntax Error: Unexpected end of the query")
+        self.position += 1
+        return token
+
+    def _expect(self, value: str) -> None:
+        token = self._next()
+        if token[1] != value:
+            raise WeaviateInvalidInputError(
+                f"Syntax Error: Expected {value!r}, found {token[1]!r}"
+            )
+
+    def _selection(self) -> Dict[str, Any]:
+        self._expect("{")
+        fields = {}
+        while self._peek() is not None and self._peek()[1] != "}":
+            kind, name = self._next()
+            if kind != "name":
+                raise WeaviateInvalidInputError(f"Syntax Error: Unexpected {name!r}")
+            args = {}
+            if self._peek() is not None and self._peek()[1] == "(":
+                args = self._arguments()
+            selection = None
+            if self._peek() is not None and self._peek()[1] == "{":
+                selection = self._selection()
+            fields[name] = (args, selection)
+            if self._peek() is not None and self._peek()[1] == ",":
+                self.position += 1
+        self._expect("}")
+        return fields
+
+    def _arguments(self) -> Dict[str, Any]:
+        self._expect("(")
+        args = self._pairs(")")
+        return args
+
+    def _pairs(self, end: str) -> Dict[str, Any]:
+        pairs = {}
+        while self._peek() is not None and self._peek()[1] != end:
+            kind, name = self._next()
+            if kind != "name":
+                raise WeaviateInvalidInputError(f"Syntax Error: Unexpected {name!r}")
+            self._expect(":")
+            pairs[name] = self._value()
+            if self._peek() is not None and self._peek()[1] == ",":
+                self.position += 1
+        self._expect(end)
+        return pairs
+
+    def _value(self) -> Any:
+        kind, value = self._next()
+        if kind == "string":
+            return value[1:-1].encode("utf-8").decode("unicode_escape")
+        if kind == "number":
+            number = float(value)
+            return int(number) if number.is_integer() and "." not in value and "e" not in value.lower() else number
+        if value == "{":
+            return self._pairs("}")
+        if value == "[":
+            items = []
+            while self._peek() is not None and self._peek()[1] != "]":
+                items.append(self._value())
+                if self._peek() is not None and self._peek()[1] == ",":
+                    self.position += 1
+            self._expect("]")
+            return items
+        if kind == "name":
+            return {"true": True, "false": False, "null": None}.get(value, value)
+        raise WeaviateInvalidInputError(f"Syntax Error: Unexpected {value!r}")
+
+
+class _AsyncQuery:
+    def __init__(self, query: _Query) -> None:
+        self._query = query
+
+    async def fetch_objects(self, *args: Any, **kwargs: Any) -> QueryReturn:
+        return self._query.fetch_objects(*args, **kwargs)
+
+    async def bm25(self, *args: Any, **kwargs: Any) -> QueryReturn:
+        return self._query.bm25(*args, **kwargs)
+
+    async def near_vector(self, *args: Any, **kwargs: Any) -> QueryReturn:
+        return self._query.near_vector(*args, **kwargs)
+
+    async def hybrid(self, *args: Any, **kwargs: Any) -> QueryReturn:
+        return self._query.hybrid(*args, **kwargs)
+
+
+class _AsyncConfig:
+    def __init__(self, config: _Config) -> None:
+        self._config = config
+
+    async def get(self, simple: bool = False) -> MemoryCollectionConfig:
+        return self._config.get(simple)
+
+
+class MemoryAsyncCollection:
+    def __init__(self, collection: MemoryCollection) -> None:
+        self.name = collection.name
+        self.query = _AsyncQuery(collection.query)
+        self.config = _AsyncConfig(collection.config)
+
+
+class _AsyncCollections:
+    def __init__(self, client: "MemoryAsyncClient") -> None:
+        self._client = client
+
+    def get(self, name: str, **kwargs: Any) -> MemoryAsyncCollection:
+        return MemoryAsyncCollection(self._client._client.collections.get(name))
+
+
+class MemoryAsyncClient:
+    """
+    An async client of an in-process database, mirroring `weaviate.WeaviateAsyncClient`.
+    """
+
+    def __init__(self, database: MemoryDatabase) -> None:
+        self._client = MemoryClient(database)
+        self.collections = _AsyncCollections(self)
+
+    async def connect(self) -> None:
+        self._client.connect()
+
+    async def close(self) -> None:
+        self._client.close()
+
+    def is_connected(self) -> bool:
+        return self._client.is_connected()
+
+    async def is_live(self) -> bool:
+        return self._client.is_live()
+
+    async def graphql_raw_query(self, gql_query: str) -> _RawGQLReturn:
+        return self._client.graphql_raw_query(gql_query)
@@ -0,0 +1,142 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Fetches `limit` results of a query starting at `offset`
+PageFetcher = Callable[[int, int], Any]
+
+
+class QueryPages:
+    """
+    The results of a hybrid query, fetched one page at a time, e.g. for a "Show more" button.
+
+    Each call to `next_page` only requests the objects after those already fetched, using
+    the `offset` of the hybrid query. Rows already fetched are never fetched or converted again,
+    so every request costs the same. The new pages are appended to `df` when it is next read,
+    which copies the rows fetched so far once. Keep the handle in `st.session_state` to extend
+    it across reruns:
+
+    ```python
+    if "pages" not in st.session_state:
+        st.session_state.pages = conn.query("MovieDemo", "space", limit=20, paginate=True)
+    pages = st.session_state.pages
+    st.dataframe(pages.df)
+    if not pages.exhausted and st.button("Show more"):
+        pages.next_page()
+        st.rerun()
+    ```
+    """
+
+    def __init__(
+        self, collection_name: str, page_size: int, fetch: PageFetcher
+    ) -> None:
+        """
+        Initialize the handle, without fetching any page.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the queried collection.
+        page_size : int
+            The default number of results of a page.
+        fetch : Callable[[int, int], Any]
+            Runs the query with an offset and a limit, and returns its result.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.collection_name = collection_name
+        self.page_size = page_size
+        self.exhausted = False
+        self._fetch = fetch
+        # The pages fetched since `df` was last read
+        self._pending: List[Any] = []
+        self._rows = 0
+        self._result: Any = None
+        self._lock = threading.Lock()
+
+    def next_page(self, n: Optional[int] = None) -> Any:
+        """
+        Fetch the next `n` results, append them to `df`, and return them.
+
+        Parameters
+        ----------
+        n : int, optional
+            The number of results to fetch. Default: `page_size`.
+
+        Returns
+        -------
+        The new results, in the type of `df`, or None if there are no more results.
+        """
+        n = self.page_size if n is None else n
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        with self._lock:
+            if self.exhausted:
+                return None
+            page = self._fetch(self._rows, n)
+            rows = _num_rows(page)
+            # A short page is the last one
+            self.exhausted = rows < n
+            if rows:
+                self._pending.append(page)
+                self._rows += rows
+            return page if rows else None
+
+    @property
+    def df(self) -> Any:
+        """
+        All the results fetched so far, in ranking order: a DataFrame, or a `(df, vectors)` tuple
+        with `vector_format="matrix"`. None if the query has no results.
+        """
+        with self._lock:
+            if self._pending:
+                pages = self._pending
+                if self._result is not None:
+                    pages = [self._result, *pages]
+                self._result = _concat(pages)
+                self._pending = []
+            return self._result
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._rows
+
+    def __repr__(self) -> str:
+        return f"QueryPages({self.collection_name!r}, rows={self._rows}, exhausted={self.exhausted})"
+
+
+def _num_rows(page: Any) -> int:
+    if page is None:
+        return 0
+    if isinstance(page, tuple):
+        # An empty page of vector matrices is `(None, {})`
+        return 0 if page[0] is None else len(page[0])
+    return len(page)
+
+
+def _concat(pages: List[Any]) -> Any:
+    if len(pages) == 1:
+        return pages[0]
+    if not isinstance(pages[0], tuple):
+        return pd.concat(pages, ignore_index=True)
+    df = pd.concat([page.df for page in pages], ignore_index=True)
+    return pages[0]._replace(df=df, vectors=_concat_matrices(pages))
+
+
+def _concat_matrices(pages: List[Any]) -> Dict[str, np.ndarray]:
+    names = dict.fromkeys(name for page in pages for name in page.vectors)
+    vectors = {}
+    for name in names:
+        dim = next(page.vectors[name].shape[1] for page in pages if name in page.vectors)
+        # Pages without a vector get NaN rows, like objects without a vector
+        matrix = np.concatenate(
+            [
+                page.vectors.get(name, np.full((len(page.df), dim), np.nan, np.float32))
+                for page in pages
+            ]
+        )
+        matrix.setflags(write=False)
+        vectors[name] = matrix
+    return vectors
@@ -0,0 +1,218 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+from weaviate.collections.classes.filters import _Filters
+
+from .cache import CacheKeyTemplate, serialize_all_of, serialize_key_part
+from .dataframes import Schema
+from .filters import filter_properties
+
+# Binds the value of a query parameter to a filter, e.g. `Filter.by_property("year").greater_than`
+FilterParam = Callable[[Any], _Filters]
+
+_SEARCHABLE_TYPES = {DataType.TEXT, DataType.TEXT_ARRAY}
+
+
+class PreparedQuery:
+    """
+    A hybrid query on a collection, validated once and called with only the parameters that vary.
+
+    Call it with the query text, and optionally `limit`, `alpha` and the values of its filter parameters:
+
+    ```python
+    search = conn.prepare(
+        "MovieDemo",
+        return_properties=["title", "release_year"],
+        filter_params={"min_year": WeaviateFilter.by_property("release_year").greater_or_equal},
+    )
+    df = search("space adventure", limit=5, min_year=1990)
+    ```
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        hybrid_kwargs: Dict[str, Any],
+        filter_params: Dict[str, FilterParam],
+        key_template: CacheKeyTemplate,
+        run: Callable[[Dict[str, Any], str], Any],
+    ) -> None:
+        """
+        Initialize the prepared query.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the queried collection.
+        hybrid_kwargs : Dict[str, Any]
+            The validated arguments of the hybrid query, including the static filters.
+        filter_params : Dict[str, Callable[[Any], Filter]]
+            The filter of each named parameter, built from its value on each call.
+        key_template : CacheKeyTemplate
+            Builds the cache key of the arguments of a call, created with `hybrid_kwargs`.
+        run : Callable[[Dict[str, Any], str], Any]
+            Runs the hybrid query with the arguments of a call and their cache key, and returns its result.
+        """
+        self.collection_name = collection_name
+        self.filter_params = dict(filter_params)
+        self._hybrid_kwargs = hybrid_kwargs
+        self._key_template = key_template
+        self._run = run
+        # The static filters and their cache key part are combined with the parameter filters on each call
+        self._static = hybrid_kwargs["filters"]
+        self._static_part = key_template.part("filters")
+
+    def __call__(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        alpha: Optional[float] = None,
+        **params: Any,
+    ) -> Any:
+        """
+        Run the query.
+
+        Parameters
+        ----------
+        query : str
+            The query to search for.
+        limit : int, optional
+            The number of results to return. Default: the limit given to `prepare`.
+        alpha : float, optional
+            The weight of the semantic search part of the query. Default: the alpha given to `prepare`.
+        **params
+            The values of the filter parameters. Parameters that are not given, or None, are not applied.
+        """
+        kwargs = dict(self._hybrid_kwargs, query=query)
+        if limit is not None:
+            kwargs["limit"] = _check_limit(limit)
+        if alpha is not None:
+            kwargs["alpha"] = _check_alpha(alpha)
+        if not params:
+            return self._run(kwargs, self._key_template.key(kwargs))
+        filters = self._param_filters(params)
+        if not filters:
+            return self._run(kwargs, self._key_template.key(kwargs))
+        parts = [serialize_key_part(f) for f in filters]
+        if self._static is not None:
+            filters.insert(0, self._static)
+            parts.insert(0, self._static_part)
+        if len(filters) == 1:
+            kwargs["filters"] = filters[0]
+            return self._run(kwargs, self._key_template.key(kwargs, filters=parts[0]))
+        kwargs["filters"] = Filter.all_of(filters)
+        key = self._key_template.key(kwargs, filters=serialize_all_of(parts))
+        return self._run(kwargs, key)
+
+    def _param_filters(self, params: Dict[str, Any]) -> List[_Filters]:
+        unknown = set(params) - set(self.filter_params)
+        if unknown:
+            raise TypeError(
+                f"Unknown query parameters {sorted(unknown)}, expected some of {sorted(self.filter_params)}"
+            )
+        return [
+            self.filter_params[name](value)
+            for name, value in params.items()
+            if value is not None
+        ]
+
+    def __repr__(self) -> str:
+        return f"PreparedQuery({self.collection_name!r}, params={sorted(self.filter_params)})"
+
+
+def validate_query(
+    collection_name: str,
+    schema: Schema,
+    vector_names: Optional[Sequence[str]],
+    hybrid_kwargs: Dict[str, Any],
+    filter_params: Dict[str, FilterParam],
+) -> None:
+    """
+    Check the property and vector names of a hybrid query against the schema of its collection.
+
+    Parameters
+    ----------
+    vector_names : List[str], optional
+        The named vectors of the collection, or None if it has a single unnamed vector.
+
+    Raises
+    ------
+    ValueError
+        If a property does not exist, a query property is not a text property,
+        or a target vector does not exist.
+    """
+    _check_limit(hybrid_kwargs["limit"])
+    _check_alpha(hybrid_kwargs["alpha"])
+    compared = filter_properties(hybrid_kwargs["filters"])
+    for name, param in filter_params.items():
+        if not callable(param):
+            raise ValueError(f"Filter parameter {name!r} is not callable")
+        compared |= _param_properties(param)
+    # Collections created by auto-schema may not have properties yet
+    if schema:
+        _check_names(
+            collection_name,
+            schema,
+            "return properties",
+            hybrid_kwargs["return_properties"] or [],
+        )
+        _check_names(collection_name, schema, "filter properties", sorted(compared))
+        query_properties = [
+            name.split("^")[0] for name in hybrid_kwargs["query_properties"] or []
+        ]
+        _check_names(collection_name, schema, "query properties", query_properties)
+        not_searchable = [
+            name for name in query_properties if schema[name] not in _SEARCHABLE_TYPES
+        ]
+        if not_searchable:
+            raise ValueError(
+                f"The query properties {not_searchable} of {collection_name} are not text properties"
+            )
+    targets = _target_names(hybrid_kwargs["target_vector"])
+    if targets and vector_names is not None:
+        unknown = [name for name in targets if name not in vector_names]
+        if unknown:
+            raise ValueError(
+                f"{collection_name} has no target vectors {unknown}, expected some of {sorted(vector_names)}"
+            )
+
+
+def _check_names(
+    collection_name: str, schema: Schema, kind: str, names: Sequence[str]
+) -> None:
+    unknown = [name for name in names if name not in schema]
+    if unknown:
+        raise ValueError(
+            f"{collection_name} has no {kind} {unknown}, expected some of {sorted(schema)}"
+        )
+
+
+def _check_limit(limit: int) -> int:
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    return limit
+
+
+def _check_alpha(alpha: float) -> float:
+    if not 0 <= alpha <= 1:
+        raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+    return alpha
+
+
+def _param_properties(param: FilterParam) -> Set[str]:
+    # Bound methods of `Filter.by_property(name)` keep the name of their property
+    name = getattr(getattr(param, "__self__", None), "_property", None)
+    if isinstance(name, str) and not name.startswith("_"):
+        return {name}
+    return set()
+
+
+def _target_names(target_vectors: Any) -> List[str]:
+    if target_vectors is None:
+        return []
+    if isinstance(target_vectors, str):
+        return [target_vectors]
+    if hasattr(target_vectors, "target_vectors"):
+        return list(target_vectors.target_vectors)
+    return list(target_vectors)
@@ -0,0 +1,259 @@
+import re
+from collections import namedtuple
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dataframes import ADDITIONAL_PREFIX
+
+SCORE_COLUMN = ADDITIONAL_PREFIX + "score"
+EXPLAIN_SCORE_COLUMN = ADDITIONAL_PREFIX + "explain_score"
+
+# The over-fetched results of a hybrid query, in ranking order: the rows with their metadata columns,
+# the current score of each row, a read-only float32 matrix per vector name, and the alpha of the query
+Candidates = namedtuple("Candidates", ["df", "scores", "vectors", "alpha"])
+
+# Reorders candidates. It receives the candidates and the number of results to return,
+# and returns the candidates in the new order, with at least that many rows first
+Reranker = Callable[[Candidates, int], Candidates]
+
+_EXPLAIN_PART = re.compile(
+    r"Hybrid \(Result Set (?P<set>[^,)]*)[^)]*\) Document \S+: "
+    r"original score (?P<original>\S+), normalized score: (?P<normalized>\S+)"
+)
+
+
+def parse_explain_scores(explain_scores: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Extract the keyword and vector parts of hybrid scores from their explanations.
+
+    Returns
+    -------
+    np.ndarray
+        A float64 array of shape `(n, 4)` holding, for each row, the original and the weighted
+        normalized score of the keyword search, then those of the vector search.
+        Parts missing from an explanation are NaN.
+    """
+    parts = np.full((len(explain_scores), 4), np.nan)
+    for i, explain in enumerate(explain_scores):
+        for match in _EXPLAIN_PART.finditer(explain or ""):
+            column = 0 if match.group("set") == "keyword" else 2
+            try:
+                parts[i, column] = float(match.group("original"))
+                parts[i, column + 1] = float(match.group("normalized"))
+            except ValueError:
+                continue
+    return parts
+
+
+def take(
+    candidates: Candidates, order: np.ndarray, scores: Optional[np.ndarray] = None
+) -> Candidates:
+    """
+    Return the candidates in the order of the row positions `order`, optionally with new scores.
+    """
+    order = np.asarray(order, dtype=np.intp)
+    vectors = {}
+    for name, matrix in candidates.vectors.items():
+        vectors[name] = matrix[order]
+        vectors[name].setflags(write=False)
+    return Candidates(
+        candidates.df.iloc[order].reset_index(drop=True),
+        (candidates.scores if scores is None else scores)[order],
+        vectors,
+        candidates.alpha,
+    )
+
+
+def _rank(candidates: Candidates, scores: np.ndarray) -> Candidates:
+    # A stable sort keeps the server ranking between equal scores
+    order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")
+    return take(candidates, order, scores)
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    present = ~np.isnan(values)
+    if not present.any():
+        return np.zeros(len(values))
+    low, high = values[present].min(), values[present].max()
+    if high == low:
+        return np.where(present, 1.0, 0.0)
+    return np.where(present, (values - low) / (high - low), 0.0)
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.nan_to_num(matrix.astype(np.float32, copy=False))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class Remix:
+    """
+    Re-weight the keyword and vector parts of the hybrid scores at a new alpha, without querying again.
+
+    The parts are read from the explanation of each score, which the server computes with relative
+    score fusion: each part is normalized to [0, 1] over its result set, then weighted by `1 - alpha`
+    or `alpha`. A part weighted by 0 at the alpha of the query is normalized again from the original
+    scores of the candidates. Objects outside of the candidates are not considered, so fetch enough
+    candidates for the range of alphas, with an alpha between 0 and 1 exclusive.
+    """
+
+    def __init__(self, alpha: float) -> None:
+        """
+        Initialize the stage.
+
+        Parameters
+        ----------
+        alpha : float
+            The new weight of the vector search part of the scores, between 0 and 1.
+        """
+        if not 0 <= alpha <= 1:
+            raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+        self.alpha = alpha
+
+    def __call__(self, candidates: Candidates, limit: int) -> Candidates:
+        if EXPLAIN_SCORE_COLUMN not in candidates.df.columns:
+            raise ValueError("Remix requires the explain scores of the candidates")
+        parts = parse_explain_scores(candidates.df[EXPLAIN_SCORE_COLUMN].tolist())
+        keyword = self._normalized(parts[:, 0], parts[:, 1], 1 - candidates.alpha)
+        vector = self._normalized(parts[:, 2], parts[:, 3], candidates.alpha)
+        return _rank(candidates, (1 - self.alpha) * keyword + self.alpha * vector)
+
+    @staticmethod
+    def _normalized(original: np.ndarray, weighted: np.ndarray, weight: float) -> np.ndarray:
+        if weight > 0 and not np.isnan(weighted).all():
+            # Objects missing from a result set have a normalized score of 0 in it
+            return np.nan_to_num(weighted / weight)
+        return _min_max(original)
+
+    def __repr__(self) -> str:
+        return f"Remix(alpha={self.alpha})"
+
+
+class MMR:
+    """
+    Diversify the results with maximal marginal relevance.
+
+    Results are picked one at a time, each maximizing `(1 - diversity) * relevance - diversity * similarity`,
+    where relevance is the score of a candidate scaled to [0, 1] and similarity is its highest cosine
+    similarity to the results already picked. The picked results come first, followed by the other
+    candidates in score order.
+    """
+
+    def __init__(self, diversity: float = 0.5, vector: Optional[str] = None) -> None:
+        """
+        Initialize the stage.
+
+        Parameters
+        ----------
+        diversity : float, optional
+            The weight of the diversity of the results, between 0 (rank by score only) and 1. Default: 0.5.
+        vector : str, optional
+            The name of the vector to compare, `default` being the unnamed vector.
+            Default: the only vector of the candidates.
+        """
+        if not 0 <= diversity <= 1:
+            raise ValueError(f"diversity must be between 0 and 1, got {diversity}")
+        self.diversity = diversity
+        self.vector = vector
+
+    def __call__(self, candidates: Candidates, limit: int) -> Candidates:
+        n = len(candidates.scores)
+        if n == 0:
+            return candidates
+        matrix = _unit_rows(self._matrix(candidates))
+        relevance = (1 - self.diversity) * _min_max(candidates.scores)
+        # The highest similarity of each candidate to the picked ones
+        similarity = np.full(n, -np.inf)
+        available = np.ones(n, dtype=bool)
+        picked = []
+        for _ in range(min(limit, n)):
+            marginal = np.where(
+                available, relevance - self.diversity * np.maximum(similarity, 0), -np.inf
+            )
+            best = int(np.argmax(marginal))
+            picked.append(best)
+            available[best] = False
+            similarity = np.maximum(similarity, matrix @ matrix[best])
+        rest = np.flatnonzero(available)
+        return take(candidates, np.concatenate([picked, rest]).astype(np.intp))
+
+    def _matrix(self, candidates: Candidates) -> np.ndarray:
+        if self.vector is not None:
+            if self.vector not in candidates.vectors:
+                raise ValueError(
+                    f"MMR vector {self.vector!r} is not among the vectors of the candidates: {sorted(candidates.vectors)}"
+                )
+            return candidates.vectors[self.vector]
+        if len(candidates.vectors) != 1:
+            raise ValueError(
+                f"MMR requires a vector name among the vectors of the candidates: {sorted(candidates.vectors)}"
+            )
+        return next(iter(candidates.vectors.values()))
+
+    def __repr__(self) -> str:
+        return f"MMR(diversity={self.diversity}, vector={self.vector!r})"
+
+
+class Scorer:
+    """
+    Rank the candidates by the scores of a function, e.g. a popularity boost or a cross-encoder.
+
+    ```python
+    boost = Scorer(lambda c: c.scores + 0.1 * np.log1p(c.df["vote_count"].to_numpy()))
+    ```
+    """
+
+    def __init__(self, score: Callable[[Candidates], Any]) -> None:
+        """
+        Initialize the stage.
+
+        Parameters
+        ----------
+        score : Callable[[Candidates], array-like]
+            Returns the new score of each candidate, aligned with the rows of `candidates.df`.
+        """
+        self.score = score
+
+    def __call__(self, candidates: Candidates, limit: int) -> Candidates:
+        scores = np.asarray(self.score(candidates), dtype=np.float64)
+        if scores.shape != candidates.scores.shape:
+            raise ValueError(
+                f"The scorer returned {scores.shape[0] if scores.ndim else 1} scores for {len(candidates.scores)} candidates"
+            )
+        return _rank(candidates, scores)
+
+    def __repr__(self) -> str:
+        return f"Scorer({self.score!r})"
+
+
+def needs_vectors(rerankers: Sequence[Reranker]) -> bool:
+    """
+    Return whether any of the rerankers compares vectors.
+    """
+    return any(isinstance(reranker, MMR) for reranker in rerankers)
+
+
+def rerank(
+    df: Optional[pd.DataFrame],
+    vectors: Dict[str, np.ndarray],
+    alpha: float,
+    rerankers: Sequence[Reranker],
+    limit: int,
+) -> Tuple[Optional[pd.DataFrame], Dict[str, np.ndarray]]:
+    """
+    Apply the rerankers to candidates in turn, and return the top `limit` rows and their vectors.
+
+    The `_additional.score` column of the result holds the scores of the last reranker that changed them.
+    """
+    if df is None or df.empty:
+        return df, vectors
+    scores = df[SCORE_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan)
+    candidates = Candidates(df.reset_index(drop=True), scores, vectors, alpha)
+    for reranker in rerankers:
+        candidates = reranker(candidates, limit)
+    top = take(candidates, np.arange(min(limit, len(candidates.scores))))
+    df = top.df.copy()
+    df[SCORE_COLUMN] = top.scores
+    return df, top.vectors
@@ -0,0 +1,291 @@
+import contextvars
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+import numpy as np
+from weaviate.client import WeaviateClient
+from weaviate.exceptions import WeaviateConnectionError
+
+from .lifecycle import CONNECTION_ERRORS, ConnectionManager
+from .stats import annotate
+
+T = TypeVar("T")
+
+EndpointInfo = namedtuple(
+    "EndpointInfo",
+    ["url", "healthy", "latency_ewma", "outstanding", "requests", "failures"],
+)
+
+# The number of recent request latencies the hedging threshold is computed from
+LATENCY_WINDOW = 256
+
+
+class NoHealthyEndpointError(WeaviateConnectionError):
+    """
+    Raised when a request failed with a connection error on every endpoint.
+    """
+
+
+class Endpoint:
+    """
+    The connection and the observed latency and load of one Weaviate endpoint.
+    """
+
+    def __init__(self, url: str, manager: ConnectionManager) -> None:
+        self.url = url
+        self.manager = manager
+        self.latency_ewma: Optional[float] = None
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+
+class EndpointRouter:
+    """
+    Route read requests across endpoints by observed latency and load, with failover and hedging.
+
+    Each request goes to the healthy endpoint with the lowest latency EWMA multiplied by its
+    number of outstanding requests plus one, so that slow or busy endpoints get less traffic and
+    endpoints without measurements are tried first. An endpoint that fails with a connection error
+    is ejected for `eject_seconds`, doubling with each consecutive failure, and the request fails
+    over to the next endpoint. Once its ejection expires, the endpoint is probed for liveness before
+    it gets traffic again.
+
+    With `hedge_percentile`, a request that has not completed after that percentile of the recent
+    latencies is also sent to a second endpoint, and the first successful response is returned.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        ewma_alpha: float = 0.3,
+        eject_seconds: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Parameters
+        ----------
+        endpoints : List[Endpoint]
+            The endpoints to route to. The first one is the primary endpoint.
+        ewma_alpha : float, optional
+            The weight of the latest latency in the moving average of each endpoint. Default: 0.3.
+        eject_seconds : float, optional
+            How long an endpoint is ejected after its first connection error. Default: 30.
+        hedge_percentile : float, optional
+            The percentile of the recent latencies, between 0 and 1, after which a request is
+            hedged to a second endpoint, e.g. 0.95. If None, requests are not hedged. Default: None.
+        hedge_min_samples : int, optional
+            The number of latencies to observe before hedging. Default: 20.
+        """
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise ValueError("hedge_percentile must be between 0 and 1")
+        self.endpoints = list(endpoints)
+        self.ewma_alpha = ewma_alpha
+        self.eject_seconds = eject_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedges = 0
+        self._latencies: "deque[float]" = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def call(self, fn: Callable[[WeaviateClient], T]) -> T:
+        """
+        Run a read request on the best endpoint, failing over on connection errors.
+
+        Parameters
+        ----------
+        fn : Callable[[WeaviateClient], T]
+            The request, called with the connected client of an endpoint.
+
+        Raises
+        ------
+        NoHealthyEndpointError
+            If the request failed with a connection error on every endpoint.
+        """
+        if len(self.endpoints) == 1:
+            return self._run(self.endpoints[0], fn)
+        threshold = self._hedge_threshold()
+        if threshold is not None:
+            return self._hedged(fn, threshold)
+
+        tried: List[Endpoint] = []
+        while True:
+            endpoint = self._pick(tried)
+            if endpoint is None:
+                raise NoHealthyEndpointError(
+                    f"The request failed on all {len(tried)} endpoints"
+                )
+            tried.append(endpoint)
+            try:
+                return self._run(endpoint, fn)
+            except CONNECTION_ERRORS:
+                if len(tried) == len(self.endpoints):
+                    raise
+
+    def mark_failed(self) -> None:
+        """
+        Reconnect the client of every endpoint the next time it is used.
+        """
+        for endpoint in self.endpoints:
+            endpoint.manager.mark_failed()
+
+    def info(self) -> List[EndpointInfo]:
+        """
+        Return the health, latency EWMA in seconds, load and request counts of each endpoint.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                EndpointInfo(
+                    e.url,
+                    e.ejected_until <= now,
+                    e.latency_ewma,
+                    e.outstanding,
+                    e.requests,
+                    e.failures,
+                )
+                for e in self.endpoints
+            ]
+
+    def close(self) -> None:
+        """
+        Close the clients of the endpoints and stop the hedging threads.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for endpoint in self.endpoints:
+            endpoint.manager.close()
+
+    def _pick(self, exclude: Sequence[Endpoint] = ()) -> Optional[Endpoint]:
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                candidates = [e for e in self.endpoints if e not in exclude]
+                if not candidates:
+                    return None
+                healthy = [e for e in candidates if e.ejected_until <= now]
+                if not healthy:
+                    # Fail open: try the endpoint whose ejection ends first
+                    return min(candidates, key=lambda e: e.ejected_until)
+                endpoint = min(healthy, key=self._score)
+                probe = endpoint.consecutive_failures > 0
+            if not probe or self._probe(endpoint):
+                return endpoint
+            exclude = [*exclude, endpoint]
+
+    def _score(self, endpoint: Endpoint) -> float:
+        return (endpoint.latency_ewma or 0.0) * (endpoint.outstanding + 1)
+
+    def _probe(self, endpoint: Endpoint) -> bool:
+        try:
+            if endpoint.manager.acquire().is_live():
+                return True
+        except Exception:
+            pass
+        self._eject(endpoint)
+        return False
+
+    def _run(self, endpoint: Endpoint, fn: Callable[[WeaviateClient], T]) -> T:
+        with self._lock:
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+        start = time.perf_counter()
+        try:
+            with endpoint.manager.connected() as client:
+                result = fn(client)
+        except CONNECTION_ERRORS:
+            with self._lock:
+                endpoint.outstanding -= 1
+            self._eject(endpoint)
+            raise
+        except BaseException:
+            with self._lock:
+                endpoint.outstanding -= 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.consecutive_failures = 0
+            endpoint.ejected_until = 0.0
+            if endpoint.latency_ewma is None:
+                endpoint.latency_ewma = elapsed
+            else:
+                endpoint.latency_ewma += self.ewma_alpha * (
+                    elapsed - endpoint.latency_ewma
+                )
+            self._latencies.append(elapsed)
+        if len(self.endpoints) > 1:
+            annotate("endpoint", endpoint.url)
+        return result
+
+    def _eject(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            backoff = 2 ** min(endpoint.consecutive_failures - 1, 5)
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds * backoff
+
+    def _hedge_threshold(self) -> Optional[float]:
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            latencies = np.fromiter(self._latencies, dtype=np.float64)
+        return float(np.quantile(latencies, self.hedge_percentile))
+
+    def _hedged(self, fn: Callable[[WeaviateClient], T], threshold: float) -> T:
+        primary = self._pick()
+        if primary is None:
+            raise NoHealthyEndpointError("No endpoint is available")
+        futures = {self._submit(primary, fn): primary}
+        done, _ = wait(futures, timeout=threshold)
+        if not done:
+            secondary = self._pick([primary])
+            if secondary is not None:
+                with self._lock:
+                    self.hedges += 1
+                annotate("hedged", True)
+                futures[self._submit(secondary, fn)] = secondary
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        # Every attempt failed: fail over to the remaining endpoints without hedging
+        if isinstance(error, CONNECTION_ERRORS):
+            tried = list(futures.values())
+            for endpoint in self.endpoints:
+                if endpoint not in tried:
+                    try:
+                        return self._run(endpoint, fn)
+                    except CONNECTION_ERRORS as e:
+                        error = e
+        raise error
+
+    def _submit(self, endpoint: Endpoint, fn: Callable[[WeaviateClient], T]) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix="weaviate-hedge"
+                )
+            executor = self._executor
+        # Run in a copy of the context, so that phases are recorded on the span of the call
+        context = contextvars.copy_context()
+        return executor.submit(context.run, self._run, endpoint, fn)
@@ -0,0 +1,391 @@
+import bisect
+import contextvars
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+HistogramSummary = namedtuple(
+    "HistogramSummary", ["count", "total", "min", "max", "p50", "p90", "p99"]
+)
+
+# Log-scale bucket bounds, about 19% apart, from 1 microsecond (or byte) to 10^12
+BUCKET_BOUNDS = [1e-6 * 2 ** (i / 4) for i in range(240)]
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "st_weaviate_connection_span", default=None
+)
+
+
+class Histogram:
+    """
+    A thread-safe histogram with fixed log-scale buckets.
+
+    Percentiles are estimated from the bucket bounds, within about 19% of the exact values.
+    """
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._min = float("inf")
+        self._max = float("-inf")
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value to the histogram.
+        """
+        index = bisect.bisect_left(BUCKET_BOUNDS, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total += value
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+
+    def summary(self) -> HistogramSummary:
+        """
+        Return the count, total, minimum, maximum and estimated 50th, 90th and 99th percentiles of the values.
+        """
+        with self._lock:
+            if not self._count:
+                return HistogramSummary(0, 0.0, None, None, None, None, None)
+            return HistogramSummary(
+                self._count,
+                self._total,
+                self._min,
+                self._max,
+                self._percentile(0.5),
+                self._percentile(0.9),
+                self._percentile(0.99),
+            )
+
+    def _percentile(self, q: float) -> float:
+        rank = q * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self._max
+                return min(max(bound, self._min), self._max)
+        return self._max
+
+
+class Span:
+    """
+    The timings and attributes of one call of a connection method.
+
+    Attributes
+    ----------
+    name : str
+        The name of the method, e.g. "query".
+    start_ns : int
+        The wall-clock start time of the call, in nanoseconds since the epoch.
+    seconds : float
+        The duration of the call.
+    phases : Dict[str, float]
+        The time spent in each phase of the call, e.g. "connect", "hybrid" or "to_dataframe", in seconds.
+    attributes : Dict[str, Any]
+        E.g. the number of returned `rows`, their size in `bytes`, and whether the result was a `cache` hit.
+    """
+
+    __slots__ = ("name", "start_ns", "seconds", "phases", "attributes", "_start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.seconds = 0.0
+        self.phases: Dict[str, float] = {}
+        self.attributes: Dict[str, Any] = {}
+        self._start = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, seconds={self.seconds:.6f}, phases={self.phases}, attributes={self.attributes})"
+
+
+StatsHook = Callable[[Span], None]
+
+
+class _SpanContext:
+    __slots__ = ("_stats", "_span", "_token")
+
+    def __init__(self, stats: "Stats", name: str) -> None:
+        self._stats = stats
+        self._span = Span(name)
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        _current_span.reset(self._token)
+        span = self._span
+        span.seconds = time.perf_counter() - span._start
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        self._stats.record(span)
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class _PhaseContext:
+    __slots__ = ("_span", "_name", "_start")
+
+    def __init__(self, span: Span, name: str) -> None:
+        self._span = span
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        phases = self._span.phases
+        phases[self._name] = (
+            phases.get(self._name, 0.0) + time.perf_counter() - self._start
+        )
+
+
+def phase(name: str) -> Any:
+    """
+    Time a phase of the current call, e.g. `with phase("hybrid"): ...`.
+
+    Does nothing outside of an instrumented call.
+    """
+    span = _current_span.get()
+    if span is None:
+        return _NULL_CONTEXT
+    return _PhaseContext(span, name)
+
+
+def annotate(key: str, value: Any) -> None:
+    """
+    Set an attribute of the current call. Does nothing outside of an instrumented call.
+    """
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
+
+
+def result_size(result: Any) -> None:
+    """
+    Record the number of rows and the in-memory size in bytes of a DataFrame or Arrow result on the current call.
+
+    The size of a pandas result is only measured when it was not served from the cache, as measuring the
+    strings of object columns costs more than a cache hit. Its size was recorded when it was computed.
+    """
+    span = _current_span.get()
+    if span is None:
+        return
+    df = getattr(result, "df", result)
+    if isinstance(df, pd.DataFrame):
+        span.attributes["rows"] = len(df)
+        if span.attributes.get("cache") != "hit":
+            span.attributes["bytes"] = int(df.memory_usage(index=False, deep=True).sum())
+    elif hasattr(df, "num_rows") and hasattr(df, "nbytes"):
+        # A pyarrow.Table
+        span.attributes["rows"] = df.num_rows
+        span.attributes["bytes"] = int(df.nbytes)
+    elif hasattr(df, "estimated_size"):
+        # A polars.DataFrame
+        span.attributes["rows"] = len(df)
+        span.attributes["bytes"] = int(df.estimated_size())
+    elif result is None:
+        span.attributes["rows"] = 0
+
+
+class Stats:
+    """
+    Aggregate the spans of the calls of a connection into histograms, and forward them to hooks.
+
+    For each span, the histograms `<name>.seconds`, `<name>.<phase>.seconds`,
+    `<name>.rows` and `<name>.bytes` are updated.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        """
+        Initialize the statistics.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Whether to record spans. If False, `span` returns a no-op context. Default: True.
+        """
+        self.enabled = enabled
+        self._histograms: Dict[str, Histogram] = {}
+        self._hooks: List[StatsHook] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str) -> Any:
+        """
+        Return a context manager recording a span for the duration of a call.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _SpanContext(self, name)
+
+    def add_hook(self, hook: StatsHook) -> None:
+        """
+        Call `hook` with every recorded span, e.g. to forward it to a tracing or metrics system.
+        """
+        with self._lock:
+            self._hooks = self._hooks + [hook]
+
+    def remove_hook(self, hook: StatsHook) -> None:
+        """
+        Stop calling a hook added with `add_hook`.
+        """
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def record(self, span: Span) -> None:
+        """
+        Add a finished span to the histograms and call the hooks with it.
+        """
+        self._histogram(f"{span.name}.seconds").observe(span.seconds)
+        for name, seconds in span.phases.items():
+            self._histogram(f"{span.name}.{name}.seconds").observe(seconds)
+        for key in ("rows", "bytes"):
+            value = span.attributes.get(key)
+            if value is not None:
+                self._histogram(f"{span.name}.{key}").observe(value)
+        for hook in self._hooks:
+            hook(span)
+
+    def snapshot(self) -> Dict[str, HistogramSummary]:
+        """
+        Return the summary of each histogram, by name.
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histograms[name].summary() for name in sorted(histograms)}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Return the summaries of the histograms as a DataFrame, one row per histogram.
+        """
+        snapshot = self.snapshot()
+        return pd.DataFrame(
+            list(snapshot.values()),
+            index=pd.Index(list(snapshot), name="metric"),
+            columns=HistogramSummary._fields,
+        )
+
+    def reset(self) -> None:
+        """
+        Remove all recorded values.
+        """
+        with self._lock:
+            self._histograms = {}
+
+    def _histogram(self, name: str) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+
+def opentelemetry_hook(tracer: Any = None) -> StatsHook:
+    """
+    Return a hook exporting each span as an OpenTelemetry span. Requires `opentelemetry-api`.
+
+    Parameters
+    ----------
+    tracer : opentelemetry.trace.Tracer, optional
+        The tracer to create the spans with. Default: the tracer of the `st_weaviate_connection` module.
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError as e:
+        raise ImportError(
+            "The OpenTelemetry hook requires opentelemetry-api. Install it with `pip install opentelemetry-api`."
+        ) from e
+    if tracer is None:
+        tracer = trace.get_tracer("st_weaviate_connection")
+
+    def hook(span: Span) -> None:
+        attributes = {
+            key: value
+            for key, value in span.attributes.items()
+            if isinstance(value, (str, bool, int, float))
+        }
+        for name, seconds in span.phases.items():
+            attributes[f"phase.{name}.seconds"] = seconds
+        otel_span = tracer.start_span(
+            f"weaviate.{span.name}", start_time=span.start_ns, attributes=attributes
+        )
+        if "error" in span.attributes:
+            otel_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        otel_span.end(end_time=span.start_ns + int(span.seconds * 1e9))
+
+    return hook
+
+
+def prometheus_hook(
+    registry: Any = None, namespace: str = "st_weaviate_connection"
+) -> StatsHook:
+    """
+    Return a hook observing each span in Prometheus histograms. Requires `prometheus-client`.
+
+    Parameters
+    ----------
+    registry : prometheus_client.CollectorRegistry, optional
+        The registry of the metrics. Default: the default registry of `prometheus_client`.
+    namespace : str, optional
+        The prefix of the metric names. Default: "st_weaviate_connection".
+    """
+    try:
+        import prometheus_client
+    except ImportError as e:
+        raise ImportError(
+            "The Prometheus hook requires prometheus-client. Install it with `pip install prometheus-client`."
+        ) from e
+    if registry is None:
+        registry = prometheus_client.REGISTRY
+    seconds = prometheus_client.Histogram(
+        "seconds",
+        "The duration of connection calls and of their phases.",
+        ["method", "phase"],
+        namespace=namespace,
+        registry=registry,
+    )
+    rows = prometheus_client.Histogram(
+        "rows",
+        "The number of rows returned by connection calls.",
+        ["method"],
+        namespace=namespace,
+        buckets=[0, 1, 10, 100, 1000, 10000, 100000, float("inf")],
+        registry=registry,
+    )
+    errors = prometheus_client.Counter(
+        "errors",
+        "The number of failed connection calls.",
+        ["method", "error"],
+        namespace=namespace,
+        registry=registry,
+    )
+
+    def hook(span: Span) -> None:
+        seconds.labels(span.name, "total").observe(span.seconds)
+        for name, phase_seconds in span.phases.items():
+            seconds.labels(span.name, name).observe(phase_seconds)
+        if "rows" in span.attributes:
+            rows.labels(span.name).observe(span.attributes["rows"])
+        if "error" in span.attributes:
+            errors.labels(span.name, span.attributes["error"]).inc()
+
+    return hook
@@ -90,3 +90,36 @@ def weaviate_db(weaviate_client: WeaviateClient, documents):
             batch.add_object(
                 properties=document, vector=embedding
             )
+
+
+@pytest.fixture
+def memory_connection(request):
+    """
+    Return a factory of connections to new in-process databases, each seeded with a collection.
+
+    The factory takes the collection name, the DataFrame to insert, optionally the data type of each
+    property, and the arguments of `insert_dataframe`. The databases are dropped after the test.
+    """
+    from weaviate.classes.config import Property
+
+    from st_weaviate_connection import WeaviateConnection, memory
+
+    created = []
+
+    def connect(collection_name, df, schema=None, **insert_kwargs):
+        url = f"memory://{request.node.name}"
+        if created:
+            url = f"{url}-{len(created)}"
+        conn = WeaviateConnection("memory", url=url)
+        created.append((conn, url))
+        properties = None
+        if schema is not None:
+            properties = [Property(name=name, data_type=data_type) for name, data_type in schema.items()]
+        conn.client().collections.create(collection_name, properties=properties)
+        conn.insert_dataframe(collection_name, df, **insert_kwargs)
+        return conn
+
+    yield connect
+    for conn, url in created:
+        conn.close()
+        memory.drop_database(url)
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from st_weaviate_connection import WeaviateConnection, memory
+from st_weaviate_connection.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    Priority,
+    session_scope,
+)
+
+
+def wait_for_queue(controller, depth):
+    deadline = time.monotonic() + 5
+    while controller.info().queue_depth < depth:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_caps_requests_in_flight():
+    controller = AdmissionController(max_in_flight=2)
+    controller.acquire()
+    controller.acquire()
+    admitted = threading.Event()
+
+    def third():
+        controller.acquire()
+        admitted.set()
+
+    thread = threading.Thread(target=third)
+    thread.start()
+    wait_for_queue(controller, 1)
+    assert not admitted.is_set()
+
+    controller.release()
+    thread.join()
+    assert admitted.is_set()
+    assert controller.info()._replace(admitted=0) == (2, 0, 0, 0, 0, 0)
+
+
+def test_admits_waiting_requests_by_priority():
+    controller = AdmissionController(max_in_flight=1)
+    controller.acquire()
+    order = []
+
+    def request(priority):
+        controller.acquire(priority)
+        order.append(priority)
+        controller.release()
+
+    threads = []
+    for priority in (Priority.GENERATE, Priority.QUERY, Priority.KEYWORD):
+        threads.append(threading.Thread(target=request, args=(priority,)))
+        threads[-1].start()
+        wait_for_queue(controller, len(threads))
+
+    controller.release()
+    for thread in threads:
+        thread.join()
+    assert order == [Priority.KEYWORD, Priority.QUERY, Priority.GENERATE]
+
+
+def test_rejects_requests_when_the_queue_is_full_or_times_out():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+    controller.acquire()
+    errors = []
+
+    def request():
+        try:
+            controller.acquire()
+        except AdmissionRejectedError as e:
+            errors.append(e.reason)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    wait_for_queue(controller, 1)
+    with pytest.raises(AdmissionRejectedError, match="queue is full"):
+        controller.acquire()
+    thread.join()
+
+    assert errors == ["timed_out"]
+    info = controller.info()
+    assert (info.queue_depth, info.queue_full, info.timed_out) == (0, 1, 1)
+    # The slot is not handed to the request that timed out
+    controller.release()
+    assert controller.info().in_flight == 0
+
+
+def test_rate_limits_each_session():
+    controller = AdmissionController(session_rate=100, session_burst=2)
+    for _ in range(2):
+        controller.acquire(session_id="a")
+        controller.release()
+
+    with pytest.raises(AdmissionRejectedError) as e:
+        controller.acquire(session_id="a")
+    assert e.value.reason == "rate_limited"
+    controller.acquire(session_id="b")
+    time.sleep(0.02)
+    controller.acquire(session_id="a")
+    assert controller.info().rate_limited == 1
+
+
+def test_async_requests_wait_without_blocking_the_event_loop():
+    controller = AdmissionController(max_in_flight=1)
+    controller.acquire()
+
+    async def main():
+        waiting = asyncio.ensure_future(controller.acquire_async())
+        cancelled = asyncio.ensure_future(controller.acquire_async())
+        while controller.info().queue_depth < 2:
+            await asyncio.sleep(0.001)
+        cancelled.cancel()
+        controller.release()
+        await waiting
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        controller.release()
+        # The slot handed to the cancelled request is released once it gets it
+        while controller.info().in_flight:
+            await asyncio.sleep(0.001)
+
+    asyncio.run(main())
+    assert controller.info()._replace(admitted=0) == (0, 0, 0, 0, 0, 0)
+
+
+def test_connection_rate_limits_sessions_but_not_cache_hits():
+    url = "memory://test-admission"
+    conn = WeaviateConnection("admission", url=url, session_rate=0.001, session_burst=2)
+    conn.client().collections.create("Show")
+    conn.client().collections.get("Show").data.insert({"title": "Doug"})
+    try:
+        with session_scope("session-1"):
+            conn.query("Show", "doug", cache_ttl=60)
+            for _ in range(3):
+                conn.query("Show", "doug", cache_ttl=60)
+            conn.graphql_query("{ Get { Show { title } } }")
+            with pytest.raises(AdmissionRejectedError):
+                conn.query("Show", "rugrats")
+        with session_scope("session-2"):
+            assert conn.query("Show", "doug", alpha=0)["title"].tolist() == ["Doug"]
+
+        info = conn.admission_info()
+        assert (info.admitted, info.rate_limited) == (3, 1)
+        assert conn.stats().admission == info
+    finally:
+        conn.close()
+        memory.drop_database(url)
+
+
+def test_query_concurrently_counts_against_the_session():
+    url = "memory://test-admission-concurrently"
+    conn = WeaviateConnection("admission", url=url, session_rate=0.001, session_burst=2)
+    conn.client().collections.create("Show")
+    conn.client().collections.get("Show").data.insert({"title": "Doug"})
+    try:
+        with session_scope("session-1"):
+            dfs = conn.query_concurrently(
+                [{"collection_name": "Show", "query": q} for q in ("doug", "rugrats")]
+            )
+            assert dfs[0]["title"].tolist() == ["Doug"]
+            with pytest.raises(AdmissionRejectedError):
+                conn.query_concurrently([{"collection_name": "Show", "query": "recess"}])
+        assert conn.admission_info().rate_limited == 1
+        assert conn.stats().histograms["query.seconds"].count == 3
+    finally:
+        conn.close()
+        memory.drop_database(url)
+
+
+def test_async_queries_count_against_the_session():
+    url = "memory://test-admission-async"
+    conn = WeaviateConnection("admission", url=url, session_rate=0.001, session_burst=2)
+    conn.client().collections.create("Show")
+    conn.client().collections.get("Show").data.insert({"title": "Doug"})
+
+    async def main():
+        try:
+            with session_scope("session-1"):
+                df = await conn.aquery("Show", "doug", cache_ttl=60)
+                await conn.aquery("Show", "doug", cache_ttl=60)
+                await conn.agraphql_query("{ Get { Show { title } } }")
+                with pytest.raises(AdmissionRejectedError):
+                    await conn.aquery("Show", "rugrats")
+            return df
+        finally:
+            await conn.aclose()
+
+    try:
+        assert asyncio.run(main())["title"].tolist() == ["Doug"]
+        info = conn.admission_info()
+        assert (info.admitted, info.rate_limited) == (2, 1)
+        histograms = conn.stats().histograms
+        assert histograms["query.seconds"].count == 3
+        assert histograms["graphql_query.seconds"].count == 1
+    finally:
+        conn.close()
+        memory.drop_database(url)
@@ -0,0 +1,109 @@
+import datetime
+
+import pandas as pd
+import pytest
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+
+from st_weaviate_connection import WeaviateMetrics
+
+SHOWS = pd.DataFrame(
+    {
+        "title": ["Doug", "Rugrats", "Hey Arnold!", "Recess"],
+        "year": [1991, 1991, 1996, 1997],
+        "rating": [7.5, 7.0, 7.8, 7.9],
+        "network": ["Nickelodeon", "Nickelodeon", "Nickelodeon", "ABC"],
+        "animated": [True, True, True, False],
+        "premiere": pd.to_datetime(
+            ["1991-08-11", "1991-08-11", "1996-10-07", "1997-09-13"], utc=True
+        ),
+        "vector": [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9]],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection(
+        "Show",
+        SHOWS,
+        {
+            "title": DataType.TEXT,
+            "year": DataType.INT,
+            "rating": DataType.NUMBER,
+            "network": DataType.TEXT,
+            "animated": DataType.BOOL,
+            "premiere": DataType.DATE,
+        },
+        vector_column="vector",
+    )
+
+
+def test_counts_per_group(conn):
+    df = conn.aggregate("Show", group_by="year")
+
+    assert df.columns.tolist() == ["year", "total_count"]
+    assert df["year"].dtype == "int64"
+    assert dict(zip(df["year"], df["total_count"])) == {1991: 2, 1996: 1, 1997: 1}
+    assert df["total_count"].iloc[0] == 2
+
+
+def test_metrics_over_all_objects(conn):
+    df = conn.aggregate(
+        "Show",
+        metrics=[
+            WeaviateMetrics("rating").number(minimum=True, maximum=True, mean=True),
+            WeaviateMetrics("network").text(top_occurrences_count=True, top_occurrences_value=True),
+            WeaviateMetrics("animated").boolean(total_true=True),
+            WeaviateMetrics("premiere").date_(minimum=True),
+        ],
+        filters=Filter.by_property("year").less_than(1997),
+    )
+
+    assert len(df) == 1
+    row = df.iloc[0]
+    assert row["total_count"] == 3
+    assert row["rating.minimum"] == 7.0
+    assert row["rating.maximum"] == 7.8
+    assert row["rating.mean"] == pytest.approx(7.433, abs=1e-3)
+    assert row["network.top_occurrences"] == [{"value": "Nickelodeon", "count": 3}]
+    assert row["animated.total_true"] == 3
+    assert row["premiere.minimum"] == pd.Timestamp(
+        datetime.datetime(1991, 8, 11, tzinfo=datetime.timezone.utc)
+    )
+    assert "rating.median" not in df.columns
+
+
+def test_grouped_metrics(conn):
+    df = conn.aggregate(
+        "Show",
+        group_by="network",
+        metrics=WeaviateMetrics("year").integer(maximum=True),
+        group_limit=1,
+    )
+
+    assert df.to_dict("records") == [
+        {"network": "Nickelodeon", "total_count": 3, "year.maximum": 1996}
+    ]
+
+
+def test_near_vector_aggregates_the_closest_objects(conn):
+    df = conn.aggregate("Show", group_by="network", near_vector=[1.0, 0.0], object_limit=2)
+
+    assert df.to_dict("records") == [{"network": "Nickelodeon", "total_count": 2}]
+    with pytest.raises(ValueError, match="near_text"):
+        conn.aggregate("Show", near_text="cartoons", near_vector=[1.0, 0.0])
+
+
+def test_results_are_cached(conn):
+    metrics = WeaviateMetrics("year").integer(minimum=True)
+    conn.aggregate("Show", group_by="network", metrics=metrics, cache_ttl=60)
+    df = conn.aggregate("Show", group_by="network", metrics=metrics, cache_ttl=60)
+
+    assert conn.cache_info().hits == 1
+    df.loc[0, "total_count"] = 0
+    cached = conn.aggregate("Show", group_by="network", metrics=metrics, cache_ttl=60)
+    assert cached["total_count"].iloc[0] == 3
+
+    conn.clear_cache("Show")
+    assert conn.cache_info().currsize == 0
@@ -0,0 +1,42 @@
+import asyncio
+
+from st_weaviate_connection.aio import AsyncClients
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.connected = False
+        self.connect_calls = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def connect(self):
+        await asyncio.sleep(0.01)
+        self.connect_calls += 1
+        self.connected = True
+
+    async def close(self):
+        self.connected = False
+
+
+def test_async_clients_connect_once_per_loop():
+    created = []
+
+    def factory():
+        created.append(FakeAsyncClient())
+        return created[-1]
+
+    clients = AsyncClients(factory)
+
+    async def get_many():
+        return await asyncio.gather(*(clients.get() for _ in range(5)))
+
+    first = asyncio.run(get_many())
+    second = asyncio.run(get_many())
+
+    assert len(set(map(id, first))) == 1
+    assert len(set(map(id, second))) == 1
+    assert first[0] is not second[0]
+    assert [client.connect_calls for client in created] == [1, 1]
+
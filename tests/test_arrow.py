@@ -0,0 +1,130 @@
+import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from weaviate.classes.config import DataType
+
+from st_weaviate_connection.arrow import gql_rows_to_table, objects_to_table
+
+pa = pytest.importorskip("pyarrow")
+
+SHOWS = pd.DataFrame(
+    {
+        "title": ["Doug", "Rugrats", "Hey Arnold!"],
+        "year": [1991, 1991, 1996],
+        "tags": [["school", "friends"], ["babies"], ["city", "friends"]],
+        "vector": [[1.0, 0.0, 0.0], [0.8, 0.2, 0.0], [0.0, 1.0, 0.0]],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection(
+        "TVShow",
+        SHOWS,
+        {"title": DataType.TEXT, "year": DataType.INT, "tags": DataType.TEXT_ARRAY},
+        vector_column="vector",
+    )
+
+
+def test_objects_to_table_types_columns_from_the_schema():
+    objects = [
+        SimpleNamespace(
+            properties={
+                "year": 1991,
+                "aired": datetime.datetime(1991, 8, 11, tzinfo=datetime.timezone.utc),
+                "creator": {"name": "Jim Jinkins", "born": 1953},
+            },
+            vector={"default": [1.0, 2.0]},
+        ),
+        SimpleNamespace(
+            properties={"year": None, "aired": None, "creator": None},
+            vector={"default": [3.0, 4.0]},
+        ),
+    ]
+    schema = {"year": DataType.INT, "aired": DataType.DATE, "creator": DataType.OBJECT}
+
+    table = objects_to_table(objects, schema=schema, include_vector=True)
+
+    assert table.column_names == [
+        "year",
+        "aired",
+        "creator.name",
+        "creator.born",
+        "_additional.vector",
+    ]
+    assert table.schema.field("year").type == pa.int64()
+    assert table.schema.field("aired").type == pa.timestamp("us", tz="UTC")
+    assert table["creator.name"].to_pylist() == ["Jim Jinkins", None]
+    assert table.schema.field("_additional.vector").type == pa.list_(pa.float32(), 2)
+
+
+def test_query_returns_an_arrow_table(conn):
+    table = conn.query(
+        "TVShow",
+        "friends",
+        include_metadata=True,
+        include_vector=True,
+        output="arrow",
+    )
+    df = conn.query("TVShow", "friends", include_metadata=True, include_vector=True)
+
+    assert isinstance(table, pa.Table)
+    assert table.column_names == list(df.columns)
+    assert table["title"].to_pylist() == df["title"].tolist()
+    assert table.schema.field("tags").type == pa.list_(pa.string())
+    assert table.schema.field("_additional.vector").type == pa.list_(pa.float32(), 3)
+
+
+def test_arrow_results_are_cached_separately(conn):
+    table = conn.query("TVShow", "doug", cache_ttl=60, output="arrow")
+    df = conn.query("TVShow", "doug", cache_ttl=60)
+
+    assert conn.cache_info().hits == 0
+    assert conn.query("TVShow", "doug", cache_ttl=60, output="arrow") is table
+    assert isinstance(df, pd.DataFrame)
+
+
+def test_prefiltered_query_returns_an_arrow_table(conn):
+    from weaviate.classes.query import Filter
+
+    table = conn.query(
+        "TVShow",
+        "friends",
+        filters=Filter.by_property("year").greater_than(1995),
+        prefilter=Filter.by_property("year").greater_than(1990),
+        output="arrow",
+    )
+
+    assert table["title"].to_pylist() == ["Hey Arnold!"]
+
+
+def test_graphql_query_returns_an_arrow_table(conn):
+    query = "{ Get { TVShow { title year _additional { id } } } }"
+
+    table = conn.graphql_query(query, output="arrow")
+
+    assert table.column_names == list(conn.graphql_query(query).columns)
+    assert table.num_rows == 3
+
+
+def test_gql_rows_to_table_flattens_fields_and_vectors():
+    rows = [
+        {"title": "Doug", "_additional": {"id": "a", "vector": [1.0, 0.0]}},
+        {"title": "Rugrats", "_additional": {"id": "b", "vector": [0.0, 1.0]}},
+    ]
+
+    table = gql_rows_to_table(rows)
+
+    assert table.column_names == ["title", "_additional.id", "_additional.vector"]
+    assert table.schema.field("_additional.vector").type == pa.list_(pa.float32(), 2)
+    assert table["_additional.vector"].to_pylist() == [[1.0, 0.0], [0.0, 1.0]]
+
+
+def test_invalid_output(conn):
+    with pytest.raises(ValueError, match="output"):
+        conn.query("TVShow", "doug", output="csv")
+    with pytest.raises(ValueError, match="lazy_blobs"):
+        conn.query("TVShow", "doug", output="arrow", lazy_blobs=True)
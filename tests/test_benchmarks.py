@@ -0,0 +1,20 @@
+from benchmarks import harness
+
+
+def test_measure_reports_seconds_per_call():
+    calls = []
+    result = harness.measure(lambda: calls.append(1), repeat=3, min_seconds=0.001)
+    assert result["repeat"] == 3
+    assert len(calls) > 3 * result["number"]
+    assert 0 < result["min"] <= result["median"]
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+    results = {
+        "results": {"a": {"median": 1.1}, "b": {"median": 1.5}, "c": {"median": 9.0}}
+    }
+    regressions = harness.compare(results, baseline, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b:")
+    assert harness.compare(results, baseline, threshold=0.6) == []
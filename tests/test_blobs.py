@@ -0,0 +1,69 @@
+import base64
+
+import pandas as pd
+
+from st_weaviate_connection.blobs import BlobStore, attach_blob_refs
+
+
+class FakeFetcher:
+    def __init__(self, size=4):
+        self.size = size
+        self.calls = []
+
+    def __call__(self, collection_name, property, uuids):
+        self.calls.append((collection_name, property, list(uuids)))
+        return {
+            uuid: base64.b64encode(uuid.encode()[: self.size]).decode()
+            for uuid in uuids
+            if uuid != "empty"
+        }
+
+
+def test_blob_store_loads_in_bulk_and_caches():
+    fetch = FakeFetcher()
+    store = BlobStore(fetch)
+    refs = [store.ref("Movie", uuid, "poster") for uuid in ("aaaa", "bbbb", "empty")]
+
+    first = store.load(refs + [None])
+    second = store.load(refs)
+
+    assert first == [b"aaaa", b"bbbb", None, None]
+    assert second == first[:3]
+    assert fetch.calls == [("Movie", "poster", ["aaaa", "bbbb", "empty"])]
+    assert store.info().currsize == 8
+
+
+def test_blob_store_evicts_by_total_bytes():
+    fetch = FakeFetcher()
+    store = BlobStore(fetch, max_bytes=8)
+
+    for uuid in ("aaaa", "bbbb", "cccc"):
+        store.ref("Movie", uuid, "poster").load()
+    store.ref("Movie", "aaaa", "poster").load()
+
+    assert store.info().currsize == 8
+    assert len(fetch.calls) == 4
+
+
+def test_blob_store_clear_by_collection():
+    store = BlobStore(FakeFetcher())
+    store.load([store.ref("Movie", "aaaa", "poster"), store.ref("Show", "bbbb", "poster")])
+
+    store.clear("Movie")
+
+    assert store.info().currsize == 4
+
+
+def test_attach_blob_refs():
+    class Obj:
+        def __init__(self, uuid):
+            self.uuid = uuid
+
+    store = BlobStore(FakeFetcher())
+    df = pd.DataFrame({"title": ["Doug", "Rugrats"], "poster": [None, None]})
+
+    df = attach_blob_refs(df, store, "Movie", [Obj("aaaa"), Obj("bbbb")], ["poster"])
+
+    assert list(df.columns) == ["title", "poster"]
+    assert df["poster"][1] == store.ref("Movie", "bbbb", "poster")
+    assert df["poster"][1].data_uri() == "data:image/png;base64,YmJiYg=="
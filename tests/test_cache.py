@@ -0,0 +1,171 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from weaviate.classes.query import Filter, TargetVectors
+
+from st_weaviate_connection.cache import (
+    MISSING,
+    QueryCache,
+    SingleFlight,
+    get_result_cache,
+    make_cache_key,
+    normalize_graphql,
+)
+
+
+def test_cache_key_is_stable_for_equal_filters():
+    f1 = Filter.by_property("year").greater_than(1990) & Filter.by_property(
+        "genre"
+    ).contains_any(["drama", "comedy"])
+    f2 = Filter.by_property("year").greater_than(1990) & Filter.by_property(
+        "genre"
+    ).contains_any(["drama", "comedy"])
+
+    assert make_cache_key("Movie", "space", f1) == make_cache_key("Movie", "space", f2)
+
+
+def test_cache_key_differs_on_any_argument():
+    base = make_cache_key(
+        "Movie", "space", 10, Filter.by_property("year").greater_than(1990), 0.7
+    )
+
+    assert base != make_cache_key(
+        "Movie", "space", 10, Filter.by_property("year").greater_than(1991), 0.7
+    )
+    assert base != make_cache_key(
+        "Movie", "space", 10, Filter.by_property("year").less_than(1990), 0.7
+    )
+    assert base != make_cache_key(
+        "Movie", "space", 10, Filter.by_property("year").greater_than(1990), 0.5
+    )
+    assert make_cache_key(TargetVectors.sum(["a", "b"])) != make_cache_key(
+        TargetVectors.average(["a", "b"])
+    )
+
+
+def test_cache_key_serializes_numpy_values():
+    vector = np.zeros(2000, dtype=np.float32)
+    other = vector.copy()
+    other[1000] = 1
+
+    assert make_cache_key("Movie", vector) != make_cache_key("Movie", other)
+    assert make_cache_key("Movie", vector) == make_cache_key("Movie", [0.0] * 2000)
+    assert make_cache_key(np.int64(3), np.float32(0.5)) == make_cache_key(3, 0.5)
+
+
+def test_query_cache_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.info() == (3, 1, 2, 2)
+
+
+def test_query_cache_ttl():
+    cache = QueryCache()
+    cache.set("a", None, ttl=0.01)
+    assert cache.get("a") is None
+    time.sleep(0.02)
+
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_query_cache_rejects_empty_size():
+    with pytest.raises(ValueError):
+        QueryCache(max_entries=0)
+
+
+def test_query_cache_invalidate_by_tag():
+    cache = QueryCache()
+    cache.set("a", 1, tags=["Movie"])
+    cache.set("b", 2, tags=["Movie", "Actor"])
+    cache.set("c", 3, tags=["Actor"])
+
+    assert cache.invalidate("Movie") == 2
+    assert cache.get("a") is MISSING
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_normalize_graphql_ignores_formatting():
+    query = """
+    {
+        # Fetch the titles
+        Get {
+            TVShow (limit: 3, bm25: {query: "Rug  rats # not a comment"}) {
+                title
+                creator
+            }
+        }
+    }
+    """
+
+    assert (
+        normalize_graphql(query)
+        == '{Get{TVShow(limit:3 bm25:{query:"Rug  rats # not a comment"}){title creator}}}'
+    )
+
+
+def test_result_cache_is_shared_per_identity():
+    cache = get_result_cache(("test_shared", "localhost"))
+
+    assert get_result_cache(("test_shared", "localhost")) is cache
+    assert get_result_cache(("test_shared", "other")) is not cache
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        leader = executor.submit(flight.do, "key", fn)
+        started.wait()
+        followers = [executor.submit(flight.do, "key", fn) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert calls == [1]
+    assert results == [("result", True)] * 5
+    assert len(flight) == 0
+    assert flight.do("key", lambda: "again") == ("again", False)
+
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait()
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", fn)
+        started.wait()
+        follower = executor.submit(flight.do, "key", fn)
+        time.sleep(0.05)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result()
+
+    assert len(flight) == 0
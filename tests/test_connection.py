@@ -2,7 +2,7 @@ import pandas as pd
 import pytest
 from .conftest import TEST_COLLECTION_NAME
 
-from st_weaviate_connection import WeaviateConnection
+from st_weaviate_connection import WeaviateConnection, WeaviateFilter
 from st_weaviate_connection.connection import weaviate_response_objects_to_df
 
 
@@ -108,3 +108,162 @@ def test_query(weaviate_connection):
     assert df.shape == (3, 3)
     assert set(df.columns) == {"title", "synopsis", "creator"}
     assert df.iloc[0]["title"] == "Animaniacs"
+
+
+def test_query_concurrently(weaviate_connection):
+    specs = [
+        {
+            "collection_name": TEST_COLLECTION_NAME,
+            "query": title,
+            "return_properties": ["title"],
+            "alpha": 0,
+            "limit": 1,
+        }
+        for title in ["Rugrats", "Doug"]
+    ]
+
+    dfs = weaviate_connection.query_concurrently(specs)
+
+    assert [df.iloc[0]["title"] for df in dfs] == ["Rugrats", "Doug"]
+
+
+def test_query_many(weaviate_connection):
+    spec = {
+        "collection_name": TEST_COLLECTION_NAME,
+        "query": "Rugrats",
+        "return_properties": ["title"],
+        "alpha": 0,
+        "limit": 1,
+    }
+
+    results = weaviate_connection.query_many(
+        [spec, {**spec, "collection_name": "DoesNotExist"}, spec], max_workers=2
+    )
+
+    assert results[0].df.iloc[0]["title"] == "Rugrats"
+    assert results[1].df is None and results[1].error is not None
+    assert results[2].df.equals(results[0].df)
+    assert all(result.seconds >= 0 for result in results)
+
+
+def test_query_with_metadata_and_vector(weaviate_connection):
+    df = weaviate_connection.query(
+        query="Rugrats",
+        collection_name=TEST_COLLECTION_NAME,
+        return_properties=["title"],
+        alpha=0,
+        limit=1,
+        include_metadata=True,
+        include_vector=True,
+    )
+
+    assert list(df.columns) == [
+        "title",
+        "_additional.id",
+        "_additional.score",
+        "_additional.explain_score",
+        "_additional.vector",
+    ]
+    assert df.iloc[0]["_additional.vector"] == pytest.approx([0.5, 0.4, 0.3, 0.2, 0.1])
+
+
+def test_gql_query_vector_matrix(weaviate_connection):
+    query = """
+    {
+        Get {
+            TEST_COLLECTION_NAME (limit: 2, bm25: {query: "Rugrats"}) {
+                title
+                _additional {
+                    vector
+                }
+            }
+        }
+    }
+    """
+    query = query.replace("TEST_COLLECTION_NAME", TEST_COLLECTION_NAME)
+
+    df, vectors = weaviate_connection.graphql_query(query, vector_format="matrix")
+
+    assert list(df.columns) == ["title"]
+    assert vectors["default"].shape == (len(df), 5)
+    assert vectors["default"].dtype == "float32"
+
+
+def test_iter_dataframes(weaviate_connection, tmp_path):
+    path = tmp_path / "export.parquet"
+
+    chunks = list(
+        weaviate_connection.iter_dataframes(
+            TEST_COLLECTION_NAME,
+            chunk_size=2,
+            return_properties=["title", "creator"],
+            parquet_path=str(path),
+        )
+    )
+
+    assert [len(df) for df in chunks] == [2, 2, 1]
+    assert all(list(df.columns) == ["title", "creator"] for df in chunks)
+    assert pd.read_parquet(path).shape == (5, 2)
+
+
+def test_insert_dataframe(weaviate_connection, weaviate_client, documents):
+    from weaviate.classes.config import Configure, DataType, Property
+
+    name = TEST_COLLECTION_NAME + "Upload"
+    weaviate_client.collections.delete(name)
+    weaviate_client.collections.create(
+        name=name,
+        vectorizer_config=Configure.Vectorizer.none(),
+        properties=[
+            Property(name="title", data_type=DataType.TEXT),
+            Property(name="creator", data_type=DataType.TEXT),
+        ],
+    )
+    df = pd.DataFrame(
+        {
+            "title": [d["title"] for d in documents],
+            "creator": [d["creator"] for d in documents],
+            "embedding": [[0.1, 0.2, 0.3]] * len(documents),
+        }
+    )
+
+    result = weaviate_connection.insert_dataframe(
+        name, df, vector_column="embedding", batching="fixed_size"
+    )
+
+    assert result.inserted == len(documents)
+    assert result.failed.empty
+    assert result.objects_per_second > 0
+    assert sum(len(chunk) for chunk in weaviate_connection.iter_dataframes(name)) == len(
+        documents
+    )
+
+
+def test_query_with_prefilter(weaviate_connection, weaviate_client):
+    from weaviate.classes.config import Configure, DataType, Property
+
+    name = TEST_COLLECTION_NAME + "Years"
+    weaviate_client.collections.delete(name)
+    collection = weaviate_client.collections.create(
+        name=name,
+        vectorizer_config=Configure.Vectorizer.none(),
+        properties=[
+            Property(name="title", data_type=DataType.TEXT),
+            Property(name="year", data_type=DataType.INT),
+        ],
+    )
+    collection.data.insert_many(
+        [{"title": f"show {year}", "year": year} for year in range(1990, 2000)]
+    )
+    prefilter = WeaviateFilter.by_property("year").greater_or_equal(1990)
+    filters = WeaviateFilter.by_property("year").greater_or_equal(1995)
+
+    local = weaviate_connection.query(
+        name, "show", limit=20, filters=filters, prefilter=prefilter, alpha=0
+    )
+    remote = weaviate_connection.query(
+        name, "show", limit=20, filters=filters & prefilter, alpha=0
+    )
+
+    assert sorted(local["year"]) == sorted(remote["year"]) == list(range(1995, 2000))
+    assert list(local.columns) == list(remote.columns)
@@ -0,0 +1,144 @@
+import datetime
+import uuid
+
+import numpy as np
+import pandas as pd
+from weaviate.classes.config import DataType
+from weaviate.collections.classes.internal import MetadataReturn, Object
+
+from st_weaviate_connection.connection import weaviate_response_objects_to_df
+from st_weaviate_connection.dataframes import (
+    objects_to_matrices,
+    pop_gql_vectors,
+    vectors_to_matrix,
+)
+
+
+def make_object(properties, vector=None, score=None):
+    return Object(
+        uuid=uuid.uuid4(),
+        metadata=MetadataReturn(score=score),
+        properties=properties,
+        references=None,
+        vector=vector or {},
+        collection="TVShow",
+    )
+
+
+def test_matches_json_normalize_without_schema():
+    properties = [
+        {
+            "title": "Doug",
+            "seasons": 4,
+            "rating": 7.5,
+            "aired": datetime.datetime(1991, 8, 11, tzinfo=datetime.timezone.utc),
+            "creator": {"name": "Jim Jinkins", "studio": {"name": "Jumbo"}},
+            "genres": ["comedy", "drama"],
+        },
+        {
+            "title": "Rugrats",
+            "seasons": 9,
+            "rating": None,
+            "aired": datetime.datetime(1991, 8, 11, tzinfo=datetime.timezone.utc),
+            "creator": None,
+            "genres": [],
+        },
+    ]
+
+    df = weaviate_response_objects_to_df([make_object(p) for p in properties])
+    expected = pd.json_normalize(properties)
+
+    assert list(df.columns) == [
+        "title",
+        "seasons",
+        "rating",
+        "aired",
+        "creator.name",
+        "creator.studio.name",
+        "genres",
+    ]
+    assert dict(df.dtypes) == dict(expected[df.columns].dtypes)
+
+
+def test_schema_types_and_return_properties_order():
+    objects = [
+        make_object({"title": "Doug", "seasons": 4, "finished": True}),
+        make_object({"title": "Rugrats", "seasons": None, "finished": None}),
+    ]
+    schema = {
+        "title": DataType.TEXT,
+        "seasons": DataType.INT,
+        "finished": DataType.BOOL,
+    }
+
+    df = weaviate_response_objects_to_df(
+        objects, return_properties=["seasons", "title", "finished"], schema=schema
+    )
+
+    assert list(df.columns) == ["seasons", "title", "finished"]
+    assert str(df["seasons"].dtype) == "Int64"
+    assert str(df["finished"].dtype) == "boolean"
+    assert df["seasons"].isna().tolist() == [False, True]
+
+
+def test_metadata_and_vector_columns():
+    objects = [
+        make_object({"title": "Doug"}, vector={"default": [0.1, 0.2]}, score=0.9),
+        make_object({"title": "Rugrats"}, vector={"default": [0.3, 0.4]}, score=0.5),
+    ]
+
+    df = weaviate_response_objects_to_df(
+        objects, include_metadata=True, include_vector=True
+    )
+
+    assert list(df.columns) == [
+        "title",
+        "_additional.id",
+        "_additional.score",
+        "_additional.vector",
+    ]
+    assert df["_additional.id"].tolist() == [str(obj.uuid) for obj in objects]
+    assert df["_additional.vector"].tolist() == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_empty_result():
+    assert weaviate_response_objects_to_df([]) is None
+
+
+def test_vectors_to_matrix_fills_missing_rows():
+    matrix = vectors_to_matrix([[1.0, 2.0], None, [3.0, 4.0]])
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (3, 2)
+    assert np.isnan(matrix[1]).all()
+    assert not matrix.flags.writeable
+
+
+def test_objects_to_matrices_per_vector_name():
+    objects = [
+        make_object({"title": "Doug"}, vector={"title": [0.1, 0.2], "plot": [1.0]}),
+        make_object({"title": "Rugrats"}, vector={"title": [0.3, 0.4], "plot": [2.0]}),
+    ]
+
+    matrices = objects_to_matrices(objects)
+
+    assert set(matrices) == {"title", "plot"}
+    np.testing.assert_allclose(matrices["title"], [[0.1, 0.2], [0.3, 0.4]])
+    assert matrices["plot"].shape == (2, 1)
+
+
+def test_pop_gql_vectors():
+    data = [
+        {"title": "Doug", "_additional": {"score": "0.5", "vector": [0.1, 0.2]}},
+        {"title": "Rugrats", "_additional": {"vectors": {"plot": [1.0, 2.0]}}},
+    ]
+
+    rows, vectors = pop_gql_vectors(data)
+
+    assert rows == [
+        {"title": "Doug", "_additional": {"score": "0.5"}},
+        {"title": "Rugrats"},
+    ]
+    assert "vector" in data[0]["_additional"]
+    assert np.isnan(vectors["default"][1]).all()
+    np.testing.assert_allclose(vectors["plot"][1], [1.0, 2.0])
@@ -0,0 +1,156 @@
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from st_weaviate_connection import WeaviateConnection, cache, memory
+from st_weaviate_connection.cache import MISSING, QueryCache
+from st_weaviate_connection.dataframes import VectorResult
+from st_weaviate_connection.disk_cache import DiskCache
+
+SHOWS = pd.DataFrame(
+    {
+        "title": ["Doug", "Rugrats"],
+        "tags": [["school", "friends"], ["babies"]],
+    }
+)
+
+
+def write_entries(path, worker):
+    disk = DiskCache(path)
+    for i in range(20):
+        assert disk.set("ns", f"{worker}-{i}", SHOWS, ttl=60)
+
+
+def test_entries_are_shared_by_caches_on_the_same_file(tmp_path):
+    path = str(tmp_path / "cache.db")
+    matrix = np.arange(4, dtype=np.float32).reshape(2, 2)
+    matrix.flags.writeable = False
+    result = VectorResult(SHOWS, {"default": matrix})
+    DiskCache(path).set("ns", "a", result, ttl=60, tags=["Show"])
+
+    (df, vectors), ttl, tags = DiskCache(path).get("ns", "a")
+
+    pd.testing.assert_frame_equal(df, SHOWS)
+    assert df["tags"].iloc[0] == ["school", "friends"]
+    np.testing.assert_array_equal(vectors["default"], matrix)
+    assert not vectors["default"].flags.writeable
+    assert 59 < ttl <= 60
+    assert tags == {"Show"}
+    assert DiskCache(path).get("other", "a")[0] is MISSING
+
+
+def test_entries_expire(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    disk.set("ns", "a", 1, ttl=0.01)
+    disk.set("ns", "b", 2)
+    time.sleep(0.02)
+
+    assert disk.get("ns", "a")[0] is MISSING
+    assert disk.get("ns", "b") == (2, None, frozenset())
+    assert disk.info()[:2] == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr("st_weaviate_connection.disk_cache.ACCESS_RESOLUTION", 0)
+    disk = DiskCache(str(tmp_path / "cache.db"), max_bytes=2500)
+    for key in "abc":
+        assert disk.set("ns", key, b"x" * 1000)
+        time.sleep(0.01)
+    assert disk.get("ns", "a")[0] is MISSING
+    disk.get("ns", "b")
+    time.sleep(0.01)
+    disk.set("ns", "d", b"x" * 1000)
+
+    assert [disk.get("ns", key)[0] is MISSING for key in "bcd"] == [False, True, False]
+    assert disk.info().currsize <= 2500
+    assert not disk.set("ns", "e", b"x" * 3000)
+
+
+def test_invalidate_and_unpicklable_values(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    disk.set("ns", "a", 1, tags=["Movie"])
+    disk.set("ns", "b", 2, tags=["Movie", "Actor"])
+    disk.set("other", "c", 3, tags=["Movie"])
+
+    assert disk.invalidate("ns", "Movie") == 2
+    assert disk.get("other", "c")[0] == 3
+    assert not disk.set("ns", "lock", threading.Lock())
+
+
+def test_values_are_only_pickled_when_allowed(tmp_path):
+    path = str(tmp_path / "cache.db")
+    mixed = pd.DataFrame({"year": [1991, "unknown"]})
+    assert not DiskCache(path).set("ns", "mixed", mixed)
+    assert DiskCache(path, allow_pickle=True).set("ns", "mixed", mixed)
+
+    disk = DiskCache(path)
+    assert disk.get("ns", "mixed")[0] is MISSING
+    assert disk.errors == 1
+    unpickled = DiskCache(path, allow_pickle=True).get("ns", "mixed")[0]
+    pd.testing.assert_frame_equal(unpickled, mixed)
+    assert disk.set("ns", "text", "Doug")
+    assert disk.get("ns", "text")[0] == "Doug"
+
+
+def test_concurrent_writes_from_several_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=write_entries, args=(path, worker)) for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    disk = DiskCache(path)
+    assert all(disk.get("ns", f"{w}-19")[0] is not MISSING for w in range(4))
+    assert disk.errors == 0
+
+
+def test_query_cache_promotes_disk_entries(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    QueryCache(disk=disk, namespace="ns").set("a", 1, ttl=60, tags=["Show"])
+    restarted = QueryCache(disk=disk, namespace="ns")
+
+    assert restarted.get("a") == 1
+    assert len(restarted) == 1
+    assert restarted.info().hits == 1
+    restarted.invalidate("Show")
+    assert QueryCache(disk=disk, namespace="ns").get("a") is MISSING
+
+
+def test_result_caches_keep_their_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_result_caches", {})
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    shared = cache.get_result_cache("ns", disk=disk)
+
+    assert cache.get_result_cache("ns") is shared
+    assert shared.disk is disk
+
+
+def test_connection_results_survive_a_restart(tmp_path, monkeypatch):
+    url = "memory://test-disk-cache"
+    path = str(tmp_path / "cache.db")
+    conn = WeaviateConnection("disk", url=url, disk_cache=path)
+    conn.client().collections.create("Show")
+    conn.client().collections.get("Show").data.insert({"title": "Doug"})
+    try:
+        df = conn.query("Show", "doug", cache_ttl=60)
+        conn.client().collections.delete("Show")
+        # A new process starts with empty in-process caches
+        monkeypatch.setattr(cache, "_result_caches", {})
+        restarted = WeaviateConnection("disk", url=url, disk_cache=path)
+
+        pd.testing.assert_frame_equal(restarted.query("Show", "doug", cache_ttl=60), df)
+        assert restarted.cache_info().hits == 1
+        assert restarted.disk_cache_info().hits == 1
+        restarted.clear_cache()
+        assert restarted.disk_cache_info().currsize == 0
+    finally:
+        conn.close()
+        memory.drop_database(url)
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from weaviate.classes.config import DataType
+
+from st_weaviate_connection.export import ParquetChunkWriter, chunked, prefetch
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+    with pytest.raises(ValueError):
+        list(chunked(range(5), 0))
+
+
+def test_prefetch_bounds_the_producer():
+    produced = []
+
+    def chunks():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    consumer = prefetch(chunks(), depth=2)
+    assert next(consumer) == 0
+    time.sleep(0.1)
+
+    # One chunk consumed, two waiting, one blocked on the full queue
+    assert len(produced) == 4
+    assert list(consumer) == list(range(1, 10))
+
+
+def test_prefetch_raises_producer_errors():
+    def chunks():
+        yield 1
+        raise RuntimeError("boom")
+
+    consumer = prefetch(chunks())
+    assert next(consumer) == 1
+    with pytest.raises(RuntimeError, match="boom"):
+        next(consumer)
+
+
+def test_prefetch_close_stops_the_producer():
+    closed = threading.Event()
+
+    def chunks():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.set()
+
+    consumer = prefetch(chunks(), depth=1)
+    next(consumer)
+    consumer.close()
+
+    assert closed.wait(timeout=1)
+
+
+def test_parquet_chunk_writer_types_empty_columns(tmp_path):
+    path = tmp_path / "export.parquet"
+    schema = {"title": DataType.TEXT, "year": DataType.INT}
+
+    with ParquetChunkWriter(str(path), schema=schema) as writer:
+        writer.write(pd.DataFrame({"title": [None, None], "year": [1990, 1991]}))
+        writer.write(pd.DataFrame({"title": ["Doug"], "year": [1991]}))
+
+    parquet_file = pq.ParquetFile(path)
+    assert writer.rows == 3
+    assert parquet_file.num_row_groups == 2
+    assert parquet_file.read().column("title").to_pylist() == [None, None, "Doug"]
@@ -0,0 +1,88 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+
+from st_weaviate_connection.filters import (
+    UnsupportedFilterError,
+    filter_mask,
+    filter_properties,
+)
+
+SCHEMA = {
+    "title": DataType.TEXT,
+    "year": DataType.INT,
+    "rating": DataType.NUMBER,
+    "released": DataType.DATE,
+    "genres": DataType.INT_ARRAY,
+}
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "title": ["Doug", "Rugrats", "Hey Arnold!"],
+            "year": pd.array([1991, None, 1996], dtype="Int64"),
+            "rating": [7.1, 7.4, np.nan],
+            "released": pd.to_datetime(["1991-08-11", "1991-08-11", None], utc=True),
+            "genres": [[1, 2], [2], None],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (Filter.by_property("year").greater_or_equal(1995), [False, False, True]),
+        (Filter.by_property("year").not_equal(1991), [False, False, True]),
+        (Filter.by_property("year").is_none(True), [False, True, False]),
+        (Filter.by_property("rating").less_than(7.2), [True, False, False]),
+        (
+            Filter.by_property("released").less_than(datetime.datetime(1992, 1, 1)),
+            [True, True, False],
+        ),
+        (Filter.by_property("year").contains_any([1996, 2000]), [False, False, True]),
+        (Filter.by_property("genres").contains_any([1, 3]), [True, False, False]),
+        (Filter.by_property("genres").contains_all([2]), [True, True, False]),
+        (
+            Filter.by_property("year").less_than(1995)
+            | Filter.by_property("rating").greater_than(7.2),
+            [True, True, False],
+        ),
+        (
+            Filter.by_property("rating").greater_than(7)
+            & Filter.by_property("genres").contains_any([1]),
+            [True, False, False],
+        ),
+        (None, [True, True, True]),
+    ],
+)
+def test_filter_mask(df, filters, expected):
+    assert filter_mask(df, filters, SCHEMA).tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        Filter.by_property("title").equal("Doug"),
+        Filter.by_property("missing").equal(1),
+        Filter.by_property("year").greater_than(1990) & Filter.by_property("title").like("D*"),
+    ],
+)
+def test_filter_mask_unsupported(df, filters):
+    with pytest.raises(UnsupportedFilterError):
+        filter_mask(df, filters, SCHEMA)
+
+
+def test_filter_properties():
+    filters = Filter.by_property("year").greater_than(1990) & (
+        Filter.by_property("rating").less_than(5) | Filter.by_id().equal(
+            "00000000-0000-0000-0000-000000000001"
+        )
+    )
+
+    assert filter_properties(filters) == {"year", "rating"}
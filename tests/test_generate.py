@@ -0,0 +1,94 @@
+import base64
+import threading
+import time
+
+import pandas as pd
+import pytest
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+
+from st_weaviate_connection.blobs import BlobRef
+
+# The uuids are in the reverse order of the ranking of "doug"
+SHOWS = pd.DataFrame(
+    {
+        "id": [f"00000000-0000-0000-0000-00000000000{i}" for i in (3, 2, 1)],
+        "title": ["Doug Doug Doug", "Doug Doug and friends", "Doug and friends and family"],
+        "poster": [base64.b64encode(name.encode()).decode() for name in ("a", "b", "c")],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection(
+        "Show", SHOWS, {"title": DataType.TEXT, "poster": DataType.BLOB}, uuid_column="id"
+    )
+
+
+def count_generations(conn, monkeypatch, delay=0.0):
+    calls = []
+    generate_text = conn._generate_text
+
+    def counted(*args):
+        calls.append(args)
+        time.sleep(delay)
+        return generate_text(*args)
+
+    monkeypatch.setattr(conn, "_generate_text", counted)
+    return calls
+
+
+def test_text_is_generated_from_the_results_in_ranking_order(conn):
+    df, stream = conn.generate(
+        "Show", "doug", "Pick one", grouped_properties=["title"], alpha=0
+    )
+
+    assert df["title"].tolist() == SHOWS["title"].tolist()
+    assert list(stream) == ["\n".join(["Pick one", *(f"title: {t}" for t in SHOWS["title"])])]
+
+
+def test_text_is_generated_when_streamed_and_cached(conn, monkeypatch):
+    calls = count_generations(conn, monkeypatch)
+
+    df, stream = conn.generate("Show", "doug", "Pick one", limit=2, alpha=0)
+    assert len(df) == 2 and calls == []
+    text = "".join(stream)
+    _, again = conn.generate("Show", "doug", "Pick one", limit=2, alpha=0)
+
+    assert "".join(again) == text
+    assert len(calls) == 1
+    assert conn.cache_info().hits == 1
+
+
+def test_concurrent_streams_share_one_generation(conn, monkeypatch):
+    calls = count_generations(conn, monkeypatch, delay=0.05)
+    texts = []
+
+    def stream():
+        _, chunks = conn.generate("Show", "doug", "Pick one", alpha=0, cache_ttl=None)
+        texts.append("".join(chunks))
+
+    threads = [threading.Thread(target=stream) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(texts)) == 1 and texts[0].startswith("Pick one")
+
+
+def test_lazy_blobs_and_queries_without_results(conn):
+    df, stream = conn.generate(
+        "Show", "doug", "Pick one", grouped_properties=["title"], alpha=0, lazy_blobs=True
+    )
+    assert isinstance(df["poster"].iloc[0], BlobRef)
+    assert df["poster"].iloc[0].load() == b"a"
+    assert "".join(stream).splitlines()[1] == "title: Doug Doug Doug"
+
+    df, stream = conn.generate(
+        "Show", "doug", "Pick one", filters=Filter.by_property("title").equal("Recess")
+    )
+    assert df is None
+    assert list(stream) == []
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from st_weaviate_connection.ingest import dataframe_objects
+
+
+def test_dataframe_objects():
+    df = pd.DataFrame(
+        {
+            "title": ["Doug", None],
+            "year": pd.array([1991, None], dtype="Int64"),
+            "embedding": [np.array([0.1, 0.2]), None],
+            "id": ["00000000-0000-0000-0000-000000000001", None],
+        }
+    )
+
+    objects = list(
+        dataframe_objects(df, vector_column="embedding", uuid_column="id", chunk_size=1)
+    )
+
+    assert objects == [
+        (
+            {"title": "Doug", "year": 1991},
+            "00000000-0000-0000-0000-000000000001",
+            [0.1, 0.2],
+        ),
+        ({}, None, None),
+    ]
+
+
+def test_dataframe_objects_missing_column():
+    with pytest.raises(KeyError):
+        list(dataframe_objects(pd.DataFrame({"title": ["Doug"]}), vector_column="v"))
@@ -0,0 +1,99 @@
+import pytest
+from weaviate.exceptions import WeaviateConnectionError
+
+from st_weaviate_connection.lifecycle import ConnectionManager
+
+
+class FakeClient:
+    def __init__(self, live=True):
+        self.live = live
+        self.connected = False
+        self.connect_calls = 0
+        self.live_calls = 0
+
+    def connect(self):
+        self.connect_calls += 1
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    def is_live(self):
+        self.live_calls += 1
+        return self.live
+
+
+def test_connects_once_and_reuses_the_client():
+    client = FakeClient()
+    manager = ConnectionManager(client, health_check_interval=None)
+
+    for _ in range(5):
+        assert manager.acquire() is client
+
+    assert client.connect_calls == 1
+    assert manager.info().connects == 1
+
+
+def test_reconnects_after_close():
+    client = FakeClient()
+    manager = ConnectionManager(client, health_check_interval=None)
+    manager.acquire()
+    client.close()
+    manager.acquire()
+
+    assert client.connect_calls == 2
+
+
+def test_health_check_runs_at_most_every_interval():
+    client = FakeClient()
+    manager = ConnectionManager(client, health_check_interval=0)
+    manager.acquire()
+    manager.acquire()
+    assert client.live_calls == 1
+
+    manager.health_check_interval = 3600
+    manager.acquire()
+    assert client.live_calls == 1
+
+
+def test_failed_health_check_reconnects():
+    client = FakeClient(live=False)
+    manager = ConnectionManager(client, health_check_interval=0)
+    manager.acquire()
+    manager.acquire()
+
+    assert client.connect_calls == 2
+    assert manager.info().failures == 1
+
+
+def test_connection_error_marks_connection_failed():
+    client = FakeClient()
+    manager = ConnectionManager(client, health_check_interval=None)
+
+    with pytest.raises(WeaviateConnectionError):
+        with manager.connected():
+            raise WeaviateConnectionError("boom")
+    manager.acquire()
+
+    assert client.connect_calls == 2
+    assert manager.info().failures == 1
+
+
+def test_client_factory_creates_the_client_on_first_acquire():
+    created = []
+
+    def factory():
+        client = FakeClient()
+        client.connect()
+        created.append(client)
+        return client
+
+    manager = ConnectionManager(client_factory=factory, health_check_interval=None)
+    assert manager.client is None
+
+    assert manager.acquire() is manager.acquire() is created[0]
+    assert len(created) == 1
+    assert manager.info().connects == 1
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pandas as pd
+import pytest
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+
+from st_weaviate_connection import memory
+
+SHOWS = pd.DataFrame(
+    {
+        "title": ["Doug", "Rugrats", "Hey Arnold!", "The Magic School Bus"],
+        "year": [1991, 1991, 1996, 1994],
+        "tags": [["school", "friends"], ["babies"], ["city", "friends"], ["school", "science"]],
+        "vector": [[1.0, 0.0, 0.0], [0.8, 0.2, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection(
+        "TVShow",
+        SHOWS,
+        {"title": DataType.TEXT, "year": DataType.INT, "tags": DataType.TEXT_ARRAY},
+        vector_column="vector",
+    )
+
+
+def test_tokenize():
+    assert memory.tokenize("Hey Arnold! It's a_b") == ["hey", "arnold", "it", "s", "a", "b"]
+
+
+def test_bm25_ranks_rare_terms_higher():
+    index = memory.BM25Index()
+    index.add(0, {"title": "school bus"})
+    index.add(1, {"title": "school"})
+    index.add(2, {"title": "bus bus bus"})
+    scores = index.scores("school", 3)
+    assert scores[1] > scores[0] > 0
+    assert scores[2] == 0
+    index.remove(1, {"title": "school"})
+    assert index.scores("school", 3)[1] == 0
+
+
+def test_keyword_query(conn):
+    df = conn.query("TVShow", "school", limit=5, include_metadata=True)
+    assert set(df["title"]) == {"Doug", "The Magic School Bus"}
+    assert df["_additional.score"].iloc[0] >= df["_additional.score"].iloc[1]
+
+
+def test_hybrid_query_with_vector(conn):
+    collection = conn.client().collections.get("TVShow")
+    result = collection.query.hybrid(
+        "friends", vector=[0.0, 1.0, 0.0], alpha=0.5, limit=2, return_metadata=["score"]
+    )
+    assert [o.properties["title"] for o in result.objects] == ["Hey Arnold!", "Doug"]
+    assert result.objects[0].metadata.score == pytest.approx(1.0)
+
+
+def test_near_vector(conn):
+    collection = conn.client().collections.get("TVShow")
+    result = collection.query.near_vector(
+        [1.0, 0.0, 0.0], limit=2, return_metadata=["distance"]
+    )
+    assert [o.properties["title"] for o in result.objects] == ["Doug", "Rugrats"]
+    assert result.objects[0].metadata.distance == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (Filter.by_property("year").greater_than(1992), {"Hey Arnold!", "The Magic School Bus"}),
+        (Filter.by_property("tags").contains_any(["babies", "city"]), {"Rugrats", "Hey Arnold!"}),
+        (Filter.by_property("title").equal("arnold"), {"Hey Arnold!"}),
+        (Filter.by_property("title").like("mag*"), {"The Magic School Bus"}),
+        (
+            Filter.by_property("year").equal(1991) | Filter.by_property("year").equal(1996),
+            {"Doug", "Rugrats", "Hey Arnold!"},
+        ),
+    ],
+)
+def test_query_filters(conn, filters, expected):
+    df = conn.query("TVShow", "", limit=10, filters=filters)
+    assert set(df["title"]) == expected
+
+
+def test_graphql_query(conn):
+    df = conn.graphql_query(
+        """
+        {
+          Get {
+            TVShow(
+              bm25: {query: "friends"}
+              where: {path: ["year"], operator: LessThan, valueInt: 1995}
+            ) {
+              title
+              _additional { id score }
+            }
+          }
+        }
+        """
+    )
+    assert df["title"].tolist() == ["Doug"]
+    assert uuid.UUID(df["_additional.id"].iloc[0])
+
+
+def test_graphql_errors(conn):
+    with pytest.raises(Exception, match="could not find class"):
+        conn.graphql_query("{ Get { Movie { title } } }")
+    with pytest.raises(Exception, match="Syntax Error"):
+        conn.graphql_query("{ Get { TVShow { title }")
+
+
+def test_insert_replaces_and_reports_failures(conn):
+    rows = pd.DataFrame(
+        {
+            "id": ["00000000-0000-0000-0000-000000000001"] * 2 + [None],
+            "title": ["Doug", "Doug (1991)", "Recess"],
+            "year": [1991, 1991, "1997"],
+        }
+    )
+    result = conn.insert_dataframe("TVShow", rows, uuid_column="id")
+    assert result.inserted == 2
+    assert result.failed["title"].tolist() == ["Recess"]
+    assert "year" in result.failed["error"].iloc[0]
+    collection = conn.client().collections.get("TVShow")
+    assert len(collection) == 5
+
+
+def test_iter_dataframes(conn):
+    chunks = list(conn.iter_dataframes("TVShow", chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert set(pd.concat(chunks)["title"]) == set(SHOWS["title"])
+
+
+def test_aquery(conn):
+    df = asyncio.run(conn.aquery("TVShow", "rugrats"))
+    assert df["title"].tolist() == ["Rugrats"]
+
+
+def test_query_concurrently_bounds_the_threads(conn, monkeypatch):
+    threads = set()
+    query = conn.query
+
+    def record(**spec):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return query(**spec)
+
+    monkeypatch.setattr(conn, "query", record)
+    specs = [{"collection_name": "TVShow", "query": q} for q in ("doug", "rugrats") * 4]
+
+    dfs = conn.query_concurrently(specs, max_workers=2)
+
+    assert [df["title"].tolist()[0] for df in dfs[:2]] == ["Doug", "Rugrats"]
+    assert len(threads) == 2
+
+
+def test_query_many_fails_malformed_specs_alone(conn):
+    spec = {"collection_name": "TVShow", "query": "rugrats"}
+
+    results = conn.query_many([spec, {"collection_name": "TVShow", "qury": "doug"}, spec])
+
+    assert results[0].df["title"].tolist() == ["Rugrats"]
+    assert results[1].df is None and isinstance(results[1].error, TypeError)
+    assert results[2].df.equals(results[0].df)
+
+
+def test_closed_client():
+    client = memory.connect("memory://closed")
+    client.close()
+    with pytest.raises(Exception):
+        client.collections.get("TVShow").query.fetch_objects()
@@ -0,0 +1,118 @@
+import pandas as pd
+import pytest
+from weaviate.classes.query import Filter
+
+SHOWS = pd.DataFrame(
+    {
+        "title": [f"Show {i}" for i in range(7)],
+        "vector": [[1.0, i / 10] for i in range(7)],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection("Show", SHOWS, vector_column="vector")
+
+
+def test_next_page_appends_only_the_new_rows(conn):
+    full = conn.query("Show", "show", limit=7)
+    pages = conn.query("Show", "show", limit=3, paginate=True)
+    first = pages.df.copy()
+
+    page = pages.next_page()
+    assert page["title"].tolist() == full["title"].tolist()[3:6]
+    assert pages.df["title"].tolist() == full["title"].tolist()[:6]
+    pd.testing.assert_frame_equal(pages.df.iloc[:3], first)
+    assert not pages.exhausted
+
+    assert pages.next_page(5)["title"].tolist() == full["title"].tolist()[6:]
+    assert pages.exhausted
+    assert len(pages) == 7
+    assert pages.next_page() is None
+
+
+def test_pages_are_cached_and_the_first_one_is_shared_with_query(conn):
+    conn.query("Show", "show", limit=3, cache_ttl=60)
+    pages = conn.query("Show", "show", limit=3, cache_ttl=60, paginate=True)
+    assert conn.cache_info().hits == 1
+
+    pages.next_page()
+    again = conn.query("Show", "show", limit=3, cache_ttl=60, paginate=True)
+    again.next_page()
+    assert conn.cache_info().hits == 3
+    pd.testing.assert_frame_equal(again.df, pages.df)
+
+
+def test_vector_matrices_are_concatenated(conn):
+    pages = conn.query("Show", "show", limit=4, vector_format="matrix", paginate=True)
+    pages.next_page()
+
+    df, vectors = pages.df
+    assert len(df) == 7
+    assert vectors["default"].shape == (7, 2)
+    assert not vectors["default"].flags.writeable
+
+
+def test_matrix_pages_end_on_an_empty_page(conn):
+    empty = conn.query(
+        "Show",
+        "show",
+        filters=Filter.by_property("title").equal("Doug"),
+        vector_format="matrix",
+        paginate=True,
+    )
+    assert empty.df is None
+    assert empty.exhausted
+
+    pages = conn.query("Show", "show", limit=7, vector_format="matrix", paginate=True)
+    assert not pages.exhausted
+    assert pages.next_page() is None
+    assert pages.exhausted
+    assert len(pages.df.df) == 7
+
+
+def test_df_only_concatenates_new_pages(conn, monkeypatch):
+    from st_weaviate_connection import pagination
+
+    concatenated = []
+    concat = pagination._concat
+    monkeypatch.setattr(
+        pagination, "_concat", lambda pages: concatenated.append(len(pages)) or concat(pages)
+    )
+    pages = conn.query("Show", "show", limit=2, paginate=True)
+    pages.next_page()
+    pages.next_page()
+    assert len(pages.df) == 6
+    pages.next_page()
+    assert len(pages.df) == 7
+
+    assert concatenated == [3, 2]
+
+
+def test_query_many_returns_one_handle_per_paginated_spec(conn):
+    spec = {"collection_name": "Show", "query": "show", "limit": 3, "paginate": True}
+
+    first, second = conn.query_many([spec, spec])
+
+    assert first.error is None and second.error is None
+    assert first.df is not second.df
+    first.df.next_page()
+    assert (len(first.df), len(second.df)) == (6, 3)
+
+
+def test_invalid_pagination(conn):
+    with pytest.raises(ValueError, match="prefilter"):
+        conn.query("Show", "show", paginate=True, prefilter=object())
+    with pytest.raises(ValueError, match="pandas"):
+        conn.query("Show", "show", paginate=True, output="arrow")
+
+
+def test_query_without_results(conn):
+    pages = conn.query(
+        "Show", "show", filters=Filter.by_property("title").equal("Doug"), paginate=True
+    )
+
+    assert pages.df is None
+    assert pages.exhausted
+    assert pages.next_page() is None
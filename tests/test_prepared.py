@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+from weaviate.classes.config import DataType
+from weaviate.classes.query import Filter
+
+SHOWS = pd.DataFrame(
+    {
+        "title": ["Doug", "Rugrats", "Hey Arnold!", "Recess"],
+        "year": [1991, 1991, 1996, 1997],
+        "network": ["Nickelodeon", "Nickelodeon", "Nickelodeon", "ABC"],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection(
+        "Show",
+        SHOWS,
+        {"title": DataType.TEXT, "year": DataType.INT, "network": DataType.TEXT},
+    )
+
+
+def test_prepared_query_matches_query(conn):
+    search = conn.prepare("Show", return_properties=["title"], limit=2)
+
+    for text in ("doug", "nickelodeon", "recess"):
+        expected = conn.query("Show", text, return_properties=["title"], limit=2)
+        pd.testing.assert_frame_equal(search(text), expected)
+
+
+def test_filter_params_are_bound_per_call(conn):
+    search = conn.prepare(
+        "Show",
+        query_properties=["network"],
+        filters=Filter.by_property("year").less_than(2000),
+        filter_params={
+            "min_year": Filter.by_property("year").greater_or_equal,
+            "max_year": Filter.by_property("year").less_or_equal,
+        },
+    )
+
+    assert set(search("nickelodeon")["title"]) == {"Doug", "Rugrats", "Hey Arnold!"}
+    assert search("nickelodeon", min_year=1995)["title"].tolist() == ["Hey Arnold!"]
+    assert search("nickelodeon", min_year=None, max_year=1991, limit=1).shape[0] == 1
+    with pytest.raises(TypeError, match="Unknown query parameters"):
+        search("nickelodeon", rating=5)
+
+
+def test_prepared_queries_share_the_result_cache(conn):
+    search = conn.prepare("Show", cache_ttl=60)
+    conn.query("Show", "doug", cache_ttl=60)
+
+    search("doug")
+
+    assert conn.cache_info().hits == 1
+
+
+def test_prepared_keys_match_query_keys_with_filter_params(conn):
+    static = Filter.by_property("year").less_than(2000)
+    min_year = Filter.by_property("year").greater_or_equal
+    search = conn.prepare(
+        "Show", filters=static, filter_params={"min_year": min_year}, cache_ttl=60
+    )
+    unfiltered = conn.prepare("Show", filter_params={"min_year": min_year}, cache_ttl=60)
+    both = Filter.all_of([static, min_year(1995)])
+    conn.query("Show", "doug", filters=both, limit=3, cache_ttl=60)
+    conn.query("Show", "doug", filters=static, cache_ttl=60)
+    conn.query("Show", "doug", filters=min_year(1995), cache_ttl=60)
+    hits = conn.cache_info().hits
+
+    search("doug", limit=3, min_year=1995)
+    search("doug", min_year=None)
+    unfiltered("doug", min_year=1995)
+
+    assert conn.cache_info().hits == hits + 3
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"return_properties": ["rating"]}, "no return properties"),
+        ({"query_properties": ["year"]}, "not text properties"),
+        ({"query_properties": ["titel^2"]}, "no query properties"),
+        ({"filters": Filter.by_property("rating").equal(5)}, "no filter properties"),
+        ({"filter_params": {"r": Filter.by_property("rating").equal}}, "no filter properties"),
+        ({"alpha": 1.5}, "alpha"),
+    ],
+)
+def test_prepare_validates_against_the_schema(conn, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        conn.prepare("Show", **kwargs)
+
+
+def test_calls_are_validated_before_querying(conn):
+    search = conn.prepare("Show")
+
+    with pytest.raises(ValueError, match="limit"):
+        search("doug", limit=0)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from st_weaviate_connection.connection import (
+    HYBRID_METADATA,
+    weaviate_response_objects_to_df,
+)
+from st_weaviate_connection.rerank import MMR, Remix, Scorer, parse_explain_scores, rerank
+
+SHOWS = pd.DataFrame(
+    {
+        "title": [
+            "space adventure",
+            "space adventure returns",
+            "space opera",
+            "space cowboys in space",
+            "ocean adventure",
+        ],
+        "votes": [10, 20, 30, 40, 50],
+        "vector": [[1.0, 0.0], [0.99, 0.01], [0.0, 1.0], [0.6, 0.8], [0.7, -0.7]],
+    }
+)
+
+
+@pytest.fixture
+def conn(memory_connection):
+    return memory_connection("Show", SHOWS, vector_column="vector")
+
+
+def hybrid_df(conn, alpha):
+    response = conn.client().collections.get("Show").query.hybrid(
+        "space adventure", vector=[1.0, 0.2], alpha=alpha, limit=10, return_metadata=HYBRID_METADATA
+    )
+    return weaviate_response_objects_to_df(response.objects, include_metadata=True)
+
+
+def test_parse_explain_scores():
+    explain = (
+        "\nHybrid (Result Set keyword,bm25) Document a: original score 2.5, normalized score: 0.15"
+        " - \nHybrid (Result Set vector,hybridVector) Document a: original score 0.9, normalized score: 0.7"
+    )
+
+    parts = parse_explain_scores([explain, None])
+
+    assert parts[0].tolist() == [2.5, 0.15, 0.9, 0.7]
+    assert np.isnan(parts[1]).all()
+
+
+def test_remix_matches_a_query_at_the_new_alpha(conn):
+    candidates = hybrid_df(conn, 0.3)
+    expected = hybrid_df(conn, 0.8)
+
+    df, _ = rerank(candidates, {}, 0.3, [Remix(0.8)], limit=3)
+
+    assert df["title"].tolist() == expected["title"].tolist()[:3]
+    np.testing.assert_allclose(df["_additional.score"], expected["_additional.score"][:3])
+
+
+def test_mmr_diversifies_the_results(conn):
+    plain = conn.query("Show", "space adventure", limit=2, alpha=0)
+    diverse = conn.query(
+        "Show", "space adventure", limit=2, alpha=0, rerank=MMR(diversity=0.9)
+    )
+
+    assert plain["title"].tolist() == ["space adventure", "space adventure returns"]
+    assert diverse["title"].tolist()[0] == "space adventure"
+    assert diverse["title"].tolist()[1] != "space adventure returns"
+    assert diverse.columns.tolist() == ["title", "votes"]
+
+
+def test_stages_share_the_cached_candidates(conn):
+    boost = Scorer(lambda c: c.df["votes"].to_numpy())
+    conn.query("Show", "space", limit=2, alpha=0, cache_ttl=60, rerank=MMR(0.2))
+
+    df = conn.query(
+        "Show",
+        "space",
+        limit=2,
+        alpha=0,
+        cache_ttl=60,
+        rerank=[MMR(0.8), boost],
+        include_metadata=True,
+        include_vector=True,
+    )
+
+    assert conn.cache_info().hits == 1
+    assert df["title"].tolist() == ["space cowboys in space", "space opera"]
+    assert df["_additional.score"].tolist() == [40.0, 30.0]
+    assert df["_additional.vector"].tolist() == [
+        pytest.approx([0.6, 0.8]),
+        pytest.approx([0.0, 1.0]),
+    ]
+
+
+def test_matrix_results_and_invalid_stages(conn):
+    df, vectors = conn.query(
+        "Show", "space", limit=2, alpha=0, vector_format="matrix", rerank=MMR(0.5)
+    )
+    assert vectors["default"].shape == (2, 2)
+    assert not vectors["default"].flags.writeable
+
+    with pytest.raises(ValueError, match="2 candidates|scores"):
+        conn.query("Show", "space", limit=1, alpha=0, rerank=Scorer(lambda c: [1.0]))
+    with pytest.raises(ValueError, match="prefilter"):
+        conn.query("Show", "space", rerank=MMR(), paginate=True)
+    with pytest.raises(ValueError, match="diversity"):
+        MMR(diversity=2)
@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+from weaviate.exceptions import WeaviateConnectionError, WeaviateQueryError
+
+from st_weaviate_connection import WeaviateConnection, memory
+from st_weaviate_connection.lifecycle import ConnectionManager
+from st_weaviate_connection.routing import Endpoint, EndpointRouter
+
+
+class FakeClient:
+    def __init__(self, name, delay=0.0, down=False):
+        self.name = name
+        self.delay = delay
+        self.down = down
+        self.connected = False
+        self.calls = 0
+
+    def connect(self):
+        if self.down:
+            raise WeaviateConnectionError("down")
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    def is_live(self):
+        return not self.down
+
+    def request(self):
+        self.calls += 1
+        if self.down:
+            raise WeaviateConnectionError("down")
+        time.sleep(self.delay)
+        return self.name
+
+
+def make_router(*clients, **kwargs):
+    endpoints = [
+        Endpoint(client.name, ConnectionManager(client, health_check_interval=None))
+        for client in clients
+    ]
+    return EndpointRouter(endpoints, **kwargs)
+
+
+def test_routes_to_the_fastest_endpoint():
+    fast, slow = FakeClient("fast"), FakeClient("slow", delay=0.01)
+    router = make_router(slow, fast)
+
+    results = [router.call(lambda c: c.request()) for _ in range(20)]
+
+    assert results[-5:] == ["fast"] * 5
+    assert slow.calls <= 2
+    info = {i.url: i for i in router.info()}
+    assert info["fast"].latency_ewma < info["slow"].latency_ewma
+
+
+def test_fails_over_and_ejects_unhealthy_endpoints():
+    down, up = FakeClient("down", down=True), FakeClient("up")
+    router = make_router(down, up, eject_seconds=60)
+
+    assert [router.call(lambda c: c.request()) for _ in range(3)] == ["up"] * 3
+
+    info = {i.url: i for i in router.info()}
+    assert not info["down"].healthy
+    assert info["down"].failures == 1
+
+
+def test_reprobes_endpoints_after_ejection():
+    flaky, other = FakeClient("flaky", down=True), FakeClient("other", delay=0.005)
+    router = make_router(flaky, other, eject_seconds=0.01)
+    router.call(lambda c: c.request())
+
+    flaky.down = False
+    time.sleep(0.02)
+    results = {router.call(lambda c: c.request()) for _ in range(5)}
+
+    assert "flaky" in results
+    assert {i.url: i for i in router.info()}["flaky"].healthy
+
+
+def test_tries_ejected_endpoints_when_all_are_down():
+    a, b = FakeClient("a", down=True), FakeClient("b", down=True)
+    router = make_router(a, b, eject_seconds=60)
+
+    with pytest.raises(WeaviateConnectionError):
+        router.call(lambda c: c.request())
+    assert not any(i.healthy for i in router.info())
+
+    b.down = False
+    assert router.call(lambda c: c.request()) == "b"
+
+
+def test_query_errors_are_not_retried():
+    a, b = FakeClient("a"), FakeClient("b")
+    router = make_router(a, b)
+
+    def fail(client):
+        client.calls += 1
+        raise WeaviateQueryError("bad query", "GRPC")
+
+    with pytest.raises(WeaviateQueryError):
+        router.call(fail)
+    assert a.calls + b.calls == 1
+    assert all(i.healthy for i in router.info())
+
+
+def test_hedges_slow_requests_to_a_second_endpoint():
+    slow, fast = FakeClient("slow"), FakeClient("fast")
+    router = make_router(slow, fast, hedge_percentile=0.5, hedge_min_samples=4)
+    for _ in range(4):
+        router.call(lambda c: c.request())
+    # The slow endpoint becomes the best one, then stalls
+    router.endpoints[0].latency_ewma = 0.0
+    router.endpoints[1].latency_ewma = 1.0
+    slow.delay = 1.0
+
+    start = time.perf_counter()
+    assert router.call(lambda c: c.request()) == "fast"
+
+    assert time.perf_counter() - start < 0.5
+    assert router.hedges == 1
+    router.close()
+
+
+def test_outstanding_requests_spread_the_load():
+    a, b = FakeClient("a", delay=0.05), FakeClient("b", delay=0.05)
+    router = make_router(a, b)
+    router.endpoints[0].latency_ewma = router.endpoints[1].latency_ewma = 0.05
+
+    threads = [
+        threading.Thread(target=router.call, args=(lambda c: c.request(),))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert a.calls == b.calls == 2
+
+
+def test_connection_routes_reads_across_endpoints():
+    url = "memory://test-routing"
+    conn = WeaviateConnection("routing", url=[url, url])
+    conn.client().collections.create("Show")
+    conn.client().collections.get("Show").data.insert({"title": "Doug"})
+    try:
+        for _ in range(4):
+            assert conn.query("Show", "doug")["title"].tolist() == ["Doug"]
+            conn.graphql_query("{ Get { Show { title } } }", cache_ttl=None)
+        info = conn.endpoint_info()
+        assert [i.url for i in info] == [url, url]
+        assert sum(i.requests for i in info) == 8
+    finally:
+        conn.close()
+        memory.drop_database(url)
@@ -0,0 +1,87 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from st_weaviate_connection import WeaviateConnection, memory
+
+# The modules that `import st_weaviate_connection` must not import
+HEAVY_MODULES = ("weaviate", "pandas", "pyarrow", "streamlit", "numpy")
+
+
+def test_package_import_is_lazy():
+    code = (
+        "import sys\n"
+        "import st_weaviate_connection\n"
+        f"print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == ""
+
+
+# The modules that `from st_weaviate_connection import WeaviateConnection` must not import
+OPTIONAL_MODULES = tuple(
+    f"st_weaviate_connection.{name}"
+    for name in ("arrow", "disk_cache", "export", "memory", "rerank", "routing")
+)
+
+
+def test_connection_import_defers_optional_modules():
+    code = (
+        "import sys\n"
+        "from st_weaviate_connection import WeaviateConnection\n"
+        f"print(*[m for m in {OPTIONAL_MODULES!r} if m in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == ""
+
+
+class SlowConnection(WeaviateConnection):
+    def _create_client(self, url):
+        time.sleep(0.3)
+        return super()._create_client(url)
+
+
+@pytest.fixture
+def url():
+    url = "memory://test-startup"
+    client = memory.connect(url)
+    client.collections.create("Show").data.insert({"title": "Doug"})
+    yield url
+    memory.drop_database(url)
+
+
+def test_warm_up_runs_in_the_background(url):
+    start = time.perf_counter()
+    conn = SlowConnection("startup", url=url, warm_up=["Show"])
+    assert time.perf_counter() - start < 0.2
+
+    assert conn.wait_for_warm_up(timeout=5)
+    assert "Show" in conn._schemas
+    assert conn.stats().histograms["warm_up.seconds"].count == 1
+    assert conn.query("Show", "doug")["title"].tolist() == ["Doug"]
+    assert conn.connection_info().connects == 1
+    conn.close()
+
+
+def test_queries_wait_for_the_warm_up(url):
+    conn = SlowConnection("startup", url=url, warm_up=True)
+
+    assert conn.query("Show", "doug")["title"].tolist() == ["Doug"]
+    assert conn.wait_for_warm_up(timeout=5)
+    assert conn.connection_info().connects == 1
+    conn.close()
+
+
+def test_warm_up_errors_are_reported(url):
+    conn = WeaviateConnection("startup", url=url, warm_up=["Missing"])
+
+    assert not conn.wait_for_warm_up(timeout=5)
+    conn.close()
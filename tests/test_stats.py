@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from st_weaviate_connection.stats import (
+    Histogram,
+    Stats,
+    annotate,
+    phase,
+    result_size,
+)
+
+
+def test_histogram_summary():
+    histogram = Histogram()
+    for i in range(1, 101):
+        histogram.observe(i / 1000)
+
+    summary = histogram.summary()
+
+    assert summary.count == 100
+    assert summary.total == pytest.approx(5.05)
+    assert (summary.min, summary.max) == (0.001, 0.1)
+    assert summary.p50 == pytest.approx(0.05, rel=0.2)
+    assert summary.p99 == pytest.approx(0.099, rel=0.2)
+    assert Histogram().summary().count == 0
+
+
+def test_span_records_phases_attributes_and_calls_hooks():
+    stats = Stats()
+    spans = []
+    stats.add_hook(spans.append)
+
+    with stats.span("query"):
+        with phase("hybrid"):
+            pass
+        with phase("to_dataframe"):
+            pass
+        annotate("cache", "miss")
+        result_size(pd.DataFrame({"title": ["Doug", "Rugrats"]}))
+
+    with pytest.raises(RuntimeError):
+        with stats.span("query"):
+            raise RuntimeError("boom")
+
+    snapshot = stats.snapshot()
+    assert snapshot["query.seconds"].count == 2
+    assert snapshot["query.hybrid.seconds"].count == 1
+    assert snapshot["query.rows"].max == 2
+    assert set(spans[0].phases) == {"hybrid", "to_dataframe"}
+    assert spans[0].attributes["cache"] == "miss"
+    assert spans[0].attributes["bytes"] > 0
+    assert spans[1].attributes["error"] == "RuntimeError"
+    assert list(stats.to_dataframe().index) == list(snapshot)
+
+
+def test_disabled_stats_record_nothing():
+    stats = Stats(enabled=False)
+    spans = []
+    stats.add_hook(spans.append)
+
+    with stats.span("query") as span:
+        with phase("hybrid"):
+            annotate("cache", "hit")
+
+    assert span is None
+    assert spans == []
+    assert stats.snapshot() == {}
+
+
+def test_cache_hits_do_not_measure_the_result_size(monkeypatch):
+    from st_weaviate_connection import WeaviateConnection, memory
+
+    url = "memory://test-stats-cache-hit"
+    conn = WeaviateConnection("stats", url=url)
+    conn.client().collections.create("Show")
+    conn.client().collections.get("Show").data.insert({"title": "Doug"})
+    spans = []
+    conn.add_stats_hook(spans.append)
+    try:
+        conn.query("Show", "doug", cache_ttl=60)
+
+        def memory_usage(*args, **kwargs):
+            raise AssertionError("The size of a cache hit was measured")
+
+        monkeypatch.setattr(pd.DataFrame, "memory_usage", memory_usage)
+        conn.query("Show", "doug", cache_ttl=60)
+    finally:
+        conn.close()
+        memory.drop_database(url)
+
+    miss, hit = spans
+    assert miss.attributes["bytes"] > 0
+    assert hit.attributes["cache"] == "hit"
+    assert hit.attributes["rows"] == 1
+    assert "bytes" not in hit.attributes